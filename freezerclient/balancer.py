@@ -0,0 +1,230 @@
+# (c) Copyright 2026 Cleura AB
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import logging
+import random
+import threading
+
+import requests
+
+LOG = logging.getLogger(__name__)
+
+LEAST_OUTSTANDING = 'least-outstanding'
+LATENCY = 'latency'
+STRATEGIES = (LEAST_OUTSTANDING, LATENCY)
+
+DEFAULT_FAILURE_THRESHOLD = 3
+DEFAULT_PROBE_INTERVAL = 10
+DEFAULT_PROBE_TIMEOUT = 5
+DEFAULT_FAILURE_STATUS_CODES = frozenset([500, 502, 503, 504])
+# Weight of the last sample in the moving average of the latency
+LATENCY_DECAY = 0.3
+
+
+class Member(object):
+    """A freezer-api endpoint of a load balancer"""
+
+    def __init__(self, url):
+        self.url = url.rstrip('/')
+        self.outstanding = 0
+        self.latency = None
+        self.failures = 0
+        self.ejected = False
+
+    def __repr__(self):
+        return 'Member({0!r})'.format(self.url)
+
+
+class LoadBalancer(object):
+    """Spread the requests of a client across freezer-api replicas.
+
+    The managers build their urls from a single endpoint; the transport
+    hands every url to :meth:`acquire`, which rewrites it to the member
+    picked by the strategy:
+
+    * ``least-outstanding``: the member with the fewest requests in flight
+    * ``latency``: a random member, weighted by the inverse of its
+      average latency
+
+    A member failing ``failure_threshold`` requests in a row (connection
+    errors or 5xx responses) is ejected. Ejected members are probed in the
+    background every ``probe_interval`` seconds and come back once they
+    answer again. When every member is ejected, requests are spread across
+    all of them anyway.
+    """
+
+    def __init__(self, endpoints, strategy=LEAST_OUTSTANDING,
+                 failure_threshold=DEFAULT_FAILURE_THRESHOLD,
+                 probe_interval=DEFAULT_PROBE_INTERVAL,
+                 probe_timeout=DEFAULT_PROBE_TIMEOUT,
+                 failure_status_codes=DEFAULT_FAILURE_STATUS_CODES,
+                 verify=True):
+        """
+        :param endpoints: list of freezer-api endpoints, or callable
+                          returning it, called on first use
+        :param strategy: least-outstanding or latency
+        :param failure_threshold: consecutive failures ejecting a member
+        :param probe_interval: seconds between two probes of the ejected
+                               members
+        :param probe_timeout: timeout of a probe, in seconds
+        :param failure_status_codes: HTTP status codes counted as failures
+        :param verify: TLS verification setting of the probes
+        """
+        if strategy not in STRATEGIES:
+            raise ValueError('Unknown load balancing strategy {0}, valid '
+                             'strategies are {1}'.format(
+                                 strategy, ', '.join(STRATEGIES)))
+        self._endpoints = endpoints
+        self._members = None
+        self.strategy = strategy
+        self.failure_threshold = failure_threshold
+        self.probe_interval = probe_interval
+        self.probe_timeout = probe_timeout
+        self.failure_status_codes = frozenset(failure_status_codes)
+        self.verify = verify
+        self._lock = threading.Lock()
+        self._prober = None
+        self._stopped = threading.Event()
+
+    @property
+    def members(self):
+        with self._lock:
+            return list(self._load())
+
+    def _load(self):
+        if self._members is None:
+            endpoints = self._endpoints
+            if callable(endpoints):
+                endpoints = endpoints()
+            self._members = [Member(url) for url in endpoints]
+            if not self._members:
+                raise ValueError('No freezer-api endpoint to balance across')
+        return self._members
+
+    def acquire(self, url, exclude=()):
+        """Pick a member for a request to url
+
+        :param url: url built from any of the endpoints
+        :param exclude: members not to pick (optional)
+        :return: (member, rewritten url), or (None, url) when url does not
+                 belong to any member or every member is excluded
+        """
+        with self._lock:
+            members = self._load()
+            source = self._match(members, url)
+            if source is None:
+                return None, url
+            member = self._pick([m for m in members if m not in exclude])
+            if member is None:
+                return None, url
+            member.outstanding += 1
+        return member, member.url + url[len(source.url):]
+
+    def cancel(self, member):
+        """Give back a member acquired for a request that was not sent
+
+        Unlike release, nothing is recorded about the member.
+
+        :param member: member returned by acquire
+        """
+        with self._lock:
+            member.outstanding -= 1
+
+    def release(self, member, elapsed=None, response=None):
+        """Record the outcome of a request sent to member
+
+        :param member: member returned by acquire
+        :param elapsed: duration of the request, in seconds, None when it
+                        did not complete
+        :param response: response received, None on errors
+        """
+        failed = response is None
+        if not failed:
+            failed = response.status_code in self.failure_status_codes
+        with self._lock:
+            member.outstanding -= 1
+            if elapsed is not None:
+                if member.latency is None:
+                    member.latency = elapsed
+                else:
+                    delta = elapsed - member.latency
+                    member.latency += LATENCY_DECAY * delta
+            if not failed:
+                member.failures = 0
+                return
+            member.failures += 1
+            if member.ejected or member.failures < self.failure_threshold:
+                return
+            member.ejected = True
+            LOG.warning('Ejecting freezer-api endpoint %s after %d failures',
+                        member.url, member.failures)
+            self._start_prober()
+
+    def close(self):
+        """Stop probing the ejected members"""
+        self._stopped.set()
+
+    @staticmethod
+    def _match(members, url):
+        for member in members:
+            if url == member.url or url.startswith(member.url + '/'):
+                return member
+        return None
+
+    def _pick(self, members):
+        if not members:
+            return None
+        candidates = [m for m in members if not m.ejected] or members
+        if self.strategy == LATENCY:
+            known = [m.latency for m in candidates if m.latency]
+            # Members without samples yet get the best known latency, so
+            # that they receive traffic
+            best = min(known) if known else 1
+            weights = [1 / (m.latency or best) for m in candidates]
+            return random.choices(candidates, weights)[0]
+        fewest = min(m.outstanding for m in candidates)
+        return random.choice([m for m in candidates
+                              if m.outstanding == fewest])
+
+    def _start_prober(self):
+        # Called with the lock held
+        if self._prober is not None:
+            return
+        self._prober = threading.Thread(target=self._probe_loop,
+                                        name='freezer-endpoint-probe',
+                                        daemon=True)
+        self._prober.start()
+
+    def _probe_loop(self):
+        while not self._stopped.wait(self.probe_interval):
+            with self._lock:
+                ejected = [m for m in self._members if m.ejected]
+                if not ejected:
+                    self._prober = None
+                    return
+            for member in ejected:
+                if self.probe(member):
+                    LOG.info('freezer-api endpoint %s is back', member.url)
+                    with self._lock:
+                        member.ejected = False
+                        member.failures = 0
+
+    def probe(self, member):
+        """Whether member answers, used to bring ejected members back"""
+        try:
+            r = requests.get(member.url, timeout=self.probe_timeout,
+                             verify=self.verify)
+        except requests.exceptions.RequestException:
+            return False
+        return r.status_code not in self.failure_status_codes
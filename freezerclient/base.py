@@ -12,9 +12,18 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import logging
+
 from cliff import command
 from cliff import lister
 from cliff import show
+from oslo_serialization import jsonutils as json
+
+from freezerclient import exceptions
+from freezerclient import utils
+from freezerclient.v2.managers import base as managers_base
+
+logging = logging.getLogger(__name__)
 
 
 def get_client(app):
@@ -42,3 +51,160 @@ class FreezerShowOne(show.ShowOne):
     @property
     def client(self):
         return get_client(self.app)
+
+
+class FreezerCreateOne(FreezerShowOne):
+    """Create a document from a file, or many from a directory or a stream.
+
+    Subclasses set ``noun`` and create the document of ``--file`` with
+    :meth:`create_one`. The documents of ``--from-dir`` and ``--from-jsonl``
+    are created concurrently by :meth:`create_many`, which shows a summary
+    and makes the command fail when some of them could not be created.
+    """
+
+    noun = 'document'
+    failed = 0
+
+    def get_parser(self, prog_name):
+        parser = super(FreezerCreateOne, self).get_parser(prog_name)
+        source = parser.add_mutually_exclusive_group(required=True)
+        source.add_argument('--file',
+                            dest='file',
+                            help='Path to json file with the '
+                                 '{0}'.format(self.noun))
+        source.add_argument('--from-dir',
+                            dest='from_dir',
+                            help='Directory of json files, one {0} per '
+                                 'file'.format(self.noun))
+        source.add_argument('--from-jsonl',
+                            dest='from_jsonl',
+                            help='JSON-lines file, one {0} per line, - for '
+                                 'the standard input'.format(self.noun))
+        parser.add_argument('--no-refetch',
+                            dest='refetch',
+                            action='store_false',
+                            default=True,
+                            help='Show the document built from the file '
+                                 'rather than reading the created {0} back '
+                                 'from the api, the fields set by the api '
+                                 'are left empty'.format(self.noun))
+        add_bulk_arguments(parser)
+        return parser
+
+    def run(self, parsed_args):
+        self.failed = 0
+        status = super(FreezerCreateOne, self).run(parsed_args)
+        return status or int(bool(self.failed))
+
+    def create_one(self, manager, doc, parsed_args):
+        """Create a document and return it
+
+        The created document is read back from the api, unless
+        --no-refetch is given: it is then built from the response of the
+        creation, without the fields set by the api.
+
+        :param manager: manager creating the document
+        :param doc: document to create
+        :param parsed_args: parsed arguments of the command
+        """
+        if not parsed_args.refetch:
+            return manager.create(doc, return_document=True)
+        doc_id = manager.create(doc)
+        created = manager.get(doc_id)
+        if not created:
+            raise exceptions.ApiClientException(
+                '{0} created but not found'.format(self.noun.capitalize()))
+        return created
+
+    def _sources(self, parsed_args):
+        if parsed_args.from_dir:
+            return utils.files_from_dir(parsed_args.from_dir)
+        path = parsed_args.from_jsonl
+        name = '<stdin>' if path == '-' else path
+        return (('{0}:{1}'.format(name, number), line)
+                for number, line in utils.lines_from_file(path))
+
+    def create_many(self, manager, parsed_args, prepare=None):
+        """Create the documents of --from-dir or --from-jsonl
+
+        The documents are read lazily, so that large streams do not have
+        to fit in memory.
+
+        :param manager: manager creating the documents
+        :param parsed_args: parsed arguments of the command
+        :param prepare: callable completing every document before it is
+                        created (optional)
+        :return: columns and data of the summary
+        """
+        labels = []
+        invalid = []
+
+        def documents():
+            for label, text in self._sources(parsed_args):
+                try:
+                    doc = json.loads(text)
+                    if not isinstance(doc, dict):
+                        raise ValueError('Expected a JSON object')
+                except ValueError as err:
+                    logging.error('Invalid %s %s: %s', self.noun, label, err)
+                    invalid.append(label)
+                    continue
+                if prepare is not None:
+                    prepare(doc)
+                labels.append(label)
+                yield doc
+
+        results = manager.create_many(documents(), fetch=parsed_args.refetch,
+                                      **bulk_options(self.app, parsed_args))
+        self.failed = len(invalid)
+        for label, result in zip(labels, results):
+            if result.error is not None:
+                logging.error('Unable to create %s %s: %s',
+                              self.noun, label, result.error)
+                self.failed += 1
+        total = len(results) + len(invalid)
+        return (('Documents', 'Created', 'Failed'),
+                (total, total - self.failed, self.failed))
+
+
+def add_bulk_arguments(parser):
+    """Add the options of the commands acting on many documents at once"""
+    concurrency = managers_base.DEFAULT_BULK_CONCURRENCY
+    parser.add_argument('--concurrency',
+                        dest='concurrency',
+                        type=int,
+                        default=concurrency,
+                        help='Number of requests in flight. '
+                             'Default {0}'.format(concurrency))
+    parser.add_argument('--rate',
+                        dest='rate',
+                        type=float,
+                        default=None,
+                        help='Maximum number of requests sent per second. '
+                             'Unlimited by default')
+    parser.add_argument('--progress',
+                        dest='progress',
+                        action='store_true',
+                        default=False,
+                        help='Report the progress on the standard error')
+
+
+def bulk_options(app, parsed_args):
+    """Keyword arguments of the bulk manager methods for parsed_args
+
+    :param app: cliff application, reporting the progress to its stderr
+    :param parsed_args: arguments parsed by a parser passed to
+                        add_bulk_arguments
+    :return: dict with the concurrency, rate and on_progress arguments
+    """
+    failed = []
+
+    def report(done, result):
+        if result.error is not None:
+            failed.append(result.item)
+        app.stderr.write('{0} done, {1} failed\n'.format(done, len(failed)))
+        app.stderr.flush()
+
+    return {'concurrency': parsed_args.concurrency,
+            'rate': parsed_args.rate,
+            'on_progress': report if parsed_args.progress else None}
@@ -0,0 +1,203 @@
+# (c) Copyright 2026 Cleura AB
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import collections
+import copy
+import threading
+import time
+
+DEFAULT_MAX_SIZE = 1024
+DEFAULT_TTL = 30
+DEFAULT_NEGATIVE_TTL = 5
+
+# Returned by DocumentCache.lookup when there is no fresh entry, None being
+# a valid cached value: the document does not exist
+MISS = object()
+
+_Entry = collections.namedtuple('_Entry', ['expires_at', 'doc', 'validators'])
+
+
+def response_validators(response, doc=None):
+    """Return the validators of a document read from freezer-api
+
+    The ETag and Last-Modified headers of the response are used when
+    present. Otherwise the version of the document, if any, stands in for
+    an ETag.
+
+    :param response: response of the GET request of the document
+    :param doc: the decoded document
+    :return: dict of validators, empty when there are none
+    """
+    validators = {}
+    etag = response.headers.get('ETag')
+    last_modified = response.headers.get('Last-Modified')
+    if etag:
+        validators['etag'] = etag
+    elif doc and doc.get('version') is not None:
+        validators['etag'] = '"{0}"'.format(doc['version'])
+    if last_modified:
+        validators['last_modified'] = last_modified
+    return validators
+
+
+class DocumentCache(object):
+    """Thread-safe LRU cache of the documents read by the managers.
+
+    The entries are keyed on the URL of the documents, so a cache may be
+    shared by clients bound to different regions or projects. Missing
+    documents are cached as None for a shorter time. The documents are
+    copied in and out of the cache, so that callers may modify them.
+
+    Expired documents that come with validators are kept until they are
+    evicted, so that they can be revalidated with a conditional request:
+    :meth:`conditional_headers` gives the headers of the request and
+    :meth:`refresh` renews the entry when freezer-api answers 304.
+    """
+
+    def __init__(self, max_size=DEFAULT_MAX_SIZE, ttl=DEFAULT_TTL,
+                 negative_ttl=DEFAULT_NEGATIVE_TTL, ttls=None):
+        """
+        :param max_size: maximum number of entries, the least recently
+                         used ones are evicted first (optional, default 1024)
+        :param ttl: seconds a document stays in the cache
+                    (optional, default 30)
+        :param negative_ttl: seconds a missing document stays in the cache
+                             (optional, default 5)
+        :param ttls: dict overriding the ttl of some resources, for example
+                     {'sessions': 5}. With a ttl of 0, the documents of a
+                     resource are revalidated on every read when they have
+                     validators, and not cached otherwise.
+        """
+        if max_size < 1:
+            raise ValueError('The cache must hold at least one entry')
+        self.max_size = max_size
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.ttls = dict(ttls or {})
+        self.hits = 0
+        self.misses = 0
+        self.revalidations = 0
+        self.not_modified = 0
+        self.stale_hits = 0
+        self._entries = collections.OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def lookup(self, key):
+        """Return the cached document, None for a missing one, or MISS
+
+        :param key: URL of the document
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry.expires_at <= time.monotonic():
+                if entry is not None and not entry.validators:
+                    del self._entries[key]
+                self.misses += 1
+                return MISS
+            self._entries.move_to_end(key)
+            self.hits += 1
+        return copy.deepcopy(entry.doc)
+
+    def _ttl(self, doc, resource):
+        if doc is None:
+            return self.negative_ttl
+        return self.ttls.get(resource, self.ttl)
+
+    def store(self, key, doc, resource=None, validators=None):
+        """Cache a document, or None when it does not exist
+
+        :param key: URL of the document
+        :param doc: the document, or None
+        :param resource: name of the resource, selecting the ttl
+        :param validators: dict of the validators of the document, see
+                           response_validators (optional)
+        """
+        ttl = self._ttl(doc, resource)
+        if ttl <= 0 and not validators:
+            return
+        entry = _Entry(time.monotonic() + max(ttl, 0), copy.deepcopy(doc),
+                       dict(validators or {}))
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def conditional_headers(self, key):
+        """Return the headers revalidating the cached copy of a document
+
+        :param key: URL of the document
+        :return: dict of If-None-Match and If-Modified-Since headers, empty
+                 when the document has no validators
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or not entry.validators:
+                return {}
+            self.revalidations += 1
+        headers = {}
+        if 'etag' in entry.validators:
+            headers['If-None-Match'] = entry.validators['etag']
+        if 'last_modified' in entry.validators:
+            headers['If-Modified-Since'] = entry.validators['last_modified']
+        return headers
+
+    def refresh(self, key, resource=None):
+        """Renew the cached copy of a document that was not modified
+
+        :param key: URL of the document
+        :param resource: name of the resource, selecting the ttl
+        :return: the cached document, or MISS when it was evicted meanwhile
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return MISS
+            ttl = self._ttl(entry.doc, resource)
+            entry = entry._replace(expires_at=time.monotonic() + max(ttl, 0))
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            self.not_modified += 1
+        return copy.deepcopy(entry.doc)
+
+    def stale(self, key):
+        """Return the cached copy of a document even when it expired
+
+        Only the expired documents kept for revalidation are found, the
+        other ones are dropped when they expire.
+
+        :param key: URL of the document
+        :return: the cached document, None for a missing one, or MISS
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return MISS
+            self.stale_hits += 1
+        return copy.deepcopy(entry.doc)
+
+    def invalidate(self, key):
+        """Drop the entry of a document, if any
+
+        :param key: URL of the document
+        """
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
@@ -0,0 +1,190 @@
+# (c) Copyright 2026 Cleura AB
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import logging
+import threading
+import time
+from urllib import parse
+
+from freezerclient import exceptions
+
+LOG = logging.getLogger(__name__)
+
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half-open'
+
+DEFAULT_FAILURE_THRESHOLD = 5
+DEFAULT_RECOVERY_TIMEOUT = 30
+DEFAULT_HALF_OPEN_CALLS = 1
+DEFAULT_FAILURE_STATUS_CODES = frozenset([500, 502, 503, 504])
+
+
+def endpoint_of(url):
+    """Scheme and network location of url, the key of its circuit"""
+    parts = parse.urlsplit(url)
+    return '{0}://{1}'.format(parts.scheme, parts.netloc)
+
+
+class _Circuit(object):
+    def __init__(self):
+        self.state = CLOSED
+        self.failures = 0
+        self.opened_at = None
+        self.trials = 0
+
+
+class CircuitBreaker(object):
+    """Per-endpoint circuit breaker of the client request path.
+
+    Each freezer-api endpoint starts closed. After ``failure_threshold``
+    consecutive failures (connection errors or one of the
+    ``failure_status_codes``) its circuit opens and requests to it are
+    refused without being sent: they raise
+    :class:`freezerclient.exceptions.CircuitOpenError`, or return the
+    response of ``fallback`` when one is given. After ``recovery_timeout``
+    seconds the circuit is half-open and lets ``half_open_calls`` trial
+    requests through; it closes again on success and reopens on failure.
+    """
+
+    def __init__(self, failure_threshold=DEFAULT_FAILURE_THRESHOLD,
+                 recovery_timeout=DEFAULT_RECOVERY_TIMEOUT,
+                 half_open_calls=DEFAULT_HALF_OPEN_CALLS,
+                 failure_status_codes=DEFAULT_FAILURE_STATUS_CODES,
+                 on_state_change=None, fallback=None):
+        """
+        :param failure_threshold: consecutive failures opening the circuit
+        :param recovery_timeout: seconds an open circuit refuses requests
+        :param half_open_calls: trial requests let through while half-open
+        :param failure_status_codes: HTTP status codes counted as failures
+        :param on_state_change: callable receiving the endpoint, the old and
+                                the new state on every transition
+        :param fallback: callable receiving the method, the url and the
+                         arguments of a refused request, and returning a
+                         response to use instead (e.g. cached data), or
+                         None to fail fast. Without one, the get() of the
+                         managers still serve the expired copy of the
+                         document cache of the client, when there is one
+        """
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self.half_open_calls = half_open_calls
+        self.failure_status_codes = frozenset(failure_status_codes)
+        self.on_state_change = on_state_change
+        self.fallback = fallback
+        self._circuits = {}
+        self._lock = threading.Lock()
+
+    def state(self, url):
+        """Current state of the circuit of the endpoint of url"""
+        endpoint = endpoint_of(url)
+        with self._lock:
+            circuit = self._circuits.setdefault(endpoint, _Circuit())
+            events = self._maybe_half_open(endpoint, circuit)
+            state = circuit.state
+        self._notify(events)
+        return state
+
+    def allow(self, url):
+        """Whether a request to url may be sent now"""
+        endpoint = endpoint_of(url)
+        allowed = False
+        with self._lock:
+            circuit = self._circuits.setdefault(endpoint, _Circuit())
+            events = self._maybe_half_open(endpoint, circuit)
+            if circuit.state == CLOSED:
+                allowed = True
+            elif circuit.state == HALF_OPEN:
+                if circuit.trials < self.half_open_calls:
+                    circuit.trials += 1
+                    allowed = True
+        self._notify(events)
+        return allowed
+
+    def reject(self, method, url, **kwargs):
+        """Handle a request refused by an open circuit
+
+        :raises freezerclient.exceptions.CircuitOpenError: when there is no
+                                                           fallback response
+        """
+        if self.fallback is not None:
+            response = self.fallback(method, url, **kwargs)
+            if response is not None:
+                return response
+        endpoint = endpoint_of(url)
+        with self._lock:
+            circuit = self._circuits.setdefault(endpoint, _Circuit())
+            retry_in = 0
+            if circuit.opened_at is not None:
+                reopen_at = circuit.opened_at + self.recovery_timeout
+                retry_in = max(reopen_at - time.monotonic(), 0)
+        raise exceptions.CircuitOpenError(endpoint, retry_in)
+
+    def record(self, url, response=None):
+        """Record the outcome of a request sent to url
+
+        :param url: url of the request
+        :param response: response received, None on connection errors
+        """
+        failed = response is None
+        if not failed:
+            failed = response.status_code in self.failure_status_codes
+        endpoint = endpoint_of(url)
+        with self._lock:
+            circuit = self._circuits.setdefault(endpoint, _Circuit())
+            if circuit.state == HALF_OPEN:
+                circuit.trials = max(circuit.trials - 1, 0)
+            if not failed:
+                circuit.failures = 0
+                events = self._transition(endpoint, circuit, CLOSED)
+            else:
+                circuit.failures += 1
+                events = []
+                if circuit.failures >= self.failure_threshold:
+                    events = self._open(endpoint, circuit)
+                elif circuit.state == HALF_OPEN:
+                    events = self._open(endpoint, circuit)
+        self._notify(events)
+
+    def _open(self, endpoint, circuit):
+        circuit.opened_at = time.monotonic()
+        return self._transition(endpoint, circuit, OPEN)
+
+    def _maybe_half_open(self, endpoint, circuit):
+        if circuit.state != OPEN:
+            return []
+        if time.monotonic() - circuit.opened_at < self.recovery_timeout:
+            return []
+        circuit.trials = 0
+        return self._transition(endpoint, circuit, HALF_OPEN)
+
+    def _transition(self, endpoint, circuit, state):
+        old_state = circuit.state
+        if old_state == state:
+            return []
+        circuit.state = state
+        if state == OPEN:
+            LOG.warning('Circuit of %s is open after %d failures',
+                        endpoint, circuit.failures)
+        else:
+            LOG.info('Circuit of %s is %s', endpoint, state)
+        return [(endpoint, old_state, state)]
+
+    def _notify(self, events):
+        # Called without holding the lock, so that callbacks may query
+        # the breaker
+        if self.on_state_change is None:
+            return
+        for event in events:
+            self.on_state_change(*event)
@@ -65,3 +65,18 @@ class ApiClientException(Exception):
         except Exception:
             self.status_code = None
         super(ApiClientException, self).__init__(message)
+
+
+class DeadlineExceeded(Exception):
+    """Raised when the time budget of an operation has run out"""
+
+
+class CircuitOpenError(Exception):
+    """Raised when a request is refused by an open circuit breaker"""
+
+    def __init__(self, endpoint, retry_in):
+        self.endpoint = endpoint
+        self.retry_in = retry_in
+        message = 'Circuit open for {0}, retrying in {1:.0f}s'.format(
+            endpoint, retry_in)
+        super(CircuitOpenError, self).__init__(message)
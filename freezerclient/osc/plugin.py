@@ -48,6 +48,9 @@ def make_client(instance):
         endpoint=endpoint,
         insecure=insecure,
         cacert=cacert,
+        endpoint_type=instance.interface,
+        region_name=instance.region_name,
+        use_adapter=True,
     )
 
 
@@ -0,0 +1,120 @@
+# (c) Copyright 2026 Cleura AB
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import threading
+import time
+
+READ_METHODS = frozenset(['GET', 'HEAD', 'OPTIONS'])
+
+
+class TokenBucket(object):
+    """Thread-safe token bucket limiting the rate of requests.
+
+    The bucket holds up to ``burst`` tokens and is refilled with ``rate``
+    tokens per second. Each request takes a token, waiting for it when
+    the bucket is empty.
+    """
+
+    def __init__(self, rate, burst=None):
+        """
+        :param rate: number of requests allowed per second
+        :param burst: number of requests that may be sent at once after an
+                      idle period (optional, defaults to one second worth
+                      of requests)
+        """
+        if rate <= 0:
+            raise ValueError('The rate limit must be positive')
+        self.rate = float(rate)
+        self.burst = float(burst or max(rate, 1))
+        self._tokens = self.burst
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self):
+        """Take a token, return the number of seconds to wait before using it
+
+        Tokens not available yet are borrowed from the future, so that
+        concurrent callers are spaced out instead of racing for the next
+        token.
+        """
+        with self._lock:
+            now = time.monotonic()
+            refill = (now - self._updated) * self.rate
+            self._tokens = min(self.burst, self._tokens + refill)
+            self._updated = now
+            self._tokens -= 1
+            if self._tokens >= 0:
+                return 0
+            return -self._tokens / self.rate
+
+    def release(self):
+        """Give back a token taken by reserve() and left unused"""
+        with self._lock:
+            self._tokens = min(self.burst, self._tokens + 1)
+
+    def acquire(self):
+        """Take a token, waiting for it if needed"""
+        delay = self.reserve()
+        if delay:
+            time.sleep(delay)
+
+
+class RateLimiter(object):
+    """Separate request budgets for the reads and the writes of a client.
+
+    Reads are the GET, HEAD and OPTIONS requests, writes are all the
+    others. An instance may be shared by several clients, across threads,
+    which then share the same budgets.
+    """
+
+    def __init__(self, read_rate=None, write_rate=None, read_burst=None,
+                 write_burst=None):
+        """
+        :param read_rate: number of reads allowed per second
+                          (optional, unlimited by default)
+        :param write_rate: number of writes allowed per second
+                           (optional, unlimited by default)
+        :param read_burst: number of reads that may be sent at once
+                           (optional, one second worth of reads by default)
+        :param write_burst: number of writes that may be sent at once
+                            (optional, one second worth of writes by default)
+        """
+        self.read = TokenBucket(read_rate, read_burst) if read_rate else None
+        self.write = None
+        if write_rate:
+            self.write = TokenBucket(write_rate, write_burst)
+
+    def _bucket(self, method):
+        if method.upper() in READ_METHODS:
+            return self.read
+        return self.write
+
+    def reserve(self, method):
+        """Take a token for a request, return the seconds to wait before it
+
+        :param method: HTTP method of the request
+        """
+        bucket = self._bucket(method)
+        if bucket is None:
+            return 0
+        return bucket.reserve()
+
+    def release(self, method):
+        """Give back a token taken by reserve() for a request not sent
+
+        :param method: HTTP method of the request
+        """
+        bucket = self._bucket(method)
+        if bucket is not None:
+            bucket.release()
@@ -0,0 +1,224 @@
+# (c) Copyright 2026 Cleura AB
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import itertools
+import os
+import sqlite3
+
+from oslo_serialization import jsonutils as json
+
+DEFAULT_PATH = '~/.cache/freezerclient/backups.sqlite'
+DEFAULT_BATCH_SIZE = 500
+
+_SCHEMA = (
+    'CREATE TABLE IF NOT EXISTS backups ('
+    ' scope TEXT NOT NULL,'
+    ' backup_id TEXT NOT NULL,'
+    ' hostname TEXT,'
+    ' path_to_backup TEXT,'
+    ' time_stamp INTEGER,'
+    ' curr_backup_level INTEGER,'
+    ' container TEXT,'
+    ' document TEXT NOT NULL,'
+    ' PRIMARY KEY (scope, backup_id))',
+    'CREATE TABLE IF NOT EXISTS watermarks ('
+    ' scope TEXT PRIMARY KEY,'
+    ' time_stamp INTEGER NOT NULL)',
+    'CREATE INDEX IF NOT EXISTS backups_time_stamp'
+    ' ON backups (scope, time_stamp)',
+    'CREATE INDEX IF NOT EXISTS backups_hostname'
+    ' ON backups (scope, hostname, time_stamp)',
+    'CREATE INDEX IF NOT EXISTS backups_path_to_backup'
+    ' ON backups (scope, path_to_backup, time_stamp)',
+    'CREATE INDEX IF NOT EXISTS backups_curr_backup_level'
+    ' ON backups (scope, curr_backup_level, time_stamp)',
+    'CREATE INDEX IF NOT EXISTS backups_container'
+    ' ON backups (scope, container, time_stamp)',
+)
+
+# Columns of the backups table that can filter a listing
+FILTERS = ('hostname', 'path_to_backup', 'curr_backup_level', 'container')
+
+
+def _row(scope, backup):
+    metadata = backup.get('backup_metadata') or {}
+    level = metadata.get('curr_backup_level')
+    return (scope,
+            backup.get('backup_id') or backup.get('backup_uuid'),
+            metadata.get('hostname'),
+            metadata.get('path_to_backup'),
+            int(metadata.get('time_stamp') or 0),
+            None if level is None else int(level),
+            metadata.get('container'),
+            json.dumps(backup))
+
+
+class BackupReplica(object):
+    """Local SQLite replica of the backup metadata stored in freezer-api.
+
+    The backups are stored with their metadata indexed, so that large
+    listings filtered by host, path, level or container and ordered by
+    time are answered locally. Every replica is bound to a scope, for
+    example the cloud and the project it replicates, so a file can hold
+    several of them.
+
+    :meth:`sync` only fetches the backups taken at or after the most recent
+    one already replicated, its watermark. Backups deleted from freezer-api,
+    or uploaded late with an older timestamp, are only caught by a full
+    sync.
+    """
+
+    def __init__(self, path=DEFAULT_PATH, scope=''):
+        """
+        :param path: path of the SQLite database, created if needed
+                     (optional, default ~/.cache/freezerclient/backups.sqlite)
+        :param scope: name of the replicated set of backups (optional)
+        """
+        self.scope = scope
+        if path != ':memory:':
+            path = os.path.expanduser(path)
+            directory = os.path.dirname(path)
+            if directory:
+                os.makedirs(directory, mode=0o700, exist_ok=True)
+        self.connection = sqlite3.connect(path)
+        with self.connection:
+            for statement in _SCHEMA:
+                self.connection.execute(statement)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def __len__(self):
+        return self.connection.execute(
+            'SELECT COUNT(*) FROM backups WHERE scope = ?',
+            (self.scope,)).fetchone()[0]
+
+    def close(self):
+        self.connection.close()
+
+    @property
+    def watermark(self):
+        """Timestamp of the most recent replicated backup, or None"""
+        row = self.connection.execute(
+            'SELECT time_stamp FROM watermarks WHERE scope = ?',
+            (self.scope,)).fetchone()
+        return None if row is None else row[0]
+
+    def clear(self):
+        """Drop every backup of the scope and its watermark"""
+        with self.connection:
+            self.connection.execute('DELETE FROM backups WHERE scope = ?',
+                                    (self.scope,))
+            self.connection.execute('DELETE FROM watermarks WHERE scope = ?',
+                                    (self.scope,))
+
+    def store(self, backups, batch_size=DEFAULT_BATCH_SIZE):
+        """Insert or replace backups, then advance the watermark
+
+        The backups are written in batches. The watermark only moves once
+        every backup is stored, so that an interrupted sync starts again
+        from the same point.
+
+        :param backups: iterable of backup documents
+        :param batch_size: number of backups written per transaction
+        :return: number of backups stored
+        """
+        rows = (_row(self.scope, backup) for backup in backups)
+        count = 0
+        latest = self.watermark
+        while True:
+            batch = list(itertools.islice(rows, batch_size))
+            if not batch:
+                break
+            with self.connection:
+                self.connection.executemany(
+                    'INSERT OR REPLACE INTO backups VALUES '
+                    '(?, ?, ?, ?, ?, ?, ?, ?)', batch)
+            count += len(batch)
+            newest = max(row[4] for row in batch)
+            if latest is None or newest > latest:
+                latest = newest
+        if latest is not None:
+            with self.connection:
+                self.connection.execute(
+                    'INSERT OR REPLACE INTO watermarks VALUES (?, ?)',
+                    (self.scope, latest))
+        return count
+
+    def sync(self, manager, full=False, page_size=None, concurrency=1):
+        """Replicate the backups added since the last sync
+
+        :param manager: freezerclient.v2.managers.backups.BackupsManager
+        :param full: drop the replicated backups and fetch all of them again
+                     (optional, default False)
+        :param page_size: number of backups requested per page (optional)
+        :param concurrency: number of pages fetched in parallel
+                            (optional, default 1)
+        :return: number of backups fetched
+        """
+        if full:
+            self.clear()
+        search = {}
+        if self.watermark is not None:
+            # The watermark is inclusive, so that backups taken during the
+            # same second as the last replicated one are not missed
+            search['time_after'] = self.watermark
+        kwargs = {'search': search, 'concurrency': concurrency}
+        if page_size is not None:
+            kwargs['page_size'] = page_size
+        return self.store(manager.iter_list(**kwargs))
+
+    def iter_list(self, limit=None, offset=0, time_after=None,
+                  time_before=None, **filters):
+        """Lazily iterate over the replicated backups, ordered by time_stamp
+
+        :param limit: maximum number of backups to return (optional)
+        :param offset: number of backups to skip (optional, default 0)
+        :param time_after: only return the backups taken at or after this
+                           timestamp (optional)
+        :param time_before: only return the backups taken at or before this
+                            timestamp (optional)
+        :param filters: values of the columns listed in FILTERS that the
+                        backups must match
+        :return: generator of backup documents
+        """
+        clauses = ['scope = ?']
+        values = [self.scope]
+        for name, value in sorted(filters.items()):
+            if name not in FILTERS:
+                raise ValueError('Unknown filter {0}'.format(name))
+            if value is not None:
+                clauses.append('{0} = ?'.format(name))
+                values.append(value)
+        if time_after is not None:
+            clauses.append('time_stamp >= ?')
+            values.append(int(time_after))
+        if time_before is not None:
+            clauses.append('time_stamp <= ?')
+            values.append(int(time_before))
+        where = ' AND '.join(clauses)
+        query = ('SELECT document FROM backups WHERE {0} '
+                 'ORDER BY time_stamp, backup_id'.format(where))
+        if limit is not None or offset:
+            query += ' LIMIT ? OFFSET ?'
+            values.extend([-1 if limit is None else int(limit), int(offset)])
+        for row in self.connection.execute(query, values):
+            yield json.loads(row[0])
+
+    def list(self, *args, **kwargs):
+        """Return the replicated backups as a list, see iter_list"""
+        return list(self.iter_list(*args, **kwargs))
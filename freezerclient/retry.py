@@ -0,0 +1,104 @@
+# (c) Copyright 2026 Cleura AB
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import datetime
+from email import utils as email_utils
+import random
+
+DEFAULT_MAX_ATTEMPTS = 3
+DEFAULT_BACKOFF_BASE = 0.5
+DEFAULT_BACKOFF_CAP = 30
+DEFAULT_MAX_RETRY_AFTER = 120
+DEFAULT_STATUS_CODES = frozenset([429, 500, 502, 503, 504])
+# Methods that can be sent twice without changing the result on the server
+IDEMPOTENT_METHODS = frozenset(['GET', 'HEAD', 'OPTIONS', 'PUT', 'DELETE'])
+RETRY_AFTER_STATUS_CODES = frozenset([429, 503])
+
+
+class RetryPolicy(object):
+    """When and how long to wait before sending a request again.
+
+    Requests are retried on connection errors and on the configured status
+    codes, with an exponential backoff and full jitter: the n-th retry waits
+    a random time between 0 and ``min(backoff_cap, backoff_base * 2 ** n)``
+    seconds. On 429 and 503 the ``Retry-After`` header of freezer-api, when
+    present, is used instead. Only the methods in ``methods`` are retried,
+    so that a POST that may have been processed is never sent twice.
+    """
+
+    def __init__(self, max_attempts=DEFAULT_MAX_ATTEMPTS,
+                 backoff_base=DEFAULT_BACKOFF_BASE,
+                 backoff_cap=DEFAULT_BACKOFF_CAP,
+                 status_codes=DEFAULT_STATUS_CODES,
+                 methods=IDEMPOTENT_METHODS,
+                 max_retry_after=DEFAULT_MAX_RETRY_AFTER):
+        """
+        :param max_attempts: maximum number of times a request is sent,
+                             1 disables retries
+        :param backoff_base: backoff of the first retry, in seconds
+        :param backoff_cap: maximum backoff, in seconds
+        :param status_codes: HTTP status codes to retry
+        :param methods: HTTP methods that may be retried
+        :param max_retry_after: longest Retry-After honored, in seconds.
+                                Responses asking to wait longer are
+                                returned to the caller as they are.
+        """
+        self.max_attempts = max_attempts
+        self.backoff_base = backoff_base
+        self.backoff_cap = backoff_cap
+        self.status_codes = frozenset(status_codes)
+        self.methods = frozenset(m.upper() for m in methods)
+        self.max_retry_after = max_retry_after
+
+    def backoff(self, attempt):
+        """Jittered delay before the retry following the given attempt"""
+        ceiling = self.backoff_base * 2 ** (attempt - 1)
+        return random.uniform(0, min(self.backoff_cap, ceiling))
+
+    @staticmethod
+    def retry_after(response):
+        """Delay requested by the Retry-After header, in seconds, or None"""
+        value = response.headers.get('Retry-After')
+        if not value:
+            return None
+        try:
+            return max(float(value), 0)
+        except ValueError:
+            pass
+        try:
+            date = email_utils.parsedate_to_datetime(value)
+        except (TypeError, ValueError):
+            return None
+        now = datetime.datetime.now(datetime.timezone.utc)
+        return max((date - now).total_seconds(), 0)
+
+    def next_delay(self, method, attempt, response=None):
+        """Delay before sending the request again, or None to give up
+
+        :param method: HTTP method of the request
+        :param attempt: number of times the request has been sent
+        :param response: response received, None on connection errors
+        :return: number of seconds to wait, or None
+        """
+        if attempt >= self.max_attempts or method.upper() not in self.methods:
+            return None
+        if response is None:
+            return self.backoff(attempt)
+        if response.status_code not in self.status_codes:
+            return None
+        if response.status_code in RETRY_AFTER_STATUS_CODES:
+            delay = self.retry_after(response)
+            if delay is not None:
+                return delay if delay <= self.max_retry_after else None
+        return self.backoff(attempt)
@@ -20,6 +20,7 @@ from cliff import app
 from cliff import commandmanager
 
 import freezerclient
+from freezerclient import timeouts
 from freezerclient import utils
 
 log = logging.getLogger(__name__)
@@ -54,6 +55,7 @@ class FreezerCommandManager(commandmanager.CommandManager):
         'backup-show': backups.BackupShow,
         'backup-delete': backups.BackupDelete,
         'backup-create': backups.BackupCreate,
+        'backup-sync': backups.BackupSync,
         'session-list': sessions.SessionList,
         'session-show': sessions.SessionShow,
         'session-create': sessions.SessionCreate,
@@ -216,13 +218,38 @@ class FreezerShell(app.App):
                     remote server's certificate.1'''
         )
 
+        parser.add_argument(
+            '--timeout',
+            dest='timeout',
+            type=float,
+            default=None,
+            help='''Maximum number of seconds a command may take, including
+                    retries and paginated listings'''
+        )
+
+        parser.add_argument(
+            '--os-token-cache-dir',
+            dest='os_token_cache_dir',
+            default=os.environ.get('OS_TOKEN_CACHE_DIR'),
+            help='''Directory where the keystone token and service catalog
+                    are cached between invocations. Disabled by default.'''
+        )
+
         return parser
 
-    @property
+    def run_subcommand(self, argv):
+        deadline = None
+        if self.options.timeout:
+            deadline = timeouts.Deadline(self.options.timeout)
+        with timeouts.activate(deadline):
+            return super(FreezerShell, self).run_subcommand(argv)
+
+    @utils.CachedProperty
     def client(self):
-        """Factory function to create a new freezer service client.
+        """Freezer service client shared by every command of the process.
 
-        The returned client will be either a V1 or V2 client.
+        The client is built on first access and memoized, so commands
+        touching it several times reuse the same keystone session and token.
 
         :return: freezerclient object
         """
@@ -233,6 +260,7 @@ class FreezerShell(app.App):
             'auth_url': self.options.os_auth_url,
             'endpoint': self.options.os_backup_url,
             'endpoint_type': self.options.os_endpoint_type,
+            'region_name': self.options.os_region_name,
             'project_name': self.options.os_project_name,
             'project_id': self.options.os_project_id,
             'user_domain_name': self.options.os_user_domain_name,
@@ -241,7 +269,8 @@ class FreezerShell(app.App):
             'project_domain_id': self.options.os_project_domain_id,
             'cert': self.options.os_cert,
             'cacert': self.options.os_cacert,
-            'insecure': self.options.insecure
+            'insecure': self.options.insecure,
+            'token_cache_dir': self.options.os_token_cache_dir
         }
         return utils.get_client_instance(
             opts, api_version=self.options.os_backup_api_version)
@@ -0,0 +1,118 @@
+# (c) Copyright 2026 Cleura AB
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+import copy
+import threading
+
+from oslo_serialization import jsonutils as json
+
+
+def request_key(method, url, token=None, params=None, data=None):
+    """Return the key identifying a read request
+
+    :param method: HTTP method of the request
+    :param url: URL of the request
+    :param token: auth token of the request, so that reads made on behalf
+                  of different projects are never shared
+    :param params: dict of the query parameters (optional)
+    :param data: body of the request (optional)
+    """
+    return (method, url, token, json.dumps(params or {}, sort_keys=True),
+            data)
+
+
+class _Call(object):
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class Group(object):
+    """Coalesce identical concurrent calls into a single one.
+
+    While a call is running for a key, the other threads calling
+    :meth:`do` with the same key wait for it and get a copy of its result,
+    or its exception, instead of running the call again. Nothing is kept
+    once the call is over: later calls run again.
+    """
+
+    def __init__(self):
+        self.calls = 0
+        self.coalesced = 0
+        self._calls = {}
+        self._lock = threading.Lock()
+
+    def do(self, key, func):
+        """Return func(), sharing it with the calls in flight for key
+
+        :param key: hashable key of the call, see request_key
+        :param func: callable without arguments
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+                self.calls += 1
+            else:
+                self.coalesced += 1
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return copy.deepcopy(call.result)
+        try:
+            call.result = func()
+        except Exception as err:
+            call.error = err
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+        return call.result
+
+
+class AsyncGroup(object):
+    """Asynchronous flavour of :class:`Group`, for the asyncio managers.
+
+    The shared call runs in its own task, so that cancelling one of the
+    waiting coroutines does not cancel it for the others.
+    """
+
+    def __init__(self):
+        self.calls = 0
+        self.coalesced = 0
+        self._calls = {}
+
+    async def do(self, key, func):
+        """Return await func(), sharing it with the calls in flight for key
+
+        :param key: hashable key of the call, see request_key
+        :param func: coroutine function without arguments
+        """
+        task = self._calls.get(key)
+        leader = task is None
+        if leader:
+            task = self._calls[key] = asyncio.ensure_future(func())
+            task.add_done_callback(lambda _: self._calls.pop(key, None))
+            self.calls += 1
+        else:
+            self.coalesced += 1
+        result = await asyncio.shield(task)
+        if leader:
+            return result
+        return copy.deepcopy(result)
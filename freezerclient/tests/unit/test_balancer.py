@@ -0,0 +1,203 @@
+# (c) Copyright 2026 Cleura AB
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import time
+import unittest
+from unittest import mock
+
+from keystoneauth1 import access
+from keystoneauth1 import fixture
+import requests
+
+from freezerclient import balancer
+from freezerclient import transport
+from freezerclient.v2 import client
+
+ENDPOINTS = ['http://a:9090', 'http://b:9090/']
+URL = 'http://a:9090/v2/tecs/jobs/'
+
+
+def _response(status_code):
+    return mock.Mock(status_code=status_code, headers={})
+
+
+class TestLoadBalancer(unittest.TestCase):
+
+    def setUp(self):
+        self.lb = balancer.LoadBalancer(ENDPOINTS, failure_threshold=2,
+                                        probe_interval=0.01)
+        self.addCleanup(self.lb.close)
+
+    def test_unknown_strategy(self):
+        self.assertRaises(ValueError, balancer.LoadBalancer, ENDPOINTS,
+                          strategy='round-robin')
+
+    def test_endpoints_resolved_lazily(self):
+        endpoints = mock.Mock(return_value=ENDPOINTS)
+        lb = balancer.LoadBalancer(endpoints)
+        endpoints.assert_not_called()
+        self.assertEqual(['http://a:9090', 'http://b:9090'],
+                         [m.url for m in lb.members])
+
+    def test_url_rewritten_to_member(self):
+        urls = set()
+        for i in range(2):
+            member, url = self.lb.acquire(URL)
+            urls.add(url)
+        self.assertEqual({'http://a:9090/v2/tecs/jobs/',
+                          'http://b:9090/v2/tecs/jobs/'}, urls)
+
+    def test_unknown_url_untouched(self):
+        self.assertEqual((None, 'http://c:9090/v2/'),
+                         self.lb.acquire('http://c:9090/v2/'))
+
+    def test_least_outstanding(self):
+        first, url = self.lb.acquire(URL)
+        for i in range(3):
+            second, url = self.lb.acquire(URL)
+            self.assertIsNot(first, second)
+            self.lb.release(second, 0.1, _response(200))
+        self.lb.release(first, 0.1, _response(200))
+        self.assertEqual(0, first.outstanding)
+
+    @mock.patch('freezerclient.balancer.random.choices')
+    def test_latency_weighted(self, mock_choices):
+        lb = balancer.LoadBalancer(ENDPOINTS, strategy=balancer.LATENCY)
+        a, b = lb.members
+        a.latency, b.latency = 0.1, 0.4
+        mock_choices.return_value = [a]
+        lb.acquire(URL)
+        candidates, weights = mock_choices.call_args[0]
+        self.assertEqual([a, b], candidates)
+        self.assertAlmostEqual(4, weights[0] / weights[1])
+
+    def test_latency_moving_average(self):
+        member = self.lb.members[0]
+        member.outstanding += 2
+        self.lb.release(member, 1.0, _response(200))
+        self.lb.release(member, 2.0, _response(200))
+        self.assertAlmostEqual(1 + balancer.LATENCY_DECAY, member.latency)
+
+    @mock.patch.object(balancer.LoadBalancer, 'probe', return_value=False)
+    def test_failing_member_ejected(self, mock_probe):
+        a, b = self.lb.members
+        a.outstanding += 2
+        self.lb.release(a)
+        self.lb.release(a, 0.1, _response(503))
+        self.assertTrue(a.ejected)
+        for i in range(3):
+            member, url = self.lb.acquire(URL)
+            self.assertIs(b, member)
+
+    def test_every_member_ejected(self):
+        for member in self.lb.members:
+            member.ejected = True
+        member, url = self.lb.acquire(URL)
+        self.assertIsNotNone(member)
+
+    def test_ejected_member_probed_back(self):
+        a, b = self.lb.members
+        with mock.patch.object(self.lb, 'probe',
+                               return_value=True) as mock_probe:
+            a.outstanding += 2
+            self.lb.release(a)
+            self.lb.release(a)
+            for i in range(100):
+                if not a.ejected:
+                    break
+                time.sleep(0.01)
+        self.assertFalse(a.ejected)
+        mock_probe.assert_called_with(a)
+
+    @mock.patch('freezerclient.balancer.requests.get')
+    def test_probe(self, mock_get):
+        member = self.lb.members[0]
+        mock_get.return_value = _response(200)
+        self.assertTrue(self.lb.probe(member))
+        mock_get.assert_called_once_with('http://a:9090', timeout=5,
+                                         verify=True)
+        mock_get.side_effect = requests.exceptions.ConnectionError
+        self.assertFalse(self.lb.probe(member))
+
+
+class TestTransportBalancer(unittest.TestCase):
+
+    def test_requests_spread_and_failed_over(self):
+        lb = balancer.LoadBalancer(ENDPOINTS, failure_threshold=1)
+        self.addCleanup(lb.close)
+        t = transport.HTTPTransport(balancer=lb)
+        sent = []
+
+        def request(method, url, **kwargs):
+            sent.append(url)
+            if url.startswith('http://a:9090'):
+                raise requests.exceptions.ConnectionError()
+            return _response(200)
+
+        with mock.patch.object(lb, 'probe', return_value=False), \
+                mock.patch.object(t.session, 'request', side_effect=request):
+            for i in range(4):
+                try:
+                    t.get(URL)
+                except requests.exceptions.ConnectionError:
+                    pass
+        self.assertLessEqual(
+            len([u for u in sent if u.startswith('http://a:9090')]), 1)
+        self.assertIn('http://b:9090/v2/tecs/jobs/', sent)
+
+
+class TestClientBalancer(unittest.TestCase):
+
+    def test_endpoints(self):
+        c = client.Client(session=mock.Mock(), endpoints=ENDPOINTS,
+                          project_id='tecs')
+        self.assertEqual('http://a:9090', c.endpoint)
+        self.assertIs(c.load_balancer, c.transport.balancer)
+        self.assertEqual(balancer.LEAST_OUTSTANDING,
+                         c.load_balancer.strategy)
+
+    def test_catalog_endpoints(self):
+        session = mock.Mock()
+        catalog = session.auth.get_access.return_value.service_catalog
+        catalog.get_urls.return_value = ENDPOINTS
+        c = client.Client(session=session, use_all_endpoints=True,
+                          endpoint_type='internal', region_name='RegionTwo',
+                          lb_strategy=balancer.LATENCY)
+        self.assertEqual(2, len(c.load_balancer.members))
+        catalog.get_urls.assert_called_once_with(
+            service_type='backup', interface='internal',
+            region_name='RegionTwo')
+
+    def test_catalog_endpoints_default_to_public_of_one_region(self):
+        token = fixture.V3Token(project_id='p1')
+        service = token.add_service('backup')
+        service.add_standard_endpoints(
+            public='http://pub1', internal='http://int1',
+            admin='http://adm1', region='RegionOne')
+        service.add_standard_endpoints(
+            public='http://pub2', internal='http://int2',
+            admin='http://adm2', region='RegionTwo')
+        session = mock.Mock()
+        session.auth.get_access.return_value = access.create(body=token)
+        c = client.Client(session=session, use_all_endpoints=True)
+        self.assertEqual(['http://pub1'], [m.url for m in
+                                           c.load_balancer.members])
+        c = client.Client(session=session, use_all_endpoints=True,
+                          region_name='RegionTwo', endpoint_type='internal')
+        self.assertEqual(['http://int2'], [m.url for m in
+                                           c.load_balancer.members])
+
+    def test_disabled_by_default(self):
+        c = client.Client(session=mock.Mock(), endpoint='http://a:9090')
+        self.assertIsNone(c.load_balancer)
@@ -0,0 +1,139 @@
+# (c) Copyright 2026 Cleura AB
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import unittest
+from unittest import mock
+
+from freezerclient import cache
+
+
+@mock.patch('freezerclient.cache.time')
+class TestDocumentCache(unittest.TestCase):
+
+    def test_miss_then_hit(self, mock_time):
+        mock_time.monotonic.return_value = 100.0
+        c = cache.DocumentCache()
+        self.assertIs(cache.MISS, c.lookup('k'))
+        c.store('k', {'a': 1})
+        self.assertEqual({'a': 1}, c.lookup('k'))
+        self.assertEqual((1, 1), (c.hits, c.misses))
+
+    def test_documents_are_copied(self, mock_time):
+        mock_time.monotonic.return_value = 100.0
+        c = cache.DocumentCache()
+        doc = {'a': [1]}
+        c.store('k', doc)
+        doc['a'].append(2)
+        c.lookup('k')['a'].append(3)
+        self.assertEqual({'a': [1]}, c.lookup('k'))
+
+    def test_ttl_per_resource(self, mock_time):
+        mock_time.monotonic.return_value = 100.0
+        c = cache.DocumentCache(ttl=30, ttls={'sessions': 5, 'jobs': 0})
+        c.store('j', {}, 'jobs')
+        c.store('s', {}, 'sessions')
+        c.store('b', {}, 'backups')
+        self.assertIs(cache.MISS, c.lookup('j'))
+        mock_time.monotonic.return_value = 106.0
+        self.assertIs(cache.MISS, c.lookup('s'))
+        self.assertEqual({}, c.lookup('b'))
+        mock_time.monotonic.return_value = 131.0
+        self.assertIs(cache.MISS, c.lookup('b'))
+        self.assertEqual(0, len(c))
+
+    def test_negative_entries(self, mock_time):
+        mock_time.monotonic.return_value = 100.0
+        c = cache.DocumentCache(ttl=30, negative_ttl=2)
+        c.store('k', None)
+        self.assertIsNone(c.lookup('k'))
+        mock_time.monotonic.return_value = 103.0
+        self.assertIs(cache.MISS, c.lookup('k'))
+
+    def test_lru_eviction(self, mock_time):
+        mock_time.monotonic.return_value = 100.0
+        c = cache.DocumentCache(max_size=2)
+        c.store('a', 1)
+        c.store('b', 2)
+        c.lookup('a')
+        c.store('c', 3)
+        self.assertIs(cache.MISS, c.lookup('b'))
+        self.assertEqual(1, c.lookup('a'))
+        self.assertEqual(3, c.lookup('c'))
+
+    def test_invalidate_and_clear(self, mock_time):
+        mock_time.monotonic.return_value = 100.0
+        c = cache.DocumentCache()
+        c.store('a', 1)
+        c.store('b', 2)
+        c.invalidate('a')
+        c.invalidate('missing')
+        self.assertIs(cache.MISS, c.lookup('a'))
+        c.clear()
+        self.assertIs(cache.MISS, c.lookup('b'))
+
+    def test_expired_entries_with_validators_are_revalidated(self, mock_time):
+        mock_time.monotonic.return_value = 100.0
+        c = cache.DocumentCache(ttl=30)
+        c.store('k', {'a': 1}, validators={'etag': '"3"',
+                                           'last_modified': 'yesterday'})
+        self.assertEqual({}, c.conditional_headers('missing'))
+        mock_time.monotonic.return_value = 131.0
+        self.assertIs(cache.MISS, c.lookup('k'))
+        self.assertEqual({'If-None-Match': '"3"',
+                          'If-Modified-Since': 'yesterday'},
+                         c.conditional_headers('k'))
+        self.assertEqual({'a': 1}, c.refresh('k'))
+        self.assertEqual({'a': 1}, c.lookup('k'))
+        self.assertEqual((1, 1), (c.revalidations, c.not_modified))
+        c.invalidate('k')
+        self.assertIs(cache.MISS, c.refresh('k'))
+
+    def test_stale_returns_expired_entries_kept_for_revalidation(
+            self, mock_time):
+        mock_time.monotonic.return_value = 100.0
+        c = cache.DocumentCache(ttl=30)
+        c.store('k', {'a': 1}, validators={'etag': '"3"'})
+        c.store('plain', {'b': 2})
+        mock_time.monotonic.return_value = 131.0
+        self.assertIs(cache.MISS, c.lookup('k'))
+        self.assertIs(cache.MISS, c.lookup('plain'))
+        self.assertEqual({'a': 1}, c.stale('k'))
+        self.assertIs(cache.MISS, c.stale('plain'))
+        self.assertEqual(1, c.stale_hits)
+
+    def test_zero_ttl_keeps_only_validated_documents(self, mock_time):
+        mock_time.monotonic.return_value = 100.0
+        c = cache.DocumentCache(ttls={'jobs': 0})
+        c.store('a', {}, 'jobs')
+        c.store('b', {}, 'jobs', {'etag': '"1"'})
+        self.assertEqual(1, len(c))
+        self.assertIs(cache.MISS, c.lookup('b'))
+        self.assertEqual({'If-None-Match': '"1"'}, c.conditional_headers('b'))
+
+    def test_invalid_size(self, mock_time):
+        self.assertRaises(ValueError, cache.DocumentCache, max_size=0)
+
+
+class TestResponseValidators(unittest.TestCase):
+
+    def test_headers(self):
+        r = mock.Mock(headers={'ETag': '"abc"', 'Last-Modified': 'today'})
+        self.assertEqual({'etag': '"abc"', 'last_modified': 'today'},
+                         cache.response_validators(r, {'version': 3}))
+
+    def test_version_fallback(self):
+        r = mock.Mock(headers={})
+        self.assertEqual({'etag': '"3"'},
+                         cache.response_validators(r, {'version': 3}))
+        self.assertEqual({}, cache.response_validators(r, {'job_id': 'j'}))
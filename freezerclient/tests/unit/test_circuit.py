@@ -0,0 +1,124 @@
+# (c) Copyright 2026 Cleura AB
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import unittest
+from unittest import mock
+
+import requests
+
+from freezerclient import circuit
+from freezerclient import exceptions
+from freezerclient import transport
+
+URL = 'http://freezer.api:9090/v2/jobs/'
+
+
+def _response(status_code):
+    return mock.Mock(status_code=status_code, headers={})
+
+
+@mock.patch('freezerclient.circuit.time.monotonic', return_value=100)
+class TestCircuitBreaker(unittest.TestCase):
+
+    def setUp(self):
+        self.events = []
+        self.breaker = circuit.CircuitBreaker(
+            failure_threshold=2, recovery_timeout=10,
+            on_state_change=lambda *e: self.events.append(e))
+
+    def _open(self):
+        self.breaker.record(URL)
+        self.breaker.record(URL, _response(503))
+
+    def test_opens_after_consecutive_failures(self, mock_time):
+        self.breaker.record(URL)
+        self.breaker.record(URL, _response(200))
+        self.breaker.record(URL)
+        self.assertEqual(circuit.CLOSED, self.breaker.state(URL))
+        self.breaker.record(URL, _response(500))
+        self.assertEqual(circuit.OPEN, self.breaker.state(URL))
+        self.assertFalse(self.breaker.allow(URL))
+        self.assertEqual(
+            [('http://freezer.api:9090', circuit.CLOSED, circuit.OPEN)],
+            self.events)
+
+    def test_client_errors_are_not_failures(self, mock_time):
+        for i in range(5):
+            self.breaker.record(URL, _response(404))
+        self.assertTrue(self.breaker.allow(URL))
+
+    def test_tracked_per_endpoint(self, mock_time):
+        self._open()
+        self.assertFalse(self.breaker.allow(URL))
+        self.assertTrue(self.breaker.allow('http://other:9090/v2/jobs/'))
+
+    def test_half_open_then_closed(self, mock_time):
+        self._open()
+        mock_time.return_value = 110
+        self.assertEqual(circuit.HALF_OPEN, self.breaker.state(URL))
+        self.assertTrue(self.breaker.allow(URL))
+        self.assertFalse(self.breaker.allow(URL))
+        self.breaker.record(URL, _response(200))
+        self.assertEqual(circuit.CLOSED, self.breaker.state(URL))
+        self.assertEqual([circuit.OPEN, circuit.HALF_OPEN, circuit.CLOSED],
+                         [e[2] for e in self.events])
+
+    def test_half_open_then_reopened(self, mock_time):
+        self._open()
+        mock_time.return_value = 110
+        self.assertTrue(self.breaker.allow(URL))
+        self.breaker.record(URL)
+        self.assertEqual(circuit.OPEN, self.breaker.state(URL))
+
+    def test_reject_fails_fast(self, mock_time):
+        self._open()
+        mock_time.return_value = 104
+        with self.assertRaises(exceptions.CircuitOpenError) as ctx:
+            self.breaker.reject('GET', URL)
+        self.assertEqual('http://freezer.api:9090', ctx.exception.endpoint)
+        self.assertEqual(6, ctx.exception.retry_in)
+
+    def test_reject_with_fallback(self, mock_time):
+        cached = _response(200)
+        fallback = mock.Mock(return_value=cached)
+        self.breaker.fallback = fallback
+        self._open()
+        self.assertIs(cached, self.breaker.reject('GET', URL, params={}))
+        fallback.assert_called_once_with('GET', URL, params={})
+
+
+class TestTransportCircuitBreaker(unittest.TestCase):
+
+    def setUp(self):
+        self.breaker = circuit.CircuitBreaker(failure_threshold=2)
+        self.transport = transport.HTTPTransport(
+            circuit_breaker=self.breaker)
+        patcher = mock.patch.object(self.transport.session, 'request')
+        self.mock_request = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_open_circuit_fails_fast(self):
+        self.mock_request.side_effect = requests.exceptions.ConnectionError
+        for i in range(2):
+            self.assertRaises(requests.exceptions.ConnectionError,
+                              self.transport.get, URL)
+        self.assertRaises(exceptions.CircuitOpenError,
+                          self.transport.get, URL)
+        self.assertEqual(2, self.mock_request.call_count)
+
+    def test_success_keeps_circuit_closed(self):
+        self.mock_request.return_value = _response(200)
+        for i in range(3):
+            self.transport.get(URL)
+        self.assertEqual(circuit.CLOSED, self.breaker.state(URL))
@@ -53,7 +53,10 @@ class TestOscPlugin(unittest.TestCase):
             session=mock_instance.session,
             endpoint='fake_endpoint',
             insecure=False,
-            cacert=None
+            cacert=None,
+            endpoint_type='public',
+            region_name='RegionOne',
+            use_adapter=True
         )
 
     @mock.patch('freezerclient.v2.client.Client', autospec=True)
@@ -73,7 +76,10 @@ class TestOscPlugin(unittest.TestCase):
             session=mock_instance.session,
             endpoint='fake_endpoint',
             insecure=True,
-            cacert=None
+            cacert=None,
+            endpoint_type='public',
+            region_name='RegionOne',
+            use_adapter=True
         )
 
     @mock.patch('freezerclient.v2.client.Client', autospec=True)
@@ -93,7 +99,10 @@ class TestOscPlugin(unittest.TestCase):
             session=mock_instance.session,
             endpoint='fake_endpoint',
             insecure=False,
-            cacert='/path/to/ca'
+            cacert='/path/to/ca',
+            endpoint_type='public',
+            region_name='RegionOne',
+            use_adapter=True
         )
 
     @mock.patch('freezerclient.v2.client.Client', autospec=True)
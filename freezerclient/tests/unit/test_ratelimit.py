@@ -0,0 +1,92 @@
+# (c) Copyright 2026 Cleura AB
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import unittest
+from unittest import mock
+
+from freezerclient import ratelimit
+
+
+@mock.patch('freezerclient.ratelimit.time')
+class TestTokenBucket(unittest.TestCase):
+
+    def test_burst_then_spaced_out(self, mock_time):
+        mock_time.monotonic.return_value = 100.0
+        bucket = ratelimit.TokenBucket(2, burst=2)
+        self.assertEqual(0, bucket.reserve())
+        self.assertEqual(0, bucket.reserve())
+        self.assertAlmostEqual(0.5, bucket.reserve())
+        self.assertAlmostEqual(1.0, bucket.reserve())
+
+    def test_refill_is_capped_by_burst(self, mock_time):
+        mock_time.monotonic.return_value = 100.0
+        bucket = ratelimit.TokenBucket(1)
+        self.assertEqual(0, bucket.reserve())
+        mock_time.monotonic.return_value = 200.0
+        self.assertEqual(0, bucket.reserve())
+        self.assertAlmostEqual(1.0, bucket.reserve())
+
+    def test_release_gives_the_token_back(self, mock_time):
+        mock_time.monotonic.return_value = 100.0
+        bucket = ratelimit.TokenBucket(2, burst=1)
+        self.assertEqual(0, bucket.reserve())
+        self.assertAlmostEqual(0.5, bucket.reserve())
+        bucket.release()
+        self.assertAlmostEqual(0.5, bucket.reserve())
+        bucket.release()
+        bucket.release()
+        bucket.release()
+        self.assertEqual(0, bucket.reserve())
+
+    def test_acquire_sleeps(self, mock_time):
+        mock_time.monotonic.return_value = 100.0
+        bucket = ratelimit.TokenBucket(4, burst=1)
+        bucket.acquire()
+        self.assertFalse(mock_time.sleep.called)
+        bucket.acquire()
+        mock_time.sleep.assert_called_once_with(0.25)
+
+    def test_invalid_rate(self, mock_time):
+        self.assertRaises(ValueError, ratelimit.TokenBucket, 0)
+
+
+class TestRateLimiter(unittest.TestCase):
+
+    @mock.patch('freezerclient.ratelimit.time')
+    def test_separate_budgets(self, mock_time):
+        mock_time.monotonic.return_value = 100.0
+        limiter = ratelimit.RateLimiter(read_rate=2, write_rate=1)
+        self.assertEqual(0, limiter.reserve('GET'))
+        self.assertEqual(0, limiter.reserve('head'))
+        self.assertAlmostEqual(0.5, limiter.reserve('GET'))
+        self.assertEqual(0, limiter.reserve('POST'))
+        self.assertAlmostEqual(1.0, limiter.reserve('DELETE'))
+
+    def test_unlimited(self):
+        limiter = ratelimit.RateLimiter(write_rate=1)
+        self.assertIsNone(limiter.read)
+        for _ in range(10):
+            self.assertEqual(0, limiter.reserve('GET'))
+
+    @mock.patch('freezerclient.ratelimit.time')
+    def test_release(self, mock_time):
+        mock_time.monotonic.return_value = 100.0
+        limiter = ratelimit.RateLimiter(read_rate=1, write_rate=1)
+        self.assertEqual(0, limiter.reserve('GET'))
+        limiter.release('GET')
+        limiter.release('OPTIONS')
+        self.assertEqual(0, limiter.reserve('GET'))
+        self.assertEqual(0, limiter.reserve('PUT'))
+        self.assertAlmostEqual(1.0, limiter.reserve('PUT'))
+        ratelimit.RateLimiter(write_rate=1).release('GET')
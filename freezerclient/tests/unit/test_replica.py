@@ -0,0 +1,98 @@
+# (c) Copyright 2026 Cleura AB
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from freezerclient import replica
+
+
+def make_backup(backup_id, time_stamp, hostname='h1', level=0):
+    return {'backup_id': backup_id,
+            'backup_metadata': {'hostname': hostname,
+                                'path_to_backup': '/data',
+                                'time_stamp': time_stamp,
+                                'curr_backup_level': level,
+                                'container': 'c1'}}
+
+
+class TestBackupReplica(unittest.TestCase):
+
+    def setUp(self):
+        self.replica = replica.BackupReplica(':memory:', 'cloud|project')
+        self.addCleanup(self.replica.close)
+
+    def test_store_and_list_by_time(self):
+        self.assertIsNone(self.replica.watermark)
+        self.assertEqual(3, self.replica.store(
+            [make_backup('b', 20), make_backup('a', 30),
+             make_backup('c', 10)], batch_size=2))
+        self.assertEqual(30, self.replica.watermark)
+        self.assertEqual(['c', 'b', 'a'], [
+            b['backup_id'] for b in self.replica.list()])
+        self.assertEqual(['b'], [b['backup_id'] for b in self.replica.list(
+            limit=1, offset=1)])
+        self.assertEqual(['b', 'a'], [
+            b['backup_id'] for b in self.replica.list(time_after=20,
+                                                      time_before=30)])
+
+    def test_filters(self):
+        self.replica.store([make_backup('a', 10, 'h1', 0),
+                            make_backup('b', 20, 'h2', 1),
+                            make_backup('c', 30, 'h2', 0)])
+        self.assertEqual(['b', 'c'], [
+            b['backup_id'] for b in self.replica.list(hostname='h2')])
+        self.assertEqual(['c'], [b['backup_id'] for b in self.replica.list(
+            hostname='h2', curr_backup_level=0, container='c1')])
+        self.assertRaises(ValueError, self.replica.list, size=1)
+
+    def test_scopes_are_separate(self):
+        self.replica.store([make_backup('a', 10)])
+        other = replica.BackupReplica(':memory:', 'other')
+        self.addCleanup(other.close)
+        self.assertEqual(0, len(other))
+        self.assertEqual(1, len(self.replica))
+
+    def test_incremental_sync(self):
+        manager = mock.Mock()
+        manager.iter_list.return_value = iter([make_backup('a', 10),
+                                               make_backup('b', 20)])
+        self.assertEqual(2, self.replica.sync(manager, concurrency=4))
+        manager.iter_list.assert_called_once_with(search={}, concurrency=4)
+        manager.iter_list.return_value = iter([make_backup('b', 20),
+                                               make_backup('c', 30)])
+        self.assertEqual(2, self.replica.sync(manager, page_size=50))
+        manager.iter_list.assert_called_with(search={'time_after': 20},
+                                             concurrency=1, page_size=50)
+        self.assertEqual(3, len(self.replica))
+        self.assertEqual(30, self.replica.watermark)
+
+    def test_full_sync_drops_deleted_backups(self):
+        self.replica.store([make_backup('a', 10), make_backup('b', 20)])
+        manager = mock.Mock()
+        manager.iter_list.return_value = iter([make_backup('b', 20)])
+        self.replica.sync(manager, full=True)
+        manager.iter_list.assert_called_once_with(search={}, concurrency=1)
+        self.assertEqual(['b'], [b['backup_id'] for b in self.replica.list()])
+
+    def test_database_is_created(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, 'sub', 'backups.sqlite')
+            with replica.BackupReplica(path) as backups:
+                backups.store([make_backup('a', 10)])
+            with replica.BackupReplica(path) as backups:
+                self.assertEqual(10, backups.watermark)
+                self.assertEqual(1, len(backups))
@@ -0,0 +1,79 @@
+# (c) Copyright 2026 Cleura AB
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import unittest
+from unittest import mock
+
+from freezerclient import retry
+
+
+def _response(status_code, headers=None):
+    response = mock.Mock(status_code=status_code)
+    response.headers = headers or {}
+    return response
+
+
+class TestRetryPolicy(unittest.TestCase):
+
+    def setUp(self):
+        self.policy = retry.RetryPolicy(max_attempts=4, backoff_base=1,
+                                        backoff_cap=3)
+
+    @mock.patch('freezerclient.retry.random.uniform')
+    def test_full_jitter_backoff(self, mock_uniform):
+        self.policy.backoff(1)
+        mock_uniform.assert_called_with(0, 1)
+        self.policy.backoff(2)
+        mock_uniform.assert_called_with(0, 2)
+        self.policy.backoff(5)
+        mock_uniform.assert_called_with(0, 3)
+
+    def test_retry_connection_error(self):
+        self.assertIsNotNone(self.policy.next_delay('GET', 1))
+
+    def test_retry_status_code(self):
+        self.assertIsNotNone(self.policy.next_delay('GET', 1,
+                                                    _response(502)))
+        self.assertIsNone(self.policy.next_delay('GET', 1, _response(404)))
+
+    def test_max_attempts(self):
+        self.assertIsNotNone(self.policy.next_delay('GET', 3))
+        self.assertIsNone(self.policy.next_delay('GET', 4))
+
+    def test_non_idempotent_methods_not_retried(self):
+        self.assertIsNone(self.policy.next_delay('POST', 1))
+        self.assertIsNone(self.policy.next_delay('PATCH', 1,
+                                                 _response(503)))
+        self.assertIsNotNone(self.policy.next_delay('delete', 1))
+
+    def test_retry_after_seconds(self):
+        response = _response(429, {'Retry-After': '7'})
+        self.assertEqual(7, self.policy.next_delay('GET', 1, response))
+
+    def test_retry_after_date(self):
+        response = _response(503,
+                             {'Retry-After': 'Wed, 21 Oct 2015 07:28:00 GMT'})
+        self.assertEqual(0, self.policy.next_delay('GET', 1, response))
+
+    def test_retry_after_too_long(self):
+        response = _response(503, {'Retry-After': '3600'})
+        self.assertIsNone(self.policy.next_delay('GET', 1, response))
+
+    def test_retry_after_ignored_on_other_codes(self):
+        response = _response(500, {'Retry-After': '60'})
+        self.assertLessEqual(self.policy.next_delay('GET', 1, response), 1)
+
+    def test_disabled(self):
+        policy = retry.RetryPolicy(max_attempts=1)
+        self.assertIsNone(policy.next_delay('GET', 1))
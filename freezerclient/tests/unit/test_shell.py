@@ -20,8 +20,12 @@ import fixtures
 import io
 import testtools
 from testtools import matchers
+from unittest import mock
 
 from freezerclient import shell as openstack_shell
+from freezerclient import timeouts
+from freezerclient.v2 import client as v2_client
+from freezerclient.v2 import jobs
 
 
 DEFAULT_USERNAME = 'username'
@@ -133,3 +137,67 @@ class ShellTest(testtools.TestCase):
             '--os-auth-url http://127.0.0.1:5001 job-list')
         stdout, stderr, options = self.shell(cmd)
         self.assertEqual("http://127.0.0.1:5001", options.os_auth_url)
+
+    def test_timeout_applies_deadline_to_command(self):
+        _shell = openstack_shell.FreezerShell()
+        _shell.options = _shell.build_option_parser(
+            'desc', '1').parse_args(['--timeout', '12.5'])
+        deadlines = []
+        with mock.patch('cliff.app.App.run_subcommand',
+                        side_effect=lambda argv: deadlines.append(
+                            timeouts.current())):
+            _shell.run_subcommand(['job-list'])
+        self.assertEqual(12.5, deadlines[0].timeout)
+        self.assertIsNone(timeouts.current())
+
+    def test_set_os_token_cache_dir(self):
+        cmd = (
+            '--os-token-cache-dir /tmp/freezer-tokens job-list')
+        stdout, stderr, options = self.shell(cmd)
+        self.assertEqual("/tmp/freezer-tokens", options.os_token_cache_dir)
+
+    @mock.patch('freezerclient.utils.get_client_instance')
+    def test_client_is_memoized(self, mock_get_client_instance):
+        _shell = openstack_shell.FreezerShell()
+        _shell.options = _shell.build_option_parser(
+            'desc', '1').parse_args([])
+        self.assertIs(_shell.client, _shell.client)
+        mock_get_client_instance.assert_called_once_with(
+            mock.ANY, api_version='2')
+
+    @mock.patch('freezerclient.utils.get_client_instance')
+    def test_region_name_passed_to_client(self, mock_get_client_instance):
+        _shell = openstack_shell.FreezerShell()
+        _shell.options = _shell.build_option_parser(
+            'desc', '1').parse_args(['--os-region-name', 'RegionTwo'])
+        _shell.client
+        opts = mock_get_client_instance.call_args[0][0]
+        self.assertEqual('RegionTwo', opts['region_name'])
+
+    @mock.patch('freezerclient.utils.doc_from_json_file')
+    def test_commands_share_one_session(self, mock_doc_from_json_file):
+        mock_doc_from_json_file.return_value = {'description': 'test'}
+        _shell = openstack_shell.FreezerShell()
+        _shell.options = _shell.build_option_parser(
+            'desc', '1').parse_args(['--os-backup-url', 'http://f:9090',
+                                     '--os-project-id', 'tecs'])
+        clients = v2_client.STATS['clients']
+        sessions = v2_client.STATS['sessions']
+
+        with mock.patch('keystoneauth1.loading.get_plugin_loader'), \
+                mock.patch('keystoneauth1.loading.session.Session'):
+            cmd = jobs.JobCreate(_shell, None)
+            with mock.patch.object(
+                    v2_client.Client, 'transport') as mock_transport:
+                mock_transport.post.return_value.status_code = 201
+                mock_transport.post.return_value.json.return_value = {
+                    'job_id': 'j1'}
+                mock_transport.get.return_value.status_code = 200
+                mock_transport.get.return_value.json.return_value = {
+                    'job_id': 'j1'}
+                parsed_args = cmd.get_parser('job-create').parse_args(
+                    ['--file', 'job.json', '--client', 'c1'])
+                cmd.take_action(parsed_args)
+
+        self.assertEqual(clients + 1, v2_client.STATS['clients'])
+        self.assertEqual(sessions + 1, v2_client.STATS['sessions'])
@@ -0,0 +1,108 @@
+# (c) Copyright 2026 Cleura AB
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+import threading
+import unittest
+
+from freezerclient import singleflight
+
+
+class TestGroup(unittest.TestCase):
+
+    def _run_concurrently(self, group, func, count=4):
+        results = []
+        errors = []
+
+        def call():
+            try:
+                results.append(group.do('k', func))
+            except Exception as err:
+                errors.append(err)
+
+        threads = [threading.Thread(target=call) for _ in range(count)]
+        for thread in threads:
+            thread.start()
+        return threads, results, errors
+
+    def test_concurrent_calls_share_the_result(self):
+        group = singleflight.Group()
+        release = threading.Event()
+        calls = []
+
+        def func():
+            calls.append(1)
+            release.wait()
+            return {'jobs': [1]}
+
+        threads, results, _ = self._run_concurrently(group, func)
+        while group.calls + group.coalesced < 4:
+            pass
+        release.set()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(1, len(calls))
+        self.assertEqual([{'jobs': [1]}] * 4, results)
+        self.assertEqual((1, 3), (group.calls, group.coalesced))
+        results[0]['jobs'].append(2)
+        self.assertEqual([1], results[1]['jobs'])
+
+    def test_errors_are_shared(self):
+        group = singleflight.Group()
+        release = threading.Event()
+
+        def func():
+            release.wait()
+            raise ValueError('boom')
+
+        threads, _, errors = self._run_concurrently(group, func, count=2)
+        while group.calls + group.coalesced < 2:
+            pass
+        release.set()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(2, len(errors))
+
+    def test_sequential_calls_are_not_shared(self):
+        group = singleflight.Group()
+        self.assertEqual(1, group.do('k', lambda: 1))
+        self.assertEqual(2, group.do('k', lambda: 2))
+        self.assertEqual((2, 0), (group.calls, group.coalesced))
+
+    def test_request_key(self):
+        self.assertEqual(
+            singleflight.request_key('GET', 'u', 't', {'a': 1, 'b': 2}),
+            singleflight.request_key('GET', 'u', 't', {'b': 2, 'a': 1}))
+        self.assertNotEqual(singleflight.request_key('GET', 'u', 't1'),
+                            singleflight.request_key('GET', 'u', 't2'))
+
+
+class TestAsyncGroup(unittest.IsolatedAsyncioTestCase):
+
+    async def test_concurrent_calls_share_the_result(self):
+        group = singleflight.AsyncGroup()
+        calls = []
+
+        async def func():
+            calls.append(1)
+            await asyncio.sleep(0)
+            return [1]
+
+        results = await asyncio.gather(*(group.do('k', func)
+                                         for _ in range(3)))
+        self.assertEqual([[1]] * 3, results)
+        self.assertEqual(1, len(calls))
+        self.assertEqual((1, 2), (group.calls, group.coalesced))
+        await group.do('k', func)
+        self.assertEqual(2, len(calls))
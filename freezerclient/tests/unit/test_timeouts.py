@@ -0,0 +1,144 @@
+# (c) Copyright 2026 Cleura AB
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import threading
+import unittest
+from unittest import mock
+
+import requests
+
+from freezerclient import exceptions
+from freezerclient import retry
+from freezerclient import timeouts
+from freezerclient import transport
+from freezerclient.v2.managers import base
+
+
+class TestDeadline(unittest.TestCase):
+
+    def test_check(self):
+        self.assertGreater(timeouts.Deadline(30).check(), 29)
+        self.assertRaises(exceptions.DeadlineExceeded,
+                          timeouts.Deadline(0).check)
+
+    def test_activate(self):
+        self.assertIsNone(timeouts.current())
+        with timeouts.within(30) as deadline:
+            self.assertIs(deadline, timeouts.current())
+        self.assertIsNone(timeouts.current())
+
+    def test_nested_deadline_never_extends(self):
+        with timeouts.within(5) as outer:
+            with timeouts.within(60) as inner:
+                self.assertIs(outer, inner)
+            with timeouts.within(1) as inner:
+                self.assertIsNot(outer, inner)
+            self.assertIs(outer, timeouts.current())
+
+    def test_bounded_runs_under_deadline_in_threads(self):
+        deadline = timeouts.Deadline(30)
+        seen = []
+        func = timeouts.bounded(lambda: seen.append(timeouts.current()),
+                                deadline)
+        thread = threading.Thread(target=func)
+        thread.start()
+        thread.join()
+        self.assertEqual([deadline], seen)
+
+    def test_bounded_expired(self):
+        func = mock.Mock()
+        bounded = timeouts.bounded(func, timeouts.Deadline(0))
+        self.assertRaises(exceptions.DeadlineExceeded, bounded)
+        func.assert_not_called()
+
+
+class TestTransportTimeouts(unittest.TestCase):
+
+    def setUp(self):
+        self.transport = transport.HTTPTransport(timeout=(3, 20))
+        patcher = mock.patch.object(self.transport.session, 'request')
+        self.mock_request = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_timeout_passed_to_requests(self):
+        self.transport.get('http://freezer.api/v2/jobs/')
+        self.mock_request.assert_called_once_with(
+            'GET', 'http://freezer.api/v2/jobs/', timeout=(3, 20))
+
+    def test_timeout_capped_by_deadline(self):
+        with timeouts.within(10):
+            self.transport.get('http://freezer.api/v2/jobs/')
+        connect, read = self.mock_request.call_args[1]['timeout']
+        self.assertEqual(3, connect)
+        self.assertLessEqual(read, 10)
+
+    def test_expired_deadline_sends_nothing(self):
+        with timeouts.activate(timeouts.Deadline(0)):
+            self.assertRaises(exceptions.DeadlineExceeded,
+                              self.transport.get,
+                              'http://freezer.api/v2/jobs/')
+        self.mock_request.assert_not_called()
+
+    @mock.patch('freezerclient.transport.time.sleep')
+    def test_deadline_stops_retries(self, mock_sleep):
+        self.transport.retry_policy = retry.RetryPolicy(max_attempts=5)
+        response = mock.Mock(status_code=503, headers={'Retry-After': '60'})
+        self.mock_request.return_value = response
+        with timeouts.within(10):
+            r = self.transport.get('http://freezer.api/v2/jobs/')
+        self.assertIs(response, r)
+        self.assertEqual(1, self.mock_request.call_count)
+        mock_sleep.assert_not_called()
+
+    @mock.patch('freezerclient.transport.time.sleep')
+    def test_timeout_error_not_retried_past_deadline(self, mock_sleep):
+        self.transport.retry_policy = retry.RetryPolicy(max_attempts=5,
+                                                        backoff_base=60,
+                                                        backoff_cap=60)
+        self.mock_request.side_effect = requests.exceptions.ReadTimeout
+        with mock.patch('freezerclient.retry.random.uniform',
+                        return_value=60):
+            with timeouts.within(10):
+                self.assertRaises(requests.exceptions.ReadTimeout,
+                                  self.transport.get,
+                                  'http://freezer.api/v2/jobs/')
+        self.assertEqual(1, self.mock_request.call_count)
+
+
+class TestPaginationDeadline(unittest.TestCase):
+
+    def test_deadline_stops_pagination(self):
+        deadline = timeouts.Deadline(30)
+        calls = []
+
+        def list_page(limit, offset):
+            calls.append(timeouts.current())
+            if offset:
+                deadline.expires_at = 0
+            return [offset] * limit
+
+        records = base.BaseManager._iter_pages(list_page, page_size=1,
+                                               deadline=deadline)
+        self.assertEqual([0, 1], [next(records), next(records)])
+        self.assertRaises(exceptions.DeadlineExceeded, next, records)
+        self.assertEqual([deadline, deadline], calls)
+
+    def test_deadline_stops_prefetch(self):
+        deadline = timeouts.Deadline(0)
+        list_page = mock.Mock(return_value=[1])
+        records = base.BaseManager._iter_pages(list_page, page_size=1,
+                                               concurrency=4,
+                                               deadline=deadline)
+        self.assertRaises(exceptions.DeadlineExceeded, list, records)
+        list_page.assert_not_called()
@@ -0,0 +1,101 @@
+# (c) Copyright 2026 Cleura AB
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+import stat
+import tempfile
+import unittest
+from unittest import mock
+
+from freezerclient import token_cache
+from freezerclient.v2 import client
+
+
+def _plugin(cache_id='id/1+', state='{"auth_token": "t"}'):
+    plugin = mock.Mock()
+    plugin.get_cache_id.return_value = cache_id
+    plugin.get_auth_state.return_value = state
+    return plugin
+
+
+class TestTokenCache(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.cache_dir = os.path.join(self.tmp.name, 'tokens')
+        self.cache = token_cache.TokenCache(self.cache_dir)
+
+    def test_save_then_load(self):
+        self.cache.save(_plugin())
+        other = _plugin(state=None)
+        self.assertTrue(token_cache.TokenCache(self.cache_dir).load(other))
+        other.set_auth_state.assert_called_once_with('{"auth_token": "t"}')
+
+    def test_file_permissions(self):
+        self.cache.save(_plugin())
+        files = os.listdir(self.cache_dir)
+        self.assertEqual(1, len(files))
+        mode = os.stat(os.path.join(self.cache_dir, files[0])).st_mode
+        self.assertEqual(0o600, stat.S_IMODE(mode))
+        self.assertEqual(
+            0o700, stat.S_IMODE(os.stat(self.cache_dir).st_mode))
+
+    def test_keyed_by_cache_id(self):
+        self.cache.save(_plugin(cache_id='a'))
+        self.assertFalse(self.cache.load(_plugin(cache_id='b')))
+
+    def test_unsupported_plugin(self):
+        plugin = _plugin(cache_id=None)
+        self.cache.save(plugin)
+        self.assertFalse(self.cache.load(plugin))
+        self.assertFalse(os.path.exists(self.cache_dir))
+
+    def test_ignore_file_readable_by_others(self):
+        self.cache.save(_plugin())
+        path = os.path.join(self.cache_dir, os.listdir(self.cache_dir)[0])
+        os.chmod(path, 0o644)
+        plugin = _plugin()
+        self.assertFalse(self.cache.load(plugin))
+        plugin.set_auth_state.assert_not_called()
+
+    def test_save_skipped_when_token_unchanged(self):
+        plugin = _plugin()
+        self.cache.save(plugin)
+        self.cache.save(plugin)
+        self.assertEqual(1, plugin.get_auth_state.call_count)
+        plugin.auth_ref = mock.Mock()
+        self.cache.save(plugin)
+        self.assertEqual(2, plugin.get_auth_state.call_count)
+
+
+class TestClientTokenCache(unittest.TestCase):
+
+    @mock.patch('keystoneauth1.loading.session.Session')
+    @mock.patch('keystoneauth1.loading.get_plugin_loader')
+    def test_client_loads_and_saves_cache(self, mock_loader, mock_session):
+        with tempfile.TemporaryDirectory() as cache_dir:
+            c = client.Client(auth_url='http://k/v3', username='u',
+                              password='p', project_name='p',
+                              token_cache_dir=cache_dir)
+            with mock.patch.object(c.token_cache, 'load') as load, \
+                    mock.patch.object(c.token_cache, 'save') as save:
+                c.auth_token
+            plugin = mock_loader.return_value.load_from_options.return_value
+            load.assert_called_once_with(plugin)
+            save.assert_called_once_with(c.session.auth)
+
+    def test_disabled_with_external_session(self):
+        c = client.Client(session=mock.Mock(), token_cache_dir='/nonexistent')
+        self.assertIsNone(c.token_cache)
@@ -0,0 +1,126 @@
+# (c) Copyright 2026 Cleura AB
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import datetime
+import threading
+import unittest
+from unittest import mock
+
+from keystoneauth1 import identity
+
+from freezerclient import token_refresh
+from freezerclient.v2 import client
+
+
+def _auth_ref(expires_in):
+    now = datetime.datetime.now(datetime.timezone.utc)
+    auth_ref = mock.Mock()
+    auth_ref.expires = now + datetime.timedelta(seconds=expires_in)
+    return auth_ref
+
+
+class TestTokenRefresher(unittest.TestCase):
+
+    def setUp(self):
+        self.session = mock.Mock()
+        self.session.auth.auth_ref = _auth_ref(3600)
+
+    def _start(self, refresher):
+        refresher.start(self.session)
+        self.addCleanup(refresher.stop)
+
+    def test_refresh_before_expiry(self):
+        new_ref = _auth_ref(3600)
+        refreshed = threading.Event()
+        self.session.auth.auth_ref = _auth_ref(60)
+        self.session.auth.get_auth_ref.return_value = new_ref
+        self._start(token_refresh.TokenRefresher(
+            margin=120, on_refresh=refreshed.set, retry_interval=0.01))
+        self.assertTrue(refreshed.wait(5))
+        self.assertIs(new_ref, self.session.auth.auth_ref)
+        self.session.auth.invalidate.assert_not_called()
+
+    def test_no_refresh_outside_margin(self):
+        refresher = token_refresh.TokenRefresher(margin=120,
+                                                 retry_interval=0.01)
+        refresher.session = self.session
+        self.assertGreater(refresher._next_delay(), 3000)
+
+    def test_unauthenticated_session_is_not_refreshed(self):
+        self.session.auth.auth_ref = None
+        refresher = token_refresh.TokenRefresher(retry_interval=0.01)
+        refresher.session = self.session
+        self.assertIsNone(refresher._next_delay())
+
+    def test_refresh_failure_reported(self):
+        errors = []
+        failed = threading.Event()
+
+        def on_error(err):
+            errors.append(err)
+            failed.set()
+
+        error = Exception('keystone down')
+        self.session.auth.auth_ref = _auth_ref(60)
+        self.session.auth.get_auth_ref.side_effect = error
+        self._start(token_refresh.TokenRefresher(
+            margin=120, on_error=on_error, retry_interval=0.01))
+        self.assertTrue(failed.wait(5))
+        self.assertIs(error, errors[0])
+
+    def test_stops_when_the_token_is_not_renewed(self):
+        auth_ref = _auth_ref(60)
+        self.session.auth.auth_ref = auth_ref
+        self.session.auth.get_auth_ref.return_value = auth_ref
+        refresher = token_refresh.TokenRefresher(margin=120,
+                                                 retry_interval=0.01)
+        self._start(refresher)
+        refresher._thread.join(5)
+        self.assertFalse(refresher._thread.is_alive())
+        self.assertEqual(1, self.session.auth.get_auth_ref.call_count)
+
+    def test_token_plugin_ignored(self):
+        self.session.auth = identity.Token('http://keystone', 'token')
+        refresher = token_refresh.TokenRefresher()
+        refresher.start(self.session)
+        self.assertIsNone(refresher._thread)
+
+    def test_non_identity_plugin_ignored(self):
+        self.session.auth = object()
+        refresher = token_refresh.TokenRefresher()
+        refresher.start(self.session)
+        self.assertIsNone(refresher._thread)
+
+
+class TestClientTokenRefresh(unittest.TestCase):
+
+    def test_disabled_by_default(self):
+        c = client.Client(session=mock.Mock())
+        self.assertIsNone(c.token_refresher)
+
+    def test_started_with_session(self):
+        on_error = mock.Mock()
+        c = client.Client(session=mock.Mock(), token_refresh_margin=600,
+                          on_token_refresh_error=on_error)
+        self.assertEqual(600, c.token_refresher.margin)
+        self.assertIs(on_error, c.token_refresher.on_error)
+        with mock.patch.object(c.token_refresher, 'start') as start:
+            c.session
+        start.assert_called_once_with(c.session)
+
+    def test_close_stops_refresher(self):
+        c = client.Client(session=mock.Mock(), token_refresh_margin=600)
+        with mock.patch.object(c.token_refresher, 'stop') as stop:
+            c.close()
+        stop.assert_called_once_with()
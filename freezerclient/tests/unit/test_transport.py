@@ -0,0 +1,278 @@
+# (c) Copyright 2026 Cleura AB
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import unittest
+from unittest import mock
+
+import requests
+
+from freezerclient import balancer
+from freezerclient import circuit
+from freezerclient import exceptions
+from freezerclient import retry
+from freezerclient import timeouts
+from freezerclient import transport
+
+
+class TestHTTPTransport(unittest.TestCase):
+
+    def test_adapter_uses_pool_settings(self):
+        t = transport.HTTPTransport(pool_connections=3, pool_maxsize=7,
+                                    pool_block=True)
+        for prefix in ('http://', 'https://'):
+            adapter = t.session.get_adapter(prefix + 'freezer.api')
+            self.assertEqual(3, adapter._pool_connections)
+            self.assertEqual(7, adapter._pool_maxsize)
+            self.assertTrue(adapter._pool_block)
+
+    def test_http_and_https_share_adapter(self):
+        t = transport.HTTPTransport()
+        self.assertIs(t.session.get_adapter('http://freezer.api'),
+                      t.session.get_adapter('https://freezer.api'))
+
+    def test_keep_alive_disabled(self):
+        t = transport.HTTPTransport(keep_alive=False)
+        self.assertEqual('close', t.session.headers['Connection'])
+
+    def test_keep_alive_default(self):
+        t = transport.HTTPTransport()
+        self.assertNotEqual('close', t.session.headers.get('Connection'))
+
+    def test_verbs_go_through_session(self):
+        t = transport.HTTPTransport()
+        with mock.patch.object(t.session, 'request') as mock_request:
+            for verb in ('get', 'post', 'put', 'patch', 'delete'):
+                retval = getattr(t, verb)('http://freezer.api/v2/jobs/',
+                                          headers={'a': 'b'}, verify=False)
+                self.assertEqual(mock_request.return_value, retval)
+                mock_request.assert_called_with(
+                    verb.upper(), 'http://freezer.api/v2/jobs/',
+                    headers={'a': 'b'}, verify=False)
+
+    def test_close(self):
+        t = transport.HTTPTransport()
+        with mock.patch.object(t.session, 'close') as mock_close:
+            t.close()
+        mock_close.assert_called_once_with()
+
+
+@mock.patch('freezerclient.transport.time.sleep')
+class TestTransportRetry(unittest.TestCase):
+
+    def setUp(self):
+        self.transport = transport.HTTPTransport(
+            retry_policy=retry.RetryPolicy(max_attempts=3))
+        patcher = mock.patch.object(self.transport.session, 'request')
+        self.mock_request = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_retry_until_success(self, mock_sleep):
+        self.mock_request.side_effect = [
+            mock.Mock(status_code=503, headers={'Retry-After': '2'}),
+            requests.exceptions.ConnectionError(),
+            mock.Mock(status_code=200)]
+        r = self.transport.get('http://freezer.api/v2/jobs/')
+        self.assertEqual(200, r.status_code)
+        self.assertEqual(3, self.mock_request.call_count)
+        self.assertEqual(2, mock_sleep.call_count)
+        mock_sleep.assert_any_call(2)
+
+    def test_last_response_returned(self, mock_sleep):
+        self.mock_request.return_value = mock.Mock(status_code=500,
+                                                   headers={})
+        r = self.transport.delete('http://freezer.api/v2/jobs/1')
+        self.assertEqual(500, r.status_code)
+        self.assertEqual(3, self.mock_request.call_count)
+
+    def test_last_error_raised(self, mock_sleep):
+        self.mock_request.side_effect = requests.exceptions.ConnectionError
+        self.assertRaises(requests.exceptions.ConnectionError,
+                          self.transport.get, 'http://freezer.api/v2/jobs/')
+        self.assertEqual(3, self.mock_request.call_count)
+
+    def test_post_not_retried(self, mock_sleep):
+        self.mock_request.return_value = mock.Mock(status_code=503,
+                                                   headers={})
+        self.transport.post('http://freezer.api/v2/jobs/', data='{}')
+        self.assertEqual(1, self.mock_request.call_count)
+        mock_sleep.assert_not_called()
+
+
+@mock.patch('freezerclient.transport.time.sleep')
+class TestTransportRateLimit(unittest.TestCase):
+
+    def setUp(self):
+        self.limiter = mock.Mock()
+        self.transport = transport.HTTPTransport(rate_limiter=self.limiter)
+        patcher = mock.patch.object(self.transport.session, 'request')
+        self.mock_request = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_waits_for_the_limiter(self, mock_sleep):
+        self.limiter.reserve.return_value = 0.5
+        self.transport.post('http://freezer.api/v2/jobs/', data='{}')
+        self.limiter.reserve.assert_called_once_with('POST')
+        mock_sleep.assert_called_once_with(0.5)
+        self.assertEqual(1, self.mock_request.call_count)
+
+    def test_no_wait_within_budget(self, mock_sleep):
+        self.limiter.reserve.return_value = 0
+        self.transport.get('http://freezer.api/v2/jobs/')
+        mock_sleep.assert_not_called()
+
+    def test_wait_beyond_deadline(self, mock_sleep):
+        self.limiter.reserve.return_value = 5
+        with timeouts.within(1):
+            self.assertRaises(exceptions.DeadlineExceeded,
+                              self.transport.get,
+                              'http://freezer.api/v2/jobs/')
+        self.mock_request.assert_not_called()
+        self.limiter.release.assert_called_once_with('GET')
+
+
+class TestRoute(unittest.TestCase):
+
+    def setUp(self):
+        self.transport = mock.Mock()
+        self.balancer = self.transport.balancer
+        self.balancer.acquire.return_value = ('m1', 'http://f2/v2/jobs/')
+        self.breaker = self.transport.circuit_breaker
+
+    def test_rejected_by_the_breaker(self):
+        self.balancer.acquire.side_effect = [
+            ('m1', 'http://f2/v2/jobs/'), (None, 'http://f1/v2/jobs/')]
+        self.breaker.allow.return_value = False
+        route = transport.Route(self.transport, 'http://f1/v2/jobs/')
+        self.assertFalse(route.open())
+        self.breaker.allow.assert_called_once_with('http://f2/v2/jobs/')
+        self.balancer.cancel.assert_called_once_with('m1')
+        self.balancer.release.assert_not_called()
+        self.assertEqual(self.breaker.reject.return_value,
+                         route.reject('GET', verify=True))
+        self.breaker.reject.assert_called_once_with(
+            'GET', 'http://f2/v2/jobs/', verify=True)
+
+    def test_skips_the_members_with_an_open_circuit(self):
+        self.transport.balancer = balancer.LoadBalancer(
+            ['http://f1', 'http://f2', 'http://f3'])
+        self.transport.circuit_breaker = circuit.CircuitBreaker(
+            failure_threshold=1)
+        for url in ('http://f1/', 'http://f2/'):
+            self.transport.circuit_breaker.record(url)
+        for _ in range(5):
+            route = transport.Route(self.transport, 'http://f1/v2/jobs/')
+            self.assertTrue(route.open())
+            self.assertEqual('http://f3/v2/jobs/', route.url)
+            route.succeeded(mock.Mock(status_code=200))
+        for member in self.transport.balancer.members:
+            self.assertEqual((0, 0), (member.outstanding, member.failures))
+
+        self.transport.circuit_breaker.record('http://f3/')
+        route = transport.Route(self.transport, 'http://f1/v2/jobs/')
+        self.assertFalse(route.open())
+        self.assertRaises(exceptions.CircuitOpenError, route.reject, 'GET')
+        for member in self.transport.balancer.members:
+            self.assertEqual((0, 0), (member.outstanding, member.failures))
+
+    def test_failed(self):
+        route = transport.Route(self.transport, 'http://f1/v2/jobs/')
+        self.assertTrue(route.open())
+        route.failed()
+        self.breaker.record.assert_called_once_with('http://f2/v2/jobs/')
+        self.balancer.release.assert_called_once_with('m1')
+
+    def test_succeeded(self):
+        route = transport.Route(self.transport, 'http://f1/v2/jobs/')
+        route.open()
+        response = mock.Mock()
+        route.succeeded(response)
+        self.breaker.record.assert_called_once_with('http://f2/v2/jobs/',
+                                                    response)
+        member, elapsed, released = self.balancer.release.call_args[0]
+        self.assertEqual('m1', member)
+        self.assertIs(response, released)
+
+    def test_without_balancer_nor_breaker(self):
+        self.transport.balancer = None
+        self.transport.circuit_breaker = None
+        route = transport.Route(self.transport, 'http://f1/v2/jobs/')
+        self.assertTrue(route.open())
+        self.assertEqual('http://f1/v2/jobs/', route.url)
+        route.succeeded(mock.Mock())
+
+
+class TestAttempts(unittest.TestCase):
+
+    def setUp(self):
+        self.transport = mock.Mock(rate_limiter=None, timeout=(1, 10))
+        self.transport.retry_policy = retry.RetryPolicy(max_attempts=2)
+
+    def test_retries_until_the_policy_gives_up(self):
+        attempts = transport.Attempts(self.transport, 'GET', 'http://f/')
+        self.assertEqual(0, attempts.next())
+        self.assertIsNotNone(attempts.failed(ValueError()))
+        attempts.next()
+        self.assertIsNone(attempts.failed(ValueError()))
+
+    def test_response_not_retried(self):
+        attempts = transport.Attempts(self.transport, 'GET', 'http://f/')
+        attempts.next()
+        self.assertIsNone(attempts.succeeded(
+            mock.Mock(status_code=200, headers={})))
+
+    def test_timeout_capped_by_the_deadline(self):
+        with timeouts.within(5):
+            attempts = transport.Attempts(self.transport, 'GET', 'http://f/')
+        connect, read = attempts.timeout()
+        self.assertEqual(1, connect)
+        self.assertLessEqual(read, 5)
+
+
+class TestAdapterTransport(unittest.TestCase):
+
+    @mock.patch('freezerclient.transport.ksa_adapter.Adapter', autospec=True)
+    def test_adapter_bound_to_session(self, mock_adapter):
+        session = mock.Mock()
+        transport.AdapterTransport(session, 'backup', interface='internal',
+                                   region_name='RegionTwo')
+        mock_adapter.assert_called_once_with(
+            session,
+            service_type='backup',
+            interface='internal',
+            region_name='RegionTwo',
+            endpoint_override=None,
+            logger=transport.LOG,
+            raise_exc=False)
+
+    @mock.patch('freezerclient.transport.ksa_adapter.Adapter', autospec=True)
+    def test_request_lets_keystoneauth_authenticate(self, mock_adapter):
+        t = transport.AdapterTransport(mock.Mock(), 'backup')
+        headers = {'X-Auth-Token': 'stale',
+                   'Content-Type': 'application/json'}
+        retval = t.get('http://freezer.api/v2/jobs/', headers=headers,
+                       params={'limit': 10}, verify=True)
+        adapter = mock_adapter.return_value
+        self.assertEqual(adapter.request.return_value, retval)
+        adapter.request.assert_called_once_with(
+            'http://freezer.api/v2/jobs/', 'GET',
+            headers={'Content-Type': 'application/json'},
+            params={'limit': 10})
+        # the headers of the caller are left untouched
+        self.assertEqual('stale', headers['X-Auth-Token'])
+
+    @mock.patch('freezerclient.transport.ksa_adapter.Adapter', autospec=True)
+    def test_get_endpoint(self, mock_adapter):
+        mock_adapter.return_value.get_endpoint.return_value = 'http://f:9090'
+        t = transport.AdapterTransport(mock.Mock(), 'backup')
+        self.assertEqual('http://f:9090', t.get_endpoint())
@@ -12,6 +12,140 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import os
+import tempfile
+import threading
+import time
+import unittest
+
+from freezerclient import utils
+
 
 def test_utils_todo():
     pass
+
+
+class TestRunAhead(unittest.TestCase):
+
+    def test_results_in_order(self):
+        results = utils.run_ahead(lambda a, b: a * b,
+                                  [(i, 2) for i in range(10)], 3)
+        self.assertEqual([i * 2 for i in range(10)], list(results))
+
+    def test_bounded_concurrency(self):
+        lock = threading.Lock()
+        running = [0]
+        peak = [0]
+
+        def work(i):
+            with lock:
+                running[0] += 1
+                peak[0] = max(peak[0], running[0])
+            time.sleep(0.01)
+            with lock:
+                running[0] -= 1
+            return i
+
+        results = utils.run_ahead(work, [(i,) for i in range(8)], 2)
+        self.assertEqual(list(range(8)), list(results))
+        self.assertEqual(2, peak[0])
+
+    def test_is_lazy(self):
+        calls = []
+        results = utils.run_ahead(calls.append, [(1,)], 2)
+        self.assertEqual([], calls)
+        self.assertEqual([None], list(results))
+        self.assertEqual([1], calls)
+
+    def test_propagates_errors(self):
+        def work(i):
+            if i == 1:
+                raise ValueError(i)
+            return i
+
+        results = utils.run_ahead(work, [(0,), (1,), (2,)], 2)
+        self.assertEqual(0, next(results))
+        self.assertRaises(ValueError, next, results)
+
+
+class TestRunAsCompleted(unittest.TestCase):
+
+    def test_results_in_completion_order(self):
+        def work(i):
+            time.sleep(0.05 if i == 0 else 0)
+            return i * 2
+
+        results = list(utils.run_as_completed(work,
+                                              [(i,) for i in range(4)], 2))
+        self.assertEqual((0, 0), results[-1])
+        self.assertEqual([(i, i * 2) for i in range(4)], sorted(results))
+
+    def test_bounded_concurrency(self):
+        lock = threading.Lock()
+        running = [0]
+        peak = [0]
+
+        def work(i):
+            with lock:
+                running[0] += 1
+                peak[0] = max(peak[0], running[0])
+            time.sleep(0.01)
+            with lock:
+                running[0] -= 1
+            return i
+
+        results = utils.run_as_completed(work, [(i,) for i in range(8)], 3)
+        self.assertEqual(list(range(8)), sorted(r for _, r in results))
+        self.assertEqual(3, peak[0])
+
+    def test_propagates_errors(self):
+        def work(i):
+            raise ValueError(i)
+
+        results = utils.run_as_completed(work, [(0,)], 2)
+        self.assertRaises(ValueError, next, results)
+
+
+class TestCachedProperty(unittest.TestCase):
+
+    def test_instances_do_not_wait_for_each_other(self):
+        barrier = threading.Barrier(2, timeout=5)
+
+        class Lazy(object):
+            @utils.CachedProperty
+            def value(self):
+                # raises BrokenBarrierError when the instances are
+                # computed one after the other
+                barrier.wait()
+                return id(self)
+
+        objs = [Lazy(), Lazy()]
+        threads = [threading.Thread(target=getattr, args=(obj, 'value'))
+                   for obj in objs]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual([id(obj) for obj in objs],
+                         [obj.__dict__['value'] for obj in objs])
+
+
+class TestFileSources(unittest.TestCase):
+
+    def test_lines_from_file(self):
+        with tempfile.NamedTemporaryFile('w') as f:
+            f.write('a\n\n# comment\n  b  \n')
+            f.flush()
+            self.assertEqual([(1, 'a'), (4, 'b')],
+                             list(utils.lines_from_file(f.name)))
+            self.assertEqual(['a', 'b'], list(utils.ids_from_file(f.name)))
+
+    def test_files_from_dir(self):
+        with tempfile.TemporaryDirectory() as path:
+            for name, content in (('b.json', '2'), ('a.json', '1'),
+                                  ('notes.txt', 'x')):
+                with open(os.path.join(path, name), 'w') as f:
+                    f.write(content)
+            os.mkdir(os.path.join(path, 'c.json'))
+            self.assertEqual([('a.json', '1'), ('b.json', '2')],
+                             list(utils.files_from_dir(path)))
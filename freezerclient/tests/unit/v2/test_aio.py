@@ -0,0 +1,367 @@
+# (c) Copyright 2026 Cleura AB
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+import threading
+import time
+import unittest
+from unittest import mock
+
+import aiohttp
+from aiohttp import web
+from oslo_serialization import jsonutils as json
+
+from freezerclient import cache
+from freezerclient import exceptions
+from freezerclient import singleflight
+from freezerclient import timeouts
+from freezerclient.v2.aio import client
+from freezerclient.v2.aio import managers
+from freezerclient.v2.aio import transport
+from freezerclient.v2 import client as v2_client
+
+
+def make_response(status_code, body=None):
+    content = json.dumps(body).encode() if body is not None else b''
+    return transport.Response(status_code, {}, content)
+
+
+class TestAsyncManagers(unittest.IsolatedAsyncioTestCase):
+
+    def setUp(self):
+        self.mock_client = mock.Mock()
+        self.mock_client.endpoint = 'http://testendpoint:9999'
+        self.mock_client.project_id = 'tecs'
+        self.mock_client.authenticate = mock.AsyncMock()
+        self.mock_client.get_auth_token = mock.AsyncMock(
+            return_value='testtoken')
+        self.mock_client.get_client_id = mock.AsyncMock(
+            return_value='test_client_id_78900987')
+        self.mock_client.transport = mock.AsyncMock()
+        self.mock_transport = self.mock_client.transport
+        self.headers = {
+            'X-Auth-Token': 'testtoken',
+            'Content-Type': 'application/json',
+            'Accept': 'application/json'
+        }
+
+    async def test_job_create_adds_client_id(self):
+        self.mock_transport.post.return_value = make_response(
+            201, {'job_id': 'qwerqwer'})
+        jobs = managers.JobManager(self.mock_client)
+        self.assertEqual('qwerqwer', await jobs.create({'job': 'metadata'}))
+        self.mock_transport.post.assert_awaited_once_with(
+            'http://testendpoint:9999/v2/tecs/jobs/',
+            data=json.dumps({'job': 'metadata',
+                             'client_id': 'test_client_id_78900987'}),
+            headers=self.headers,
+            verify=True)
+
+    async def test_job_get(self):
+        jobs = managers.JobManager(self.mock_client)
+        self.mock_transport.get.return_value = make_response(
+            200, {'job_id': 'qwerqwer'})
+        self.assertEqual({'job_id': 'qwerqwer'}, await jobs.get('qwerqwer'))
+        self.mock_transport.get.return_value = make_response(404)
+        self.assertIsNone(await jobs.get('qwerqwer'))
+        self.mock_transport.get.return_value = make_response(
+            500, {'description': 'boom'})
+        with self.assertRaises(exceptions.ApiClientException) as ctx:
+            await jobs.get('qwerqwer')
+        self.assertEqual(500, ctx.exception.status_code)
+        self.assertEqual('[*] Error 500: boom', str(ctx.exception))
+
+    async def test_job_start(self):
+        jobs = managers.JobManager(self.mock_client)
+        self.mock_transport.post.return_value = make_response(
+            202, {'result': 'success'})
+        self.assertEqual({'result': 'success'}, await jobs.start_job('j1'))
+        args, kwargs = self.mock_transport.post.call_args
+        self.assertEqual('http://testendpoint:9999/v2/tecs/jobs/j1/event',
+                         args[0])
+        self.assertEqual({'start': None}, json.loads(kwargs['data']))
+
+    async def test_session_update_error(self):
+        sessions = managers.SessionManager(self.mock_client)
+        self.mock_transport.patch.return_value = make_response(404)
+        with self.assertRaises(exceptions.ApiClientException):
+            await sessions.update('s1', {'status': 'bamboozled'})
+
+    async def test_backups_iter_list(self):
+        pages = [make_response(200, {'backups': [{'id': 1}, {'id': 2}]}),
+                 make_response(200, {'backups': [{'id': 3}]})]
+        self.mock_transport.get.side_effect = pages
+        backups = managers.BackupsManager(self.mock_client)
+        retval = [b['id'] async for b in backups.iter_list(page_size=2)]
+        self.assertEqual([1, 2, 3], retval)
+        self.assertEqual(
+            [{'limit': 2, 'offset': 0}, {'limit': 2, 'offset': 2}],
+            [c[1]['params'] for c in self.mock_transport.get.call_args_list])
+
+    async def test_backups_iter_list_deadline(self):
+        backups = managers.BackupsManager(self.mock_client)
+        deadline = timeouts.Deadline(0)
+        with self.assertRaises(exceptions.DeadlineExceeded):
+            [b async for b in backups.iter_list(deadline=deadline)]
+        self.mock_transport.get.assert_not_called()
+
+    async def test_backups_scan(self):
+        async def iter_list(page_size, search):
+            # two backups per window, returned newest first
+            for time_stamp in (search['time_before'], search['time_after']):
+                yield {'backup_metadata': {'time_stamp': time_stamp}}
+
+        backups = managers.BackupsManager(self.mock_client)
+        backups.iter_list = mock.Mock(side_effect=iter_list)
+        retval = [b async for b in backups.scan(100, 129, window=10,
+                                                search={'match': []},
+                                                concurrency=2)]
+        self.assertEqual([100, 109, 110, 119, 120, 129],
+                         [b['backup_metadata']['time_stamp'] for b in retval])
+        self.assertEqual(3, backups.iter_list.call_count)
+        self.assertRaises(ValueError, backups.scan, 0, 10, window=0)
+
+    async def test_iter_pages_concurrent_max_items(self):
+        async def list_page(limit, offset):
+            return list(range(offset, offset + limit))
+
+        pages = managers.BaseManager._iter_pages(list_page, 3, max_items=7,
+                                                 concurrency=3)
+        self.assertEqual(list(range(7)), [i async for i in pages])
+
+    async def test_jobs_iter_list_filters_on_client_id(self):
+        self.mock_transport.get.return_value = make_response(
+            200, {'jobs': []})
+        jobs = managers.JobManager(self.mock_client)
+        self.assertEqual([], [j async for j in jobs.iter_list()])
+        self.assertEqual(
+            {'match': [{'client_id': 'test_client_id_78900987'}]},
+            json.loads(self.mock_transport.get.call_args[1]['data']))
+
+    async def test_delete_many_collects_errors(self):
+        self.mock_transport.delete.side_effect = [
+            make_response(204), make_response(404, {'error': 'missing'}),
+            make_response(204)]
+        jobs = managers.JobManager(self.mock_client)
+        progress = mock.Mock()
+        results = await jobs.delete_many(['a', 'b', 'c'], concurrency=1,
+                                         on_progress=progress)
+        self.assertEqual(['a', 'b', 'c'], [r.item for r in results])
+        self.assertIsNone(results[0].error)
+        self.assertIsInstance(results[1].error,
+                              exceptions.ApiClientException)
+        self.assertIsNone(results[2].error)
+        self.assertEqual(3, progress.call_count)
+
+    async def test_delete_many_deadline_spent(self):
+        jobs = managers.JobManager(self.mock_client)
+        results = await jobs.delete_many(['a', 'b'],
+                                         deadline=timeouts.Deadline(0))
+        for result in results:
+            self.assertIsInstance(result.error, exceptions.DeadlineExceeded)
+        self.mock_transport.delete.assert_not_called()
+
+    async def test_create_many_fetch(self):
+        self.mock_transport.post.side_effect = [
+            make_response(201, {'action_id': 'a1'}),
+            make_response(201, {'action_id': 'a2'}),
+            make_response(201, {'action_id': 'a'})]
+        self.mock_transport.get.return_value = make_response(
+            200, {'action_id': 'a'})
+        actions = managers.ActionManager(self.mock_client)
+        docs = iter([{'freezer_action': {}}, {'freezer_action': {}}])
+        results = await actions.create_many(docs, concurrency=2)
+        self.assertEqual(['a1', 'a2'], [r.result for r in results])
+        self.assertFalse(self.mock_transport.get.called)
+        results = await actions.create_many([{}], fetch=True)
+        self.assertEqual({'action_id': 'a'}, results[0].result)
+
+    async def test_start_jobs_search(self):
+        self.mock_transport.get.return_value = make_response(
+            200, {'jobs': [{'job_id': 'j1'}, {'job_id': 'j2'}]})
+        self.mock_transport.post.return_value = make_response(
+            202, {'result': 'success'})
+        jobs = managers.JobManager(self.mock_client)
+        results = await jobs.start_jobs(search={'match': []})
+        self.assertEqual(['j1', 'j2'], [r.item for r in results])
+        self.assertEqual(2, self.mock_transport.post.await_count)
+
+    async def test_get_cached_until_delete(self):
+        self.mock_transport.get.return_value = make_response(
+            200, {'backup_id': 'b1'})
+        self.mock_transport.delete.return_value = make_response(204)
+        backups = managers.BackupsManager(self.mock_client,
+                                          cache=cache.DocumentCache())
+        self.assertEqual({'backup_id': 'b1'}, await backups.get('b1'))
+        self.assertEqual({'backup_id': 'b1'}, await backups.get('b1'))
+        self.assertEqual(1, self.mock_transport.get.await_count)
+        await backups.delete('b1')
+        await backups.get('b1')
+        self.assertEqual(2, self.mock_transport.get.await_count)
+
+    async def test_get_revalidates_stale_document(self):
+        self.mock_transport.get.side_effect = [
+            transport.Response(200, {'ETag': '"e1"'}, b'{"job_id": "j1"}'),
+            transport.Response(304, {}, b'')]
+        jobs = managers.JobManager(self.mock_client,
+                                   cache=cache.DocumentCache(ttl=0))
+        self.assertEqual({'job_id': 'j1'}, await jobs.get('j1'))
+        self.assertEqual({'job_id': 'j1'}, await jobs.get('j1'))
+        self.assertEqual('"e1"', self.mock_transport.get.call_args[1][
+            'headers']['If-None-Match'])
+        self.assertEqual(1, jobs.cache.not_modified)
+
+    async def test_get_serves_stale_document_when_circuit_open(self):
+        self.mock_transport.get.side_effect = [
+            transport.Response(200, {'ETag': '"e1"'}, b'{"job_id": "j1"}'),
+            exceptions.CircuitOpenError('http://testendpoint:9999', 30)]
+        jobs = managers.JobManager(self.mock_client,
+                                   cache=cache.DocumentCache(ttl=0))
+        self.assertEqual({'job_id': 'j1'}, await jobs.get('j1'))
+        self.assertEqual({'job_id': 'j1'}, await jobs.get('j1'))
+        self.assertEqual(1, jobs.cache.stale_hits)
+
+    async def test_concurrent_gets_are_coalesced(self):
+        self.mock_transport.get.return_value = make_response(
+            200, {'job_id': 'j1'})
+        jobs = managers.JobManager(self.mock_client,
+                                   singleflight=singleflight.AsyncGroup())
+        results = await asyncio.gather(jobs.get('j1'), jobs.get('j1'))
+        self.assertEqual([{'job_id': 'j1'}] * 2, results)
+        self.assertEqual(1, self.mock_transport.get.await_count)
+        self.assertEqual(1, jobs.singleflight.coalesced)
+
+
+class TestAsyncClient(unittest.IsolatedAsyncioTestCase):
+
+    async def asyncSetUp(self):
+        self.requests = []
+
+        async def handler(request):
+            self.requests.append((request.method, request.path_qs,
+                                  request.headers.get('X-Auth-Token')))
+            if request.method == 'GET':
+                return web.json_response({'jobs': [{'job_id': 'j1'}]})
+            return web.json_response({'description': 'nope'}, status=409)
+
+        app = web.Application()
+        app.router.add_route('*', '/{tail:.*}', handler)
+        self.runner = web.AppRunner(app)
+        await self.runner.setup()
+        site = web.TCPSite(self.runner, '127.0.0.1', 0)
+        await site.start()
+        port = self.runner.addresses[0][1]
+        self.endpoint = 'http://127.0.0.1:{0}'.format(port)
+
+    async def asyncTearDown(self):
+        await self.runner.cleanup()
+
+    async def test_requests_end_to_end(self):
+        mock_session = mock.Mock()
+        mock_session.get_token.return_value = 'antaniX2'
+        async with client.Client(session=mock_session, project_id='tecs',
+                                 endpoint=self.endpoint) as c:
+            self.assertIsInstance(c.transport, transport.AsyncHTTPTransport)
+            jobs = await c.jobs.list_all(limit=5, all_projects=True)
+            with self.assertRaises(exceptions.ApiClientException) as ctx:
+                await c.jobs.delete('j1')
+        self.assertEqual([{'job_id': 'j1'}], jobs)
+        self.assertEqual(409, ctx.exception.status_code)
+        self.assertEqual(
+            [('GET', '/v2/tecs/jobs/?limit=5&offset=0&all_projects=True',
+              'antaniX2'),
+             ('DELETE', '/v2/tecs/jobs/j1', 'antaniX2')],
+            self.requests)
+        self.assertTrue(c.transport.session.closed)
+
+    @mock.patch.object(v2_client.kaloading.session, 'Session', autospec=True)
+    @mock.patch.object(v2_client.kaloading, 'get_plugin_loader',
+                       autospec=True)
+    async def test_concurrent_first_requests_authenticate_once(
+            self, mock_ks_loader, mock_ks_session):
+        def slow_session(**kwargs):
+            time.sleep(0.05)
+            return mock.Mock(**{'get_project_id.return_value': 'H2O'})
+
+        mock_ks_session.return_value.load_from_options.side_effect = (
+            slow_session)
+        c = client.Client(username='bravo', password='charlie',
+                          auth_url='echo', endpoint=self.endpoint)
+        sessions = v2_client.STATS['sessions']
+        await asyncio.gather(*(c.authenticate() for _ in range(8)))
+        self.assertEqual(sessions + 1, v2_client.STATS['sessions'])
+
+    def test_use_adapter_not_supported(self):
+        self.assertRaises(ValueError, client.Client, session=mock.Mock(),
+                          project_id='tecs', endpoint=self.endpoint,
+                          use_adapter=True)
+
+    async def test_no_timeout_overrides_the_aiohttp_default(self):
+        mock_session = mock.Mock()
+        mock_session.get_token.return_value = 'antaniX2'
+        async with client.Client(session=mock_session, project_id='tecs',
+                                 endpoint=self.endpoint) as c:
+            session = c.transport.session
+            with mock.patch.object(session, 'request',
+                                   wraps=session.request) as mock_request:
+                await c.jobs.list_all()
+        self.assertEqual(aiohttp.ClientTimeout(total=None),
+                         mock_request.call_args[1]['timeout'])
+
+    @mock.patch.object(client.Client, 'region_endpoint', autospec=True)
+    async def test_for_region_looks_up_the_endpoint_in_a_thread(
+            self, mock_region_endpoint):
+        threads = []
+
+        def region_endpoint(c, region_name):
+            threads.append(threading.current_thread())
+            return self.endpoint
+
+        mock_region_endpoint.side_effect = region_endpoint
+        mock_session = mock.Mock()
+        mock_session.get_token.return_value = 'antaniX2'
+        async with client.Client(session=mock_session, project_id='tecs',
+                                 endpoint='http://127.0.0.1:1') as c:
+            region = c.for_region('RegionTwo')
+            self.assertIsInstance(region, client.RegionClient)
+            self.assertFalse(mock_region_endpoint.called)
+            jobs = await region.jobs.list_all()
+        self.assertEqual([{'job_id': 'j1'}], jobs)
+        mock_region_endpoint.assert_called_once_with(c, 'RegionTwo')
+        self.assertNotIn(threading.current_thread(), threads)
+
+    @mock.patch.object(client.Client, 'scoped_session', autospec=True)
+    async def test_for_project_rescopes_the_token_in_a_thread(
+            self, mock_scoped_session):
+        threads = []
+
+        def scoped_session(c, project_id):
+            threads.append(threading.current_thread())
+            return mock.Mock(**{'get_token.return_value': 'scoped'})
+
+        mock_scoped_session.side_effect = scoped_session
+        mock_session = mock.Mock()
+        mock_session.get_token.return_value = 'antaniX2'
+        async with client.Client(session=mock_session, project_id='tecs',
+                                 endpoint=self.endpoint) as c:
+            project = await c.for_project('other')
+            self.assertIsInstance(project, client.ProjectClient)
+            await project.jobs.list_all(limit=5)
+        mock_scoped_session.assert_called_once_with(c, 'other')
+        self.assertNotIn(threading.current_thread(), threads)
+        self.assertEqual(
+            [('GET',
+              '/v2/other/jobs/?limit=5&offset=0&all_projects=False',
+              'scoped')],
+            self.requests)
@@ -12,9 +12,13 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import threading
+import time
 import unittest
 from unittest import mock
 
+from freezerclient import exceptions
+from freezerclient import timeouts
 from freezerclient.v2.managers import base
 
 
@@ -46,6 +50,9 @@ class TestBaseManager(unittest.TestCase):
             self.manager.endpoint
         )
 
+    def test_transport_is_shared_with_client(self):
+        self.assertIs(self.mock_client.transport, self.manager.transport)
+
     def test_headers(self):
         expected = {
             'X-Auth-Token': 'test_token',
@@ -54,6 +61,163 @@ class TestBaseManager(unittest.TestCase):
         }
         self.assertEqual(expected, self.manager.headers)
 
+    def test_iter_pages_stops_on_short_page(self):
+        pages = {0: [1, 2, 3], 3: [4, 5, 6], 6: [7]}
+        list_page = mock.Mock(side_effect=lambda limit, offset, **kw:
+                              pages[offset])
+        self.assertEqual([1, 2, 3, 4, 5, 6, 7],
+                         list(self.manager._iter_pages(list_page, 3,
+                                                       search='s')))
+        list_page.assert_called_with(limit=3, offset=6, search='s')
+        self.assertEqual(3, list_page.call_count)
+
+    def test_iter_pages_max_items(self):
+        list_page = mock.Mock(side_effect=lambda limit, offset:
+                              list(range(offset, offset + limit)))
+        self.assertEqual([5, 6, 7, 8, 9, 10, 11],
+                         list(self.manager._iter_pages(list_page, 3,
+                                                       max_items=7,
+                                                       offset=5)))
+        list_page.assert_called_with(limit=1, offset=11)
+
+    def test_iter_pages_is_lazy(self):
+        list_page = mock.Mock(return_value=[])
+        pages = self.manager._iter_pages(list_page)
+        self.assertFalse(list_page.called)
+        self.assertEqual([], list(pages))
+        list_page.assert_called_once_with(limit=100, offset=0)
+
+    def test_iter_pages_concurrent_keeps_order(self):
+        def list_page(limit, offset):
+            # later pages answer first
+            time.sleep(0.01 * (3 - offset // 2))
+            return list(range(offset, min(offset + limit, 7)))
+
+        list_page = mock.Mock(side_effect=list_page)
+        self.assertEqual(list(range(7)),
+                         list(self.manager._iter_pages(list_page, 2,
+                                                       concurrency=3)))
+        # the fourth page is the first short one, nothing past it is
+        # requested beyond the pages already in flight
+        offsets = sorted(c[1]['offset'] for c in list_page.call_args_list)
+        self.assertEqual([0, 2, 4, 6], offsets[:4])
+        self.assertLessEqual(len(offsets), 6)
+
+    def test_iter_pages_concurrent_max_items(self):
+        list_page = mock.Mock(side_effect=lambda limit, offset:
+                              list(range(offset, offset + limit)))
+        self.assertEqual(list(range(5)),
+                         list(self.manager._iter_pages(list_page, 2,
+                                                       max_items=5,
+                                                       concurrency=4)))
+        self.assertEqual(
+            [(0, 2), (2, 2), (4, 1)],
+            sorted((c[1]['offset'], c[1]['limit'])
+                   for c in list_page.call_args_list))
+
+    def test_iter_pages_concurrent_propagates_errors(self):
+        def list_page(limit, offset):
+            if offset == 2:
+                raise ValueError('boom')
+            return [offset, offset + 1]
+
+        pages = self.manager._iter_pages(list_page, 2, concurrency=2)
+        self.assertEqual(0, next(pages))
+        self.assertEqual(1, next(pages))
+        self.assertRaises(ValueError, next, pages)
+
+    def test_delete_many_collects_errors(self):
+        def delete(item):
+            if item == 'b':
+                raise ValueError('boom')
+            return item.upper()
+
+        self.manager.delete = mock.Mock(side_effect=delete)
+        progress = mock.Mock()
+        results = self.manager.delete_many(iter(['a', 'b', 'c']),
+                                           concurrency=2,
+                                           on_progress=progress)
+        self.assertEqual(['a', 'b', 'c'], [r.item for r in results])
+        self.assertEqual(['A', None, 'C'], [r.result for r in results])
+        self.assertIsNone(results[0].error)
+        self.assertIsInstance(results[1].error, ValueError)
+        self.assertEqual([1, 2, 3],
+                         [c[0][0] for c in progress.call_args_list])
+        self.assertEqual(3, self.manager.delete.call_count)
+
+    def test_delete_many_slow_item_does_not_block_the_others(self):
+        others_done = threading.Event()
+        done = []
+        released = []
+
+        def delete(item):
+            if item == 'a':
+                # only returns once every other item went through the
+                # second slot
+                released.append(others_done.wait(5))
+            done.append(item)
+            if len(done) == 4:
+                others_done.set()
+
+        self.manager.delete = mock.Mock(side_effect=delete)
+        progress = mock.Mock()
+        results = self.manager.delete_many(['a', 'b', 'c', 'd', 'e'],
+                                           concurrency=2,
+                                           on_progress=progress)
+        self.assertEqual([True], released)
+        self.assertEqual(['b', 'c', 'd', 'e', 'a'], done)
+        self.assertEqual([1, 2, 3, 4, 5],
+                         [c[0][0] for c in progress.call_args_list])
+        self.assertEqual(['a', 'b', 'c', 'd', 'e'],
+                         [r.item for r in results])
+
+    def test_delete_many_deadline(self):
+        deadline = timeouts.Deadline(60)
+        self.manager.delete = mock.Mock(
+            side_effect=lambda item: timeouts.current())
+        results = self.manager.delete_many(['a', 'b'], deadline=deadline)
+        # the deadline is active in the worker threads
+        self.assertEqual([deadline, deadline], [r.result for r in results])
+
+    def test_delete_many_deadline_spent(self):
+        self.manager.delete = mock.Mock()
+        results = self.manager.delete_many(['a', 'b'],
+                                           deadline=timeouts.Deadline(0))
+        for result in results:
+            self.assertIsInstance(result.error, exceptions.DeadlineExceeded)
+        self.manager.delete.assert_not_called()
+
+    @mock.patch('freezerclient.ratelimit.TokenBucket')
+    def test_delete_many_rate_limit(self, mock_bucket):
+        self.manager.delete = mock.Mock()
+        self.manager.delete_many(['a', 'b', 'c'], rate=5)
+        mock_bucket.assert_called_once_with(5)
+        self.assertEqual(3, mock_bucket.return_value.acquire.call_count)
+
+    def test_create_many(self):
+        self.manager.create = mock.Mock(side_effect=lambda doc: doc['id'])
+        self.manager.get = mock.Mock()
+        results = self.manager.create_many(iter([{'id': 'a'}, {'id': 'b'}]))
+        self.assertEqual(['a', 'b'], [r.result for r in results])
+        self.assertFalse(self.manager.get.called)
+
+    def test_create_many_fetch(self):
+        self.manager.create = mock.Mock(side_effect=lambda doc: doc['id'])
+        self.manager.get = mock.Mock(
+            side_effect=lambda doc_id: {'a': {'id': 'a'}}.get(doc_id))
+        results = self.manager.create_many([{'id': 'a'}, {'id': 'b'}],
+                                           fetch=True)
+        self.assertEqual({'id': 'a'}, results[0].result)
+        self.assertIsInstance(results[1].error,
+                              exceptions.ApiClientException)
+
+    def test_merge_documents(self):
+        doc = {'a': 1, 'b': {'c': 2, 'd': 3}, 'e': {'f': 4}}
+        self.assertEqual({'a': 1, 'b': {'c': 2, 'd': 5}, 'e': 6, 'g': 7},
+                         base.merge_documents(doc, {'b': {'d': 5}, 'e': 6,
+                                                    'g': 7}))
+        self.assertEqual({'c': 2, 'd': 3}, doc['b'])
+
     def test_methods_raise_not_implemented(self):
         self.assertRaises(NotImplementedError, self.manager.create)
         self.assertRaises(NotImplementedError, self.manager.delete)
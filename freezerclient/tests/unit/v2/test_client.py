@@ -12,11 +12,22 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import threading
+import time
 import unittest
 from unittest import mock
 
+from keystoneauth1 import fixture
+from keystoneauth1.identity import v3
 from keystoneauth1 import loading as kaloading
+from keystoneauth1 import session as ksa_session
+from oslo_serialization import jsonutils
 
+from freezerclient import cache
+from freezerclient import ratelimit
+from freezerclient import retry
+from freezerclient import singleflight
+from freezerclient import transport
 from freezerclient.v2 import client
 
 
@@ -172,3 +183,160 @@ class TestClientMock(unittest.TestCase):
         self.assertNotIn('project_name', call_args)
         self.assertNotIn('project_domain_id', call_args)
         self.assertNotIn('project_domain_name', call_args)
+
+    @mock.patch.object(kaloading.session, 'Session', autospec=True)
+    @mock.patch.object(kaloading, 'get_plugin_loader', autospec=True)
+    def test_transport_shared_by_managers(self, mock_ks_loader,
+                                          mock_ks_session):
+        c = client.Client(session=mock.Mock(), endpoint='justtest',
+                          auth_url='blabla', pool_connections=2,
+                          pool_maxsize=20, keep_alive=False)
+        self.assertIsInstance(c.transport, transport.HTTPTransport)
+        self.assertEqual(2, c.transport.pool_connections)
+        self.assertEqual(20, c.transport.pool_maxsize)
+        self.assertFalse(c.transport.keep_alive)
+        for manager in (c.jobs, c.clients, c.backups, c.sessions, c.actions):
+            self.assertIs(c.transport, manager.transport)
+
+    def test_default_retry_policy(self):
+        c = client.Client(session=mock.Mock(), endpoint='justtest')
+        self.assertIsInstance(c.transport.retry_policy, retry.RetryPolicy)
+        self.assertEqual(retry.DEFAULT_MAX_ATTEMPTS,
+                         c.transport.retry_policy.max_attempts)
+
+    def test_timeouts(self):
+        c = client.Client(session=mock.Mock(), endpoint='justtest',
+                          connect_timeout=3, read_timeout=20)
+        self.assertEqual((3, 20), c.transport.timeout)
+
+    def test_no_timeouts_by_default(self):
+        c = client.Client(session=mock.Mock(), endpoint='justtest')
+        self.assertIsNone(c.transport.timeout)
+
+    def test_rate_limiter(self):
+        limiter = ratelimit.RateLimiter(read_rate=10, write_rate=2)
+        c = client.Client(session=mock.Mock(), endpoint='justtest',
+                          rate_limiter=limiter)
+        self.assertIs(limiter, c.transport.rate_limiter)
+
+    def test_no_rate_limiter_by_default(self):
+        c = client.Client(session=mock.Mock(), endpoint='justtest')
+        self.assertIsNone(c.transport.rate_limiter)
+
+    def test_cache_shared_by_managers_and_views(self):
+        doc_cache = cache.DocumentCache()
+        c = client.Client(session=mock.Mock(), endpoint='justtest',
+                          cache=doc_cache)
+        for manager in (c.jobs, c.clients, c.backups, c.sessions, c.actions,
+                        c.for_region('RegionTwo').jobs):
+            self.assertIs(doc_cache, manager.cache)
+
+    def test_no_cache_by_default(self):
+        c = client.Client(session=mock.Mock(), endpoint='justtest')
+        self.assertIsNone(c.jobs.cache)
+
+    def test_coalesce_reads(self):
+        c = client.Client(session=mock.Mock(), endpoint='justtest',
+                          coalesce_reads=True)
+        self.assertIsInstance(c.singleflight, singleflight.Group)
+        for manager in (c.jobs, c.clients, c.backups, c.sessions, c.actions,
+                        c.for_region('RegionTwo').jobs):
+            self.assertIs(c.singleflight, manager.singleflight)
+        c = client.Client(session=mock.Mock(), endpoint='justtest')
+        self.assertIsNone(c.jobs.singleflight)
+
+    def test_custom_retry_policy(self):
+        policy = retry.RetryPolicy(max_attempts=1)
+        c = client.Client(session=mock.Mock(), endpoint='justtest',
+                          retry_policy=policy)
+        self.assertIs(policy, c.transport.retry_policy)
+
+    @mock.patch('freezerclient.transport.ksa_adapter.Adapter', autospec=True)
+    def test_transport_through_keystoneauth_adapter(self, mock_adapter):
+        mock_session = mock.Mock()
+        mock_adapter.return_value.get_endpoint.return_value = 'http://f:9090'
+        c = client.Client(session=mock_session, auth_url='blabla',
+                          project_id='H2O', endpoint_type='internal',
+                          region_name='RegionTwo', use_adapter=True)
+        self.assertIsInstance(c.transport, transport.AdapterTransport)
+        self.assertIs(c.transport, c.jobs.transport)
+        self.assertEqual('http://f:9090', c.endpoint)
+        mock_adapter.assert_called_once_with(
+            mock_session,
+            service_type='backup',
+            interface='internal',
+            region_name='RegionTwo',
+            endpoint_override=None,
+            logger=transport.LOG,
+            raise_exc=False)
+
+    @mock.patch.object(kaloading.session, 'Session', autospec=True)
+    @mock.patch.object(kaloading, 'get_plugin_loader', autospec=True)
+    def test_construction_does_not_authenticate(self, mock_ks_loader,
+                                                mock_ks_session):
+        c = client.Client(username='bravo', password='charlie',
+                          auth_url='echo')
+        self.assertFalse(mock_ks_loader.called)
+        self.assertFalse(mock_ks_session.called)
+        self.assertNotIn('session', c.__dict__)
+        self.assertNotIn('endpoint', c.__dict__)
+        self.assertNotIn('project_id', c.__dict__)
+
+    @mock.patch.object(kaloading.session, 'Session', autospec=True)
+    @mock.patch.object(kaloading, 'get_plugin_loader', autospec=True)
+    def test_lazy_attributes_built_once_under_concurrency(self, mock_ks_loader,
+                                                          mock_ks_session):
+        def slow_session(**kwargs):
+            time.sleep(0.05)
+            return mock.Mock(**{'get_project_id.return_value': 'H2O'})
+
+        mock_ks_session.return_value.load_from_options.side_effect = (
+            slow_session)
+        c = client.Client(username='bravo', password='charlie',
+                          auth_url='echo', endpoint='http://f:9090')
+        sessions = client.STATS['sessions']
+        barrier = threading.Barrier(8)
+        seen = []
+
+        def first_request():
+            barrier.wait()
+            seen.append((c.session, c.transport, c.backups.endpoint))
+
+        threads = [threading.Thread(target=first_request) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(sessions + 1, client.STATS['sessions'])
+        self.assertEqual(1, len(set((id(s), id(t), e) for s, t, e in seen)))
+
+    def test_endpoint_from_valid_auth_state_skips_keystone(self):
+        token = fixture.V3Token(project_id='p1')
+        service = token.add_service('backup')
+        service.add_standard_endpoints(public='http://freezer:9090',
+                                       region='RegionOne')
+        plugin = v3.Password(auth_url='http://keystone/v3', username='u',
+                             password='p', project_id='p1',
+                             user_domain_id='default')
+        plugin.set_auth_state(jsonutils.dumps({'auth_token': 'cached',
+                                               'body': token}))
+        c = client.Client(session=ksa_session.Session(auth=plugin))
+        with mock.patch.object(ksa_session.Session, 'request') as request:
+            self.assertEqual('http://freezer:9090', c.endpoint)
+        self.assertFalse(request.called)
+
+    def test_project_id_resolved_on_first_request(self):
+        mock_session = mock.Mock()
+        mock_session.get_project_id.return_value = 'H2O'
+        c = client.Client(session=mock_session, endpoint='http://f:9090')
+        self.assertFalse(mock_session.get_project_id.called)
+        self.assertEqual('http://f:9090/v2/H2O/jobs/', c.jobs.endpoint)
+        self.assertEqual('http://f:9090/v2/H2O/backups/', c.backups.endpoint)
+        mock_session.get_project_id.assert_called_once_with()
+
+    def test_explicit_project_id_skips_keystone(self):
+        mock_session = mock.Mock()
+        c = client.Client(session=mock_session, endpoint='http://f:9090',
+                          project_id='tecs')
+        self.assertEqual('http://f:9090/v2/tecs/jobs/', c.jobs.endpoint)
+        self.assertFalse(mock_session.get_project_id.called)
@@ -12,11 +12,16 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import os
+import tempfile
 import unittest
 from unittest import mock
 
 from freezerclient import exceptions
+from freezerclient import replica
+from freezerclient.v2 import backups as backups_cmd
 from freezerclient.v2.managers import backups
+from freezerclient.v2.managers import base
 
 
 class TestBackupManager(unittest.TestCase):
@@ -27,8 +32,8 @@ class TestBackupManager(unittest.TestCase):
         self.mock_client.auth_token = 'testtoken'
         self.b = backups.BackupsManager(self.mock_client)
 
-    @mock.patch('freezerclient.v2.managers.backups.requests')
-    def test_create(self, mock_requests):
+    @mock.patch('freezerclient.v2.managers.base.BaseManager.transport')
+    def test_create(self, mock_transport):
         self.assertEqual('http://testendpoint:9999/v2/tecs/backups/',
                          self.b.endpoint)
         self.assertEqual({'X-Auth-Token': 'testtoken',
@@ -36,87 +41,87 @@ class TestBackupManager(unittest.TestCase):
                           'Accept': 'application/json'},
                          self.b.headers)
 
-    @mock.patch('freezerclient.v2.managers.backups.requests')
-    def test_create_ok(self, mock_requests):
+    @mock.patch('freezerclient.v2.managers.base.BaseManager.transport')
+    def test_create_ok(self, mock_transport):
         mock_response = mock.Mock()
         mock_response.status_code = 201
         mock_response.json.return_value = {'backup_id': 'qwerqwer'}
-        mock_requests.post.return_value = mock_response
+        mock_transport.post.return_value = mock_response
         retval = self.b.create(backup_metadata={'backup': 'metadata'})
         self.assertEqual('qwerqwer', retval)
 
-    @mock.patch('freezerclient.v2.managers.backups.requests')
-    def test_create_fail_when_api_return_error_code(self, mock_requests):
+    @mock.patch('freezerclient.v2.managers.base.BaseManager.transport')
+    def test_create_fail_when_api_return_error_code(self, mock_transport):
         mock_response = mock.Mock()
         mock_response.status_code = 500
-        mock_requests.post.return_value = mock_response
+        mock_transport.post.return_value = mock_response
         self.assertRaises(exceptions.ApiClientException, self.b.create,
                           {'backup': 'metadata'})
 
-    @mock.patch('freezerclient.v2.managers.backups.requests')
-    def test_delete_ok(self, mock_requests):
+    @mock.patch('freezerclient.v2.managers.base.BaseManager.transport')
+    def test_delete_ok(self, mock_transport):
         mock_response = mock.Mock()
         mock_response.status_code = 204
-        mock_requests.delete.return_value = mock_response
+        mock_transport.delete.return_value = mock_response
         retval = self.b.delete('test_backup_id')
         self.assertIsNone(retval)
 
-    @mock.patch('freezerclient.v2.managers.backups.requests')
-    def test_delete_fail(self, mock_requests):
+    @mock.patch('freezerclient.v2.managers.base.BaseManager.transport')
+    def test_delete_fail(self, mock_transport):
         mock_response = mock.Mock()
         mock_response.status_code = 500
-        mock_requests.delete.return_value = mock_response
+        mock_transport.delete.return_value = mock_response
         self.assertRaises(exceptions.ApiClientException, self.b.delete,
                           'test_backup_id')
 
-    @mock.patch('freezerclient.v2.managers.backups.requests')
-    def test_get_ok(self, mock_requests):
+    @mock.patch('freezerclient.v2.managers.base.BaseManager.transport')
+    def test_get_ok(self, mock_transport):
         mock_response = mock.Mock()
         mock_response.status_code = 200
         mock_response.json.return_value = {'backup_id': 'qwerqwer'}
-        mock_requests.get.return_value = mock_response
+        mock_transport.get.return_value = mock_response
         retval = self.b.get('test_backup_id')
         self.assertEqual({'backup_id': 'qwerqwer'}, retval)
 
-    @mock.patch('freezerclient.v2.managers.backups.requests')
-    def test_get_none(self, mock_requests):
+    @mock.patch('freezerclient.v2.managers.base.BaseManager.transport')
+    def test_get_none(self, mock_transport):
         mock_response = mock.Mock()
         mock_response.status_code = 404
-        mock_requests.get.return_value = mock_response
+        mock_transport.get.return_value = mock_response
         retval = self.b.get('test_backup_id')
         self.assertIsNone(retval)
 
-    @mock.patch('freezerclient.v2.managers.backups.requests')
-    def test_get_error(self, mock_requests):
+    @mock.patch('freezerclient.v2.managers.base.BaseManager.transport')
+    def test_get_error(self, mock_transport):
         mock_response = mock.Mock()
         mock_response.status_code = 403
-        mock_requests.get.return_value = mock_response
+        mock_transport.get.return_value = mock_response
         self.assertRaises(exceptions.ApiClientException,
                           self.b.get, 'test_backup_id')
 
-    @mock.patch('freezerclient.v2.managers.backups.requests')
-    def test_list_ok(self, mock_requests):
+    @mock.patch('freezerclient.v2.managers.base.BaseManager.transport')
+    def test_list_ok(self, mock_transport):
         mock_response = mock.Mock()
         mock_response.status_code = 200
         backup_list = [{'backup_id_0': 'qwerqwer'},
                        {'backup_id_1': 'asdfasdf'}]
         mock_response.json.return_value = {'backups': backup_list}
-        mock_requests.get.return_value = mock_response
+        mock_transport.get.return_value = mock_response
         retval = self.b.list()
         self.assertEqual(backup_list, retval)
 
-    @mock.patch('freezerclient.v2.managers.backups.requests')
-    def test_list_parameters(self, mock_requests):
+    @mock.patch('freezerclient.v2.managers.base.BaseManager.transport')
+    def test_list_parameters(self, mock_transport):
         mock_response = mock.Mock()
         mock_response.status_code = 200
         backup_list = [{'backup_id_0': 'qwerqwer'},
                        {'backup_id_1': 'asdfasdf'}]
         mock_response.json.return_value = {'backups': backup_list}
-        mock_requests.get.return_value = mock_response
+        mock_transport.get.return_value = mock_response
         retval = self.b.list(limit=5,
                              offset=5,
                              search={"time_before": 1428529956})
-        mock_requests.get.assert_called_with(
+        mock_transport.get.assert_called_with(
             'http://testendpoint:9999/v2/tecs/backups/',
             params={'limit': 5, 'offset': 5},
             data='{"time_before": 1428529956}',
@@ -126,12 +131,249 @@ class TestBackupManager(unittest.TestCase):
             verify=True)
         self.assertEqual(backup_list, retval)
 
-    @mock.patch('freezerclient.v2.managers.backups.requests')
-    def test_list_error(self, mock_requests):
+    @mock.patch('freezerclient.v2.managers.base.BaseManager.transport')
+    def test_list_error(self, mock_transport):
         mock_response = mock.Mock()
         mock_response.status_code = 404
         backup_list = [{'backup_id_0': 'qwerqwer'},
                        {'backup_id_1': 'asdfasdf'}]
         mock_response.json.return_value = {'backups': backup_list}
-        mock_requests.get.return_value = mock_response
+        mock_transport.get.return_value = mock_response
         self.assertRaises(exceptions.ApiClientException, self.b.list)
+
+    @mock.patch('freezerclient.v2.managers.base.BaseManager.transport')
+    def test_iter_list_max_items(self, mock_transport):
+        mock_response = mock.Mock()
+        mock_response.status_code = 200
+        mock_response.json.return_value = {
+            'backups': [{'backup_id': 'a'}, {'backup_id': 'b'}]}
+        mock_transport.get.return_value = mock_response
+        retval = list(self.b.iter_list(page_size=2, max_items=3,
+                                       search={"time_after": 1428529956}))
+        self.assertEqual(3, len(retval))
+        self.assertEqual(
+            [{'limit': 2, 'offset': 0}, {'limit': 1, 'offset': 2}],
+            [c[1]['params'] for c in mock_transport.get.call_args_list])
+        self.assertEqual('{"time_after": 1428529956}',
+                         mock_transport.get.call_args[1]['data'])
+
+    def test_scan_splits_range_in_windows(self):
+        def iter_list(page_size, search):
+            # two backups per window, returned newest first
+            return [{'backup_metadata': {'time_stamp': search['time_before']}},
+                    {'backup_metadata': {'time_stamp': search['time_after']}}]
+
+        with mock.patch.object(self.b, 'iter_list',
+                               side_effect=iter_list) as mock_iter:
+            retval = list(self.b.scan(100, 129, window=10, page_size=5,
+                                      search={'match': [{'_all': 'x'}]},
+                                      concurrency=2))
+
+        self.assertEqual([100, 109, 110, 119, 120, 129],
+                         [b['backup_metadata']['time_stamp'] for b in retval])
+        searches = sorted((c[1]['search'] for c in mock_iter.call_args_list),
+                          key=lambda s: s['time_after'])
+        self.assertEqual(
+            [{'match': [{'_all': 'x'}], 'time_after': 100,
+              'time_before': 109},
+             {'match': [{'_all': 'x'}], 'time_after': 110,
+              'time_before': 119},
+             {'match': [{'_all': 'x'}], 'time_after': 120,
+              'time_before': 129}],
+            searches)
+        for c in mock_iter.call_args_list:
+            self.assertEqual(5, c[1]['page_size'])
+
+    def test_scan_last_window_is_clamped(self):
+        with mock.patch.object(self.b, 'iter_list',
+                               return_value=[]) as mock_iter:
+            self.assertEqual([], list(self.b.scan(0, 14, window=10)))
+        self.assertEqual(
+            [(0, 9), (10, 14)],
+            sorted((c[1]['search']['time_after'],
+                    c[1]['search']['time_before'])
+                   for c in mock_iter.call_args_list))
+
+    @mock.patch('freezerclient.v2.managers.base.BaseManager.transport')
+    def test_create_return_document(self, mock_transport):
+        mock_transport.post.return_value = mock.Mock(
+            status_code=201, json=mock.Mock(return_value={'backup_id': 'b1'}))
+        self.assertEqual({'backup_id': 'b1', 'backup_uuid': 'b1',
+                          'backup_metadata': {'level': 0}},
+                         self.b.create({'level': 0}, return_document=True))
+
+    def test_scan_invalid_window(self):
+        self.assertRaises(ValueError, self.b.scan, 0, 10, window=0)
+
+
+class TestBackupList(unittest.TestCase):
+    def setUp(self):
+        self.app = mock.Mock()
+        self.app.client = mock.Mock()
+        self.backup_list = backups_cmd.BackupList(self.app, mock.Mock())
+        self.parsed_args = self.backup_list.get_parser('test').parse_args([])
+
+    def test_take_action_sorts_single_page(self):
+        self.app.client.backups.list.return_value = [
+            {'backup_id': 'b', 'backup_metadata': {'time_stamp': 20}},
+            {'backup_id': 'a', 'backup_metadata': {'time_stamp': 10}}]
+        columns, data = self.backup_list.take_action(self.parsed_args)
+        self.assertEqual(['a', 'b'], [row[0] for row in data])
+        self.app.client.backups.list.assert_called_once_with(
+            limit=100, offset=0, search={})
+
+    def test_take_action_regions(self):
+        self.parsed_args.regions = 'one, two,three'
+        listings = {
+            'one': [{'backup_id': 'c', 'backup_metadata': {'time_stamp': 30}},
+                    {'backup_id': 'a', 'backup_metadata': {'time_stamp': 10}}],
+            'two': [{'backup_id': 'b', 'backup_metadata': {'time_stamp': 20}}],
+        }
+
+        def for_region(region):
+            region_client = mock.Mock()
+            if region == 'three':
+                region_client.backups.list.side_effect = Exception('down')
+            else:
+                region_client.backups.list.return_value = listings[region]
+            return region_client
+
+        self.app.client.for_region.side_effect = for_region
+        with mock.patch.object(backups_cmd.logging, 'error') as mock_error:
+            columns, data = self.backup_list.take_action(self.parsed_args)
+            rows = list(data)
+        self.assertEqual('Region', columns[0])
+        self.assertEqual([('one', 'a'), ('two', 'b'), ('one', 'c')],
+                         [row[:2] for row in rows])
+        mock_error.assert_called_once_with(
+            'Unable to list the backups of region %s: %s', 'three', mock.ANY)
+
+    def test_take_action_regions_all_failed(self):
+        self.parsed_args.regions = 'one'
+        self.app.client.for_region.return_value.backups.list.side_effect = (
+            exceptions.ApiClientException('down'))
+        self.assertRaises(exceptions.ApiClientException,
+                          self.backup_list.take_action, self.parsed_args)
+
+    def test_take_action_time_range_scan(self):
+        self.parsed_args.all = True
+        self.parsed_args.time_after = 100
+        self.parsed_args.time_before = 200
+        self.parsed_args.scan_window = 10
+        self.app.client.backups.scan.return_value = iter([])
+        self.backup_list.take_action(self.parsed_args)
+        self.app.client.backups.scan.assert_called_once_with(
+            100, time_before=200, window=10, page_size=100,
+            search={'time_after': 100, 'time_before': 200},
+            concurrency=4)
+
+
+class TestBackupReplicaCommands(unittest.TestCase):
+    def setUp(self):
+        self.app = mock.Mock()
+        self.app.client = mock.Mock()
+        self.app.options = mock.Mock(spec=['os_auth_url', 'os_project_id'],
+                                     os_auth_url='http://keystone',
+                                     os_project_id='p1')
+        tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp_dir.cleanup)
+        self.path = os.path.join(tmp_dir.name, 'backups.sqlite')
+        self.backup_sync = backups_cmd.BackupSync(self.app, mock.Mock())
+        self.backup_list = backups_cmd.BackupList(self.app, mock.Mock())
+
+    def _backup(self, backup_id, time_stamp, hostname):
+        return {'backup_id': backup_id,
+                'backup_metadata': {'hostname': hostname,
+                                    'time_stamp': time_stamp}}
+
+    def test_sync_then_list_local(self):
+        self.app.client.backups.iter_list.return_value = iter([
+            self._backup('b', 20, 'h2'), self._backup('a', 10, 'h1')])
+        columns, data = self.backup_sync.take_action(
+            self.backup_sync.get_parser('test').parse_args(
+                ['--replica', self.path]))
+        self.assertEqual((2, 2), data[:2])
+        parser = self.backup_list.get_parser('test')
+        columns, data = self.backup_list.take_action(parser.parse_args(
+            ['--local', '--replica', self.path]))
+        self.assertEqual(['a', 'b'], [row[0] for row in data])
+        columns, data = self.backup_list.take_action(parser.parse_args(
+            ['--local', '--all', '--replica', self.path,
+             '--hostname', 'h2']))
+        self.assertEqual(['b'], [row[0] for row in data])
+        self.assertFalse(self.app.client.backups.list.called)
+
+    def test_replica_scope_follows_the_options(self):
+        parsed_args = mock.Mock(replica=self.path)
+        with backups_cmd.open_replica(self.app, parsed_args) as backups:
+            backups.store([self._backup('a', 10, 'h1')])
+        self.app.options.os_project_id = 'p2'
+        with backups_cmd.open_replica(self.app, parsed_args) as backups:
+            self.assertEqual(0, len(backups))
+        with replica.BackupReplica(self.path, 'http://keystone|||p1|') as b:
+            self.assertEqual(1, len(b))
+
+    def test_filters_require_local(self):
+        parser = self.backup_list.get_parser('test')
+        self.assertRaises(exceptions.ApiClientException,
+                          self.backup_list.take_action,
+                          parser.parse_args(['--hostname', 'h1']))
+        self.assertRaises(exceptions.ApiClientException,
+                          self.backup_list.take_action,
+                          parser.parse_args(['--local', '--search', 'x']))
+
+
+class TestBackupDelete(unittest.TestCase):
+    def setUp(self):
+        self.app = mock.Mock()
+        self.app.client = mock.Mock()
+        self.backup_delete = backups_cmd.BackupDelete(self.app, mock.Mock())
+        self.parser = self.backup_delete.get_parser('test')
+
+    def test_take_action_single(self):
+        self.backup_delete.take_action(self.parser.parse_args(['b1']))
+        self.app.client.backups.delete.assert_called_once_with('b1')
+        self.assertFalse(self.app.client.backups.delete_many.called)
+
+    def test_take_action_requires_ids(self):
+        self.assertRaises(exceptions.ApiClientException,
+                          self.backup_delete.take_action,
+                          self.parser.parse_args([]))
+
+    def test_take_action_many(self):
+        self.app.client.backups.delete_many.return_value = [
+            base.BulkResult('b1', None, None),
+            base.BulkResult('b2', None, None)]
+        parsed_args = self.parser.parse_args(['b1', 'b2',
+                                              '--concurrency', '2'])
+        self.backup_delete.take_action(parsed_args)
+        args, kwargs = self.app.client.backups.delete_many.call_args
+        self.assertEqual(['b1', 'b2'], list(args[0]))
+        self.assertEqual(2, kwargs['concurrency'])
+        self.assertIsNone(kwargs['rate'])
+        self.assertIsNone(kwargs['on_progress'])
+
+    def test_take_action_from_file_reports_failures(self):
+        with tempfile.NamedTemporaryFile('w', suffix='.txt') as f:
+            f.write('b1\n\n# comment\nb2\n')
+            f.flush()
+            parsed_args = self.parser.parse_args(['--from-file', f.name,
+                                                  '--progress'])
+
+            def delete_many(ids, concurrency, rate, on_progress):
+                results = []
+                for i in ids:
+                    error = ValueError('boom') if i == 'b2' else None
+                    results.append(base.BulkResult(i, None, error))
+                    on_progress(len(results), results[-1])
+                return results
+
+            self.app.client.backups.delete_many.side_effect = delete_many
+            with mock.patch.object(backups_cmd.logging,
+                                   'error') as mock_error:
+                self.assertRaises(exceptions.ApiClientException,
+                                  self.backup_delete.take_action,
+                                  parsed_args)
+        mock_error.assert_called_once_with(
+            'Unable to delete backup %s: %s', 'b2', mock.ANY)
+        self.app.stderr.write.assert_called_with('2 done, 1 failed\n')
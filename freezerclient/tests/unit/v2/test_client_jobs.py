@@ -12,13 +12,20 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import os
+import tempfile
+import threading
 import unittest
 from unittest import mock
 
 from oslo_serialization import jsonutils as json
 
+from freezerclient import base as base_cmd
+from freezerclient import cache
 from freezerclient import exceptions
+from freezerclient import singleflight
 from freezerclient.v2 import jobs as jobs_cmd
+from freezerclient.v2.managers import base
 from freezerclient.v2.managers import jobs
 
 
@@ -37,8 +44,8 @@ class TestJobManager(unittest.TestCase):
             'Accept': 'application/json'
         }
 
-    @mock.patch('freezerclient.v2.managers.jobs.requests')
-    def test_create(self, mock_requests):
+    @mock.patch('freezerclient.v2.managers.base.BaseManager.transport')
+    def test_create(self, mock_transport):
         self.assertEqual('http://testendpoint:9999/v2/tecs/jobs/',
                          self.job_manager.endpoint)
         self.assertEqual({'X-Auth-Token': 'testtoken',
@@ -46,22 +53,22 @@ class TestJobManager(unittest.TestCase):
                           'Accept': 'application/json'},
                          self.job_manager.headers)
 
-    @mock.patch('freezerclient.v2.managers.jobs.requests')
-    def test_create_ok(self, mock_requests):
+    @mock.patch('freezerclient.v2.managers.base.BaseManager.transport')
+    def test_create_ok(self, mock_transport):
         self.mock_response.status_code = 201
         self.mock_response.json.return_value = {'job_id': 'qwerqwer'}
-        mock_requests.post.return_value = self.mock_response
+        mock_transport.post.return_value = self.mock_response
         retval = self.job_manager.create({'job': 'metadata'})
         self.assertEqual('qwerqwer', retval)
 
     @mock.patch('freezerclient.v2.managers.jobs.json')
-    @mock.patch('freezerclient.v2.managers.jobs.requests')
-    def test_create_adds_client_id_if_not_provided(self, mock_requests,
+    @mock.patch('freezerclient.v2.managers.base.BaseManager.transport')
+    def test_create_adds_client_id_if_not_provided(self, mock_transport,
                                                    mock_json):
         self.mock_response.status_code = 201
         self.mock_response.json.return_value = {'job_id': 'qwerqwer'}
         mock_json.dumps.return_value = {'job': 'mocked'}
-        mock_requests.post.return_value = self.mock_response
+        mock_transport.post.return_value = self.mock_response
 
         retval = self.job_manager.create({'job': 'metadata'})
 
@@ -71,12 +78,12 @@ class TestJobManager(unittest.TestCase):
         self.assertEqual('qwerqwer', retval)
 
     @mock.patch('freezerclient.v2.managers.jobs.json')
-    @mock.patch('freezerclient.v2.managers.jobs.requests')
-    def test_create_leaves_provided_client_id(self, mock_requests, mock_json):
+    @mock.patch('freezerclient.v2.managers.base.BaseManager.transport')
+    def test_create_leaves_provided_client_id(self, mock_transport, mock_json):
         self.mock_response.status_code = 201
         self.mock_response.json.return_value = {'job_id': 'qwerqwer'}
         mock_json.dumps.return_value = {'job': 'mocked'}
-        mock_requests.post.return_value = self.mock_response
+        mock_transport.post.return_value = self.mock_response
 
         retval = self.job_manager.create(
             {'job': 'metadata', 'client_id': 'parmenide'})
@@ -85,75 +92,75 @@ class TestJobManager(unittest.TestCase):
                                             'client_id': 'parmenide'})
         self.assertEqual('qwerqwer', retval)
 
-    @mock.patch('freezerclient.v2.managers.jobs.requests')
-    def test_create_fail_when_api_return_error_code(self, mock_requests):
+    @mock.patch('freezerclient.v2.managers.base.BaseManager.transport')
+    def test_create_fail_when_api_return_error_code(self, mock_transport):
         self.mock_response.status_code = 500
-        mock_requests.post.return_value = self.mock_response
+        mock_transport.post.return_value = self.mock_response
         self.assertRaises(exceptions.ApiClientException,
                           self.job_manager.create, {'job': 'metadata'})
 
-    @mock.patch('freezerclient.v2.managers.jobs.requests')
-    def test_delete_ok(self, mock_requests):
+    @mock.patch('freezerclient.v2.managers.base.BaseManager.transport')
+    def test_delete_ok(self, mock_transport):
         self.mock_response.status_code = 204
-        mock_requests.delete.return_value = self.mock_response
+        mock_transport.delete.return_value = self.mock_response
         retval = self.job_manager.delete('test_job_id')
         self.assertIsNone(retval)
 
-    @mock.patch('freezerclient.v2.managers.jobs.requests')
-    def test_delete_fail(self, mock_requests):
+    @mock.patch('freezerclient.v2.managers.base.BaseManager.transport')
+    def test_delete_fail(self, mock_transport):
         self.mock_response.status_code = 500
-        mock_requests.delete.return_value = self.mock_response
+        mock_transport.delete.return_value = self.mock_response
         self.assertRaises(exceptions.ApiClientException,
                           self.job_manager.delete, 'test_job_id')
 
-    @mock.patch('freezerclient.v2.managers.jobs.requests')
-    def test_get_ok(self, mock_requests):
+    @mock.patch('freezerclient.v2.managers.base.BaseManager.transport')
+    def test_get_ok(self, mock_transport):
         self.mock_response.status_code = 200
         self.mock_response.json.return_value = {'job_id': 'qwerqwer'}
-        mock_requests.get.return_value = self.mock_response
+        mock_transport.get.return_value = self.mock_response
         retval = self.job_manager.get('test_job_id')
         self.assertEqual({'job_id': 'qwerqwer'}, retval)
 
-    @mock.patch('freezerclient.v2.managers.jobs.requests')
-    def test_get_fails_on_error_different_from_404(self, mock_requests):
+    @mock.patch('freezerclient.v2.managers.base.BaseManager.transport')
+    def test_get_fails_on_error_different_from_404(self, mock_transport):
         self.mock_response.status_code = 500
-        mock_requests.get.return_value = self.mock_response
+        mock_transport.get.return_value = self.mock_response
         self.assertRaises(exceptions.ApiClientException, self.job_manager.get,
                           'test_job_id')
 
-    @mock.patch('freezerclient.v2.managers.jobs.requests')
-    def test_get_none(self, mock_requests):
+    @mock.patch('freezerclient.v2.managers.base.BaseManager.transport')
+    def test_get_none(self, mock_transport):
         self.mock_response.status_code = 404
-        mock_requests.get.return_value = self.mock_response
+        mock_transport.get.return_value = self.mock_response
         retval = self.job_manager.get('test_job_id')
         self.assertIsNone(retval)
 
-    @mock.patch('freezerclient.v2.managers.jobs.requests')
-    def test_list_ok(self, mock_requests):
+    @mock.patch('freezerclient.v2.managers.base.BaseManager.transport')
+    def test_list_ok(self, mock_transport):
         self.mock_response.status_code = 200
         job_list = [{'job_id_0': 'bomboloid'}, {'job_id_1': 'asdfasdf'}]
         self.mock_response.json.return_value = {'jobs': job_list}
-        mock_requests.get.return_value = self.mock_response
+        mock_transport.get.return_value = self.mock_response
         retval = self.job_manager.list()
         self.assertEqual(job_list, retval)
 
-    @mock.patch('freezerclient.v2.managers.jobs.requests')
-    def test_list_error(self, mock_requests):
+    @mock.patch('freezerclient.v2.managers.base.BaseManager.transport')
+    def test_list_error(self, mock_transport):
         self.mock_response.status_code = 404
         job_list = [{'job_id_0': 'bomboloid'}, {'job_id_1': 'asdfasdf'}]
         self.mock_response.json.return_value = {'clients': job_list}
-        mock_requests.get.return_value = self.mock_response
+        mock_transport.get.return_value = self.mock_response
         self.assertRaises(exceptions.ApiClientException, self.job_manager.list)
 
-    @mock.patch('freezerclient.v2.managers.jobs.requests')
-    def test_list_all_all_projects(self, mock_requests):
+    @mock.patch('freezerclient.v2.managers.base.BaseManager.transport')
+    def test_list_all_all_projects(self, mock_transport):
         self.mock_response.status_code = 200
         job_list = [{'job_id_0': 'bomboloid'}, {'job_id_1': 'asdfasdf'}]
         self.mock_response.json.return_value = {'jobs': job_list}
-        mock_requests.get.return_value = self.mock_response
+        mock_transport.get.return_value = self.mock_response
         retval = self.job_manager.list_all(all_projects=True)
         self.assertEqual(job_list, retval)
-        mock_requests.get.assert_called_with(
+        mock_transport.get.assert_called_with(
             self.job_manager.endpoint,
             headers=self.headers,
             params={'limit': 10, 'offset': 0, 'all_projects': True},
@@ -161,15 +168,15 @@ class TestJobManager(unittest.TestCase):
             verify=True
         )
 
-    @mock.patch('freezerclient.v2.managers.jobs.requests')
-    def test_list_all_projects(self, mock_requests):
+    @mock.patch('freezerclient.v2.managers.base.BaseManager.transport')
+    def test_list_all_projects(self, mock_transport):
         self.mock_response.status_code = 200
         job_list = [{'job_id_0': 'bomboloid'}, {'job_id_1': 'asdfasdf'}]
         self.mock_response.json.return_value = {'jobs': job_list}
-        mock_requests.get.return_value = self.mock_response
+        mock_transport.get.return_value = self.mock_response
         retval = self.job_manager.list(all_projects=True)
         self.assertEqual(job_list, retval)
-        mock_requests.get.assert_called_with(
+        mock_transport.get.assert_called_with(
             self.job_manager.endpoint,
             headers=self.headers,
             params={'limit': 10, 'offset': 0, 'all_projects': True},
@@ -179,22 +186,59 @@ class TestJobManager(unittest.TestCase):
             verify=True
         )
 
-    @mock.patch('freezerclient.v2.managers.jobs.requests')
-    def test_update_ok(self, mock_requests):
+    @mock.patch('freezerclient.v2.managers.base.BaseManager.transport')
+    def test_iter_list_all_fetches_every_page(self, mock_transport):
+        pages = [[{'job_id': 'a'}, {'job_id': 'b'}], [{'job_id': 'c'}]]
+        responses = []
+        for page in pages:
+            response = mock.Mock()
+            response.status_code = 200
+            response.json.return_value = {'jobs': page}
+            responses.append(response)
+        mock_transport.get.side_effect = responses
+
+        retval = self.job_manager.iter_list_all(page_size=2,
+                                                all_projects=True)
+
+        self.assertFalse(mock_transport.get.called)
+        self.assertEqual(['a', 'b', 'c'], [j['job_id'] for j in retval])
+        self.assertEqual(
+            [{'limit': 2, 'offset': 0, 'all_projects': True},
+             {'limit': 2, 'offset': 2, 'all_projects': True}],
+            [c[1]['params'] for c in mock_transport.get.call_args_list])
+
+    @mock.patch('freezerclient.v2.managers.base.BaseManager.transport')
+    def test_iter_list_filters_on_client_id(self, mock_transport):
+        self.mock_response.status_code = 200
+        self.mock_response.json.return_value = {'jobs': []}
+        mock_transport.get.return_value = self.mock_response
+        search = {'match': [{'_all': 'text'}]}
+
+        self.assertEqual([], list(self.job_manager.iter_list(search=search)))
+
+        self.assertEqual(
+            {'match': [{'_all': 'text'},
+                       {'client_id': 'test_client_id_78900987'}]},
+            json.loads(mock_transport.get.call_args[1]['data']))
+        # the search of the caller is left untouched
+        self.assertEqual({'match': [{'_all': 'text'}]}, search)
+
+    @mock.patch('freezerclient.v2.managers.base.BaseManager.transport')
+    def test_update_ok(self, mock_transport):
         self.mock_response.status_code = 200
         self.mock_response.json.return_value = {
             "patch": {"status": "bamboozled"},
             "version": 12,
             "job_id": "d454beec-1f3c-4d11-aa1a-404116a40502"
         }
-        mock_requests.patch.return_value = self.mock_response
+        mock_transport.patch.return_value = self.mock_response
         retval = self.job_manager.update(
             'd454beec-1f3c-4d11-aa1a-404116a40502', {'status': 'bamboozled'})
         self.assertEqual(12, retval)
 
-    @mock.patch('freezerclient.v2.managers.jobs.requests')
+    @mock.patch('freezerclient.v2.managers.base.BaseManager.transport')
     def test_update_raise_MetadataUpdateFailure_when_api_return_error_code(
-            self, mock_requests):
+            self, mock_transport):
         self.mock_response.json.return_value = {
             "patch": {"status": "bamboozled"},
             "version": 12,
@@ -205,18 +249,18 @@ class TestJobManager(unittest.TestCase):
             '{"title": "Not Found","description":"No document found with ID '
             'd454beec-1f3c-4d11-aa1a-404116a40502x"}'
         )
-        mock_requests.patch.return_value = self.mock_response
+        mock_transport.patch.return_value = self.mock_response
         self.assertRaises(exceptions.ApiClientException,
                           self.job_manager.update,
                           'd454beec-1f3c-4d11-aa1a-404116a40502',
                           {'status': 'bamboozled'})
 
-    @mock.patch('freezerclient.v2.managers.jobs.requests')
-    def test_start_job_posts_proper_data(self, mock_requests):
+    @mock.patch('freezerclient.v2.managers.base.BaseManager.transport')
+    def test_start_job_posts_proper_data(self, mock_transport):
         job_id = 'jobdfsfnqwerty1234'
         self.mock_response.status_code = 202
         self.mock_response.json.return_value = {'result': 'success'}
-        mock_requests.post.return_value = self.mock_response
+        mock_transport.post.return_value = self.mock_response
         # /v2/{project_id}/jobs/{job_id}/event
 
         endpoint = '{0}/v2/{1}/jobs/{2}/event'.format(
@@ -227,28 +271,28 @@ class TestJobManager(unittest.TestCase):
         retval = self.job_manager.start_job(job_id)
         self.assertEqual({'result': 'success'}, retval)
 
-        args = mock_requests.post.call_args[0]
-        kwargs = mock_requests.post.call_args[1]
+        args = mock_transport.post.call_args[0]
+        kwargs = mock_transport.post.call_args[1]
         self.assertEqual(endpoint, args[0])
         self.assertEqual(data, json.loads(kwargs['data']))
         self.assertEqual(self.headers, kwargs['headers'])
 
-    @mock.patch('freezerclient.v2.managers.jobs.requests')
+    @mock.patch('freezerclient.v2.managers.base.BaseManager.transport')
     def test_start_job_raise_ApiClientException_when_api_return_error_code(
-            self, mock_requests):
+            self, mock_transport):
         job_id = 'jobdfsfnqwerty1234'
         self.mock_response.status_code = 500
         self.mock_response.json.return_value = {'result': 'success'}
-        mock_requests.post.return_value = self.mock_response
+        mock_transport.post.return_value = self.mock_response
         self.assertRaises(exceptions.ApiClientException,
                           self.job_manager.start_job, job_id)
 
-    @mock.patch('freezerclient.v2.managers.jobs.requests')
-    def test_stop_job_posts_proper_data(self, mock_requests):
+    @mock.patch('freezerclient.v2.managers.base.BaseManager.transport')
+    def test_stop_job_posts_proper_data(self, mock_transport):
         job_id = 'jobdfsfnqwerty1234'
         self.mock_response.status_code = 202
         self.mock_response.json.return_value = {'result': 'success'}
-        mock_requests.post.return_value = self.mock_response
+        mock_transport.post.return_value = self.mock_response
         # /v2/{project_id}/jobs/{job_id}/event
 
         endpoint = '{0}/v2/{1}/jobs/{2}/event'.format(
@@ -259,28 +303,28 @@ class TestJobManager(unittest.TestCase):
         retval = self.job_manager.stop_job(job_id)
         self.assertEqual({'result': 'success'}, retval)
 
-        args = mock_requests.post.call_args[0]
-        kwargs = mock_requests.post.call_args[1]
+        args = mock_transport.post.call_args[0]
+        kwargs = mock_transport.post.call_args[1]
         self.assertEqual(endpoint, args[0])
         self.assertEqual(data, json.loads(kwargs['data']))
         self.assertEqual(self.headers, kwargs['headers'])
 
-    @mock.patch('freezerclient.v2.managers.jobs.requests')
+    @mock.patch('freezerclient.v2.managers.base.BaseManager.transport')
     def test_stop_job_raise_ApiClientException_when_api_return_error_code(
-            self, mock_requests):
+            self, mock_transport):
         job_id = 'jobdfsfnqwerty1234'
         self.mock_response.status_code = 500
         self.mock_response.json.return_value = {'result': 'success'}
-        mock_requests.post.return_value = self.mock_response
+        mock_transport.post.return_value = self.mock_response
         self.assertRaises(exceptions.ApiClientException,
                           self.job_manager.start_job, job_id)
 
-    @mock.patch('freezerclient.v2.managers.jobs.requests')
-    def test_abort_job_posts_proper_data(self, mock_requests):
+    @mock.patch('freezerclient.v2.managers.base.BaseManager.transport')
+    def test_abort_job_posts_proper_data(self, mock_transport):
         job_id = 'jobdfsfnqwerty1234'
         self.mock_response.status_code = 202
         self.mock_response.json.return_value = {'result': 'success'}
-        mock_requests.post.return_value = self.mock_response
+        mock_transport.post.return_value = self.mock_response
         # /v2/{project_id}/jobs/{job_id}/event
 
         endpoint = '{0}/v2/{1}/jobs/{2}/event'.format(
@@ -291,22 +335,201 @@ class TestJobManager(unittest.TestCase):
         retval = self.job_manager.abort_job(job_id)
         self.assertEqual({'result': 'success'}, retval)
 
-        args = mock_requests.post.call_args[0]
-        kwargs = mock_requests.post.call_args[1]
+        args = mock_transport.post.call_args[0]
+        kwargs = mock_transport.post.call_args[1]
         self.assertEqual(endpoint, args[0])
         self.assertEqual(data, json.loads(kwargs['data']))
         self.assertEqual(self.headers, kwargs['headers'])
 
-    @mock.patch('freezerclient.v2.managers.jobs.requests')
+    @mock.patch('freezerclient.v2.managers.base.BaseManager.transport')
     def test_abort_job_raise_ApiClientException_when_api_return_error_code(
-            self, mock_requests):
+            self, mock_transport):
         job_id = 'jobdfsfnqwerty1234'
         self.mock_response.status_code = 500
         self.mock_response.json.return_value = {'result': 'success'}
-        mock_requests.post.return_value = self.mock_response
+        mock_transport.post.return_value = self.mock_response
         self.assertRaises(exceptions.ApiClientException,
                           self.job_manager.abort_job, job_id)
 
+    @mock.patch('freezerclient.v2.managers.base.BaseManager.transport')
+    def test_get_cached_until_update(self, mock_transport):
+        self.job_manager.cache = cache.DocumentCache()
+        mock_transport.get.return_value = mock.Mock(
+            status_code=200, json=mock.Mock(return_value={'job_id': 'j1'}))
+        mock_transport.patch.return_value = mock.Mock(
+            status_code=200, json=mock.Mock(return_value={'version': 2}))
+        self.assertEqual({'job_id': 'j1'}, self.job_manager.get('j1'))
+        self.assertEqual({'job_id': 'j1'}, self.job_manager.get('j1'))
+        self.assertEqual(1, mock_transport.get.call_count)
+        self.job_manager.update('j1', {'description': 'new'})
+        self.job_manager.get('j1')
+        self.assertEqual(2, mock_transport.get.call_count)
+
+    @mock.patch('freezerclient.v2.managers.base.BaseManager.transport')
+    def test_get_caches_missing_jobs_until_created(self, mock_transport):
+        self.job_manager.cache = cache.DocumentCache()
+        mock_transport.get.return_value = mock.Mock(status_code=404)
+        mock_transport.post.return_value = mock.Mock(
+            status_code=201, json=mock.Mock(return_value={'job_id': 'j1'}))
+        self.assertIsNone(self.job_manager.get('j1'))
+        self.assertIsNone(self.job_manager.get('j1'))
+        self.assertEqual(1, mock_transport.get.call_count)
+        self.job_manager.create({'job_id': 'j1'})
+        self.job_manager.get('j1')
+        self.assertEqual(2, mock_transport.get.call_count)
+
+    @mock.patch('freezerclient.v2.managers.base.BaseManager.transport')
+    def test_get_serves_stale_job_when_circuit_open(self, mock_transport):
+        self.job_manager.cache = cache.DocumentCache(ttl=0)
+        mock_transport.get.side_effect = [
+            mock.Mock(status_code=200, headers={'ETag': '"e1"'},
+                      json=mock.Mock(return_value={'job_id': 'j1'})),
+            exceptions.CircuitOpenError('http://testendpoint:9999', 30),
+            exceptions.CircuitOpenError('http://testendpoint:9999', 30)]
+        self.assertEqual({'job_id': 'j1'}, self.job_manager.get('j1'))
+        self.assertEqual({'job_id': 'j1'}, self.job_manager.get('j1'))
+        self.assertEqual(1, self.job_manager.cache.stale_hits)
+        self.assertRaises(exceptions.CircuitOpenError,
+                          self.job_manager.get, 'j2')
+
+    @mock.patch('freezerclient.v2.managers.base.BaseManager.transport')
+    def test_get_revalidates_stale_job(self, mock_transport):
+        self.job_manager.cache = cache.DocumentCache(ttl=0)
+        mock_transport.get.side_effect = [
+            mock.Mock(status_code=200, headers={'ETag': '"e1"'},
+                      json=mock.Mock(return_value={'job_id': 'j1'})),
+            mock.Mock(status_code=304, headers={}),
+            mock.Mock(status_code=200, headers={},
+                      json=mock.Mock(return_value={'job_id': 'j1',
+                                                   'version': 2})),
+            mock.Mock(status_code=304, headers={})]
+        self.assertEqual({'job_id': 'j1'}, self.job_manager.get('j1'))
+        self.assertEqual({'job_id': 'j1'}, self.job_manager.get('j1'))
+        self.assertEqual({'job_id': 'j1', 'version': 2},
+                         self.job_manager.get('j1'))
+        self.assertEqual({'job_id': 'j1', 'version': 2},
+                         self.job_manager.get('j1'))
+        sent = [c[1]['headers'].get('If-None-Match')
+                for c in mock_transport.get.call_args_list]
+        self.assertEqual([None, '"e1"', '"e1"', '"2"'], sent)
+        self.assertEqual((3, 2), (self.job_manager.cache.revalidations,
+                                  self.job_manager.cache.not_modified))
+
+    @mock.patch('freezerclient.v2.managers.base.BaseManager.transport')
+    def test_concurrent_identical_lists_are_coalesced(self, mock_transport):
+        self.job_manager.singleflight = singleflight.Group()
+        release = threading.Event()
+
+        def get(*args, **kwargs):
+            release.wait()
+            return mock.Mock(status_code=200, json=mock.Mock(
+                return_value={'jobs': [{'job_id': 'j1'}]}))
+
+        mock_transport.get.side_effect = get
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(
+            self.job_manager.list_all(limit=5))) for _ in range(3)]
+        for thread in threads:
+            thread.start()
+        while self.job_manager.singleflight.coalesced < 2:
+            pass
+        release.set()
+        for thread in threads:
+            thread.join()
+        self.assertEqual([[{'job_id': 'j1'}]] * 3, results)
+        self.assertEqual(1, mock_transport.get.call_count)
+        self.job_manager.list_all(limit=6)
+        self.assertEqual(2, mock_transport.get.call_count)
+
+    @mock.patch('freezerclient.v2.managers.base.BaseManager.transport')
+    def test_signal_invalidates_cache(self, mock_transport):
+        self.job_manager.cache = mock.Mock()
+        mock_transport.post.return_value = mock.Mock(status_code=202)
+        self.job_manager.stop_job('j1')
+        self.job_manager.cache.invalidate.assert_called_once_with(
+            'http://testendpoint:9999/v2/tecs/jobs/j1')
+
+    @mock.patch('freezerclient.v2.managers.base.BaseManager.transport')
+    def test_create_return_document(self, mock_transport):
+        self.job_manager.cache = cache.DocumentCache()
+        mock_transport.post.return_value = mock.Mock(
+            status_code=201, json=mock.Mock(return_value={'job_id': 'j1'}))
+        mock_transport.get.return_value = mock.Mock(
+            status_code=200, headers={}, json=mock.Mock(
+                return_value={'job_id': 'j1', 'user_id': 'u1'}))
+        job = self.job_manager.create({'description': 'test'},
+                                      return_document=True)
+        self.assertEqual({'job_id': 'j1', 'description': 'test',
+                          'client_id': 'test_client_id_78900987'}, job)
+        self.assertFalse(mock_transport.get.called)
+        # the document built locally lacks the fields set by freezer-api,
+        # it is not cached
+        self.assertEqual({'job_id': 'j1', 'user_id': 'u1'},
+                         self.job_manager.get('j1'))
+
+    @mock.patch('freezerclient.v2.managers.base.BaseManager.transport')
+    def test_update_return_document_merges_cached_job(self, mock_transport):
+        self.job_manager.cache = cache.DocumentCache()
+        mock_transport.get.return_value = mock.Mock(
+            status_code=200, headers={}, json=mock.Mock(return_value={
+                'job_id': 'j1', 'description': 'old',
+                'job_schedule': {'status': 'stop', 'event': 'stop'}}))
+        mock_transport.patch.return_value = mock.Mock(
+            status_code=200, json=mock.Mock(return_value={'version': 3}))
+        self.job_manager.get('j1')
+        job = self.job_manager.update(
+            'j1', {'description': 'new', 'job_schedule': {'event': 'start'}},
+            return_document=True)
+        self.assertEqual({'job_id': 'j1', 'description': 'new', 'version': 3,
+                          'job_schedule': {'status': 'stop',
+                                           'event': 'start'}}, job)
+        self.assertEqual(1, mock_transport.get.call_count)
+        self.assertIs(cache.MISS, self.job_manager.cache.lookup(
+            self.job_manager.endpoint + 'j1'))
+
+    @mock.patch('freezerclient.v2.managers.base.BaseManager.transport')
+    def test_update_return_document_without_cache(self, mock_transport):
+        stored = {'job_id': 'j1', 'description': 'new', 'version': 3,
+                  'client_id': 'c1', 'user_id': 'u1'}
+        mock_transport.patch.return_value = mock.Mock(
+            status_code=200, json=mock.Mock(return_value={'version': 3}))
+        mock_transport.get.return_value = mock.Mock(
+            status_code=200, json=mock.Mock(return_value=stored))
+        job = self.job_manager.update('j1', {'description': 'new'},
+                                      return_document=True)
+        self.assertEqual(stored, job)
+        self.assertEqual(1, mock_transport.get.call_count)
+
+    def test_start_jobs_collects_results(self):
+        def start_job(job_id):
+            if job_id == 'j2':
+                raise exceptions.ApiClientException('boom')
+            return {'result': 'start already requested'}
+
+        with mock.patch.object(self.job_manager, 'start_job',
+                               side_effect=start_job):
+            results = self.job_manager.start_jobs(iter(['j1', 'j2', 'j3']),
+                                                  concurrency=2)
+        self.assertEqual(['j1', 'j2', 'j3'], [r.item for r in results])
+        self.assertEqual({'result': 'start already requested'},
+                         results[0].result)
+        self.assertIsInstance(results[1].error,
+                              exceptions.ApiClientException)
+
+    def test_stop_jobs_search(self):
+        search = {'match': [{'_all': 'drill'}]}
+        with mock.patch.object(self.job_manager, 'iter_list_all',
+                               return_value=iter([{'job_id': 'j1'},
+                                                  {'job_id': 'j2'}])) as il, \
+                mock.patch.object(self.job_manager, 'stop_job') as stop_job:
+            results = self.job_manager.stop_jobs(search=search)
+        il.assert_called_once_with(search=search, deadline=None)
+        self.assertEqual(['j1', 'j2'], [r.item for r in results])
+        self.assertEqual(2, stop_job.call_count)
+
+    def test_abort_jobs_requires_ids_or_search(self):
+        self.assertRaises(ValueError, self.job_manager.abort_jobs)
+
 
 class TestJobList(unittest.TestCase):
     def setUp(self):
@@ -328,6 +551,7 @@ class TestJobList(unittest.TestCase):
         parsed_args.search = ''
         parsed_args.client_id = ''
         parsed_args.all_projects = True
+        parsed_args.all = False
 
         self.app.client.jobs.list_all.return_value = []
 
@@ -347,6 +571,7 @@ class TestJobList(unittest.TestCase):
         parsed_args.search = ''
         parsed_args.client_id = 'test_client'
         parsed_args.all_projects = True
+        parsed_args.all = False
 
         self.app.client.jobs.list.return_value = []
 
@@ -359,3 +584,226 @@ class TestJobList(unittest.TestCase):
             client_id='test_client',
             all_projects=True
         )
+
+    def test_take_action_all_pages(self):
+        parsed_args = mock.Mock()
+        parsed_args.offset = 0
+        parsed_args.search = ''
+        parsed_args.client_id = ''
+        parsed_args.all_projects = False
+        parsed_args.all = True
+        parsed_args.page_size = 50
+        parsed_args.concurrency = 4
+
+        self.app.client.jobs.iter_list_all.return_value = iter(
+            [{'job_id': 'a', 'job_actions': []}])
+
+        columns, data = self.job_list.take_action(parsed_args)
+
+        self.app.client.jobs.iter_list_all.assert_called_once_with(
+            page_size=50,
+            offset=0,
+            search={},
+            all_projects=False,
+            concurrency=4
+        )
+        self.assertFalse(self.app.client.jobs.list_all.called)
+        self.assertEqual('a', list(data)[0][0])
+
+
+class TestJobCreate(unittest.TestCase):
+    def setUp(self):
+        self.app = mock.Mock()
+        self.app.client = mock.Mock()
+        self.job_create = jobs_cmd.JobCreate(self.app, mock.Mock())
+        self.parser = self.job_create.get_parser('test')
+
+        def create_many(docs, fetch, concurrency, rate, on_progress):
+            results = []
+            for doc in docs:
+                error = ValueError('boom') if doc.get('fail') else None
+                results.append(base.BulkResult(doc, 'id', error))
+            return results
+
+        self.app.client.jobs.create_many.side_effect = create_many
+
+    def test_take_action_from_jsonl(self):
+        with tempfile.NamedTemporaryFile('w') as f:
+            f.write('{"description": "one"}\n'
+                    'not json\n'
+                    '\n'
+                    '{"description": "two", "fail": true}\n'
+                    '{"description": "three"}\n')
+            f.flush()
+            parsed_args = self.parser.parse_args(['--from-jsonl', f.name,
+                                                  '--client', 'c1'])
+            with mock.patch.object(base_cmd.logging, 'error') as mock_error:
+                columns, data = self.job_create.take_action(parsed_args)
+        self.assertEqual(('Documents', 'Created', 'Failed'), columns)
+        self.assertEqual((4, 2, 2), data)
+        self.assertEqual(2, self.job_create.failed)
+        mock_error.assert_any_call('Invalid %s %s: %s', 'job',
+                                   f.name + ':2', mock.ANY)
+        mock_error.assert_any_call('Unable to create %s %s: %s', 'job',
+                                   f.name + ':4', mock.ANY)
+        args, kwargs = self.app.client.jobs.create_many.call_args
+        self.assertTrue(kwargs['fetch'])
+        self.assertFalse(self.app.client.jobs.create.called)
+        self.assertFalse(self.app.client.jobs.get.called)
+
+    def test_take_action_from_jsonl_not_objects(self):
+        with tempfile.NamedTemporaryFile('w') as f:
+            f.write('["description"]\n'
+                    '{"description": "one"}\n'
+                    '"description"\n'
+                    '42\n')
+            f.flush()
+            parsed_args = self.parser.parse_args(['--from-jsonl', f.name,
+                                                  '--client', 'c1'])
+            with mock.patch.object(base_cmd.logging, 'error') as mock_error:
+                columns, data = self.job_create.take_action(parsed_args)
+        self.assertEqual((4, 1, 3), data)
+        self.assertEqual(3, self.job_create.failed)
+        for number in (1, 3, 4):
+            mock_error.assert_any_call('Invalid %s %s: %s', 'job',
+                                       '{0}:{1}'.format(f.name, number),
+                                       mock.ANY)
+
+    def test_take_action_from_dir_sets_client_id(self):
+        docs = []
+
+        def create_many(documents, **kwargs):
+            docs.extend(documents)
+            return [base.BulkResult(d, 'id', None) for d in docs]
+
+        self.app.client.jobs.create_many.side_effect = create_many
+        with tempfile.TemporaryDirectory() as path:
+            for name in ('b.json', 'a.json'):
+                with open(os.path.join(path, name), 'w') as f:
+                    json.dump({'description': name}, f)
+            parsed_args = self.parser.parse_args(['--from-dir', path,
+                                                  '--client', 'c1'])
+            columns, data = self.job_create.take_action(parsed_args)
+        self.assertEqual((2, 2, 0), data)
+        self.assertEqual([{'description': 'a.json', 'client_id': 'c1'},
+                          {'description': 'b.json', 'client_id': 'c1'}],
+                         docs)
+        self.assertTrue(
+            self.app.client.jobs.create_many.call_args[1]['fetch'])
+
+    def test_sources_are_exclusive(self):
+        with mock.patch('sys.stderr'):
+            self.assertRaises(SystemExit, self.parser.parse_args,
+                              ['--file', 'a', '--from-dir', 'b',
+                               '--client', 'c1'])
+            self.assertRaises(SystemExit, self.parser.parse_args,
+                              ['--client', 'c1'])
+
+
+class TestJobStart(unittest.TestCase):
+    def setUp(self):
+        self.app = mock.Mock()
+        self.app.client = mock.Mock()
+        self.job_start = jobs_cmd.JobStart(self.app, mock.Mock())
+        self.parser = self.job_start.get_parser('test')
+
+    def test_take_action_single(self):
+        self.job_start.take_action(self.parser.parse_args(['j1']))
+        self.app.client.jobs.start_job.assert_called_once_with('j1')
+        self.assertFalse(self.app.client.jobs.start_jobs.called)
+
+    def test_take_action_all_matching(self):
+        self.app.client.jobs.start_jobs.return_value = [
+            base.BulkResult('j1', {'result': 'success'}, None),
+            base.BulkResult('j2', {'result': 'start already requested'},
+                            None)]
+        self.job_start.take_action(self.parser.parse_args(
+            ['--all-matching', 'drill', '--concurrency', '16']))
+        self.app.client.jobs.start_jobs.assert_called_once_with(
+            search={'match': [{'_all': 'drill'}]}, concurrency=16,
+            rate=None, on_progress=None)
+
+    def test_take_action_empty_all_matching(self):
+        for search in ('', '  '):
+            parsed_args = self.parser.parse_args(['--all-matching', search])
+            self.assertRaises(exceptions.ApiClientException,
+                              self.job_start.take_action, parsed_args)
+        self.assertFalse(self.app.client.jobs.start_jobs.called)
+
+    def test_take_action_empty_job_id(self):
+        self.assertRaises(exceptions.ApiClientException,
+                          self.job_start.take_action,
+                          self.parser.parse_args(['']))
+        self.assertFalse(self.app.client.jobs.start_jobs.called)
+
+    def test_take_action_from_file_failures(self):
+        self.app.client.jobs.abort_jobs.return_value = [
+            base.BulkResult('j1', None, ValueError('boom'))]
+        job_abort = jobs_cmd.JobAbort(self.app, mock.Mock())
+        with tempfile.NamedTemporaryFile('w') as f:
+            f.write('j1\n')
+            f.flush()
+            parsed_args = job_abort.get_parser('test').parse_args(
+                ['--from-file', f.name])
+            with mock.patch.object(jobs_cmd.logging, 'error') as mock_error:
+                self.assertRaises(exceptions.ApiClientException,
+                                  job_abort.take_action, parsed_args)
+        mock_error.assert_called_once_with(
+            'Unable to %s job %s: %s', 'abort', 'j1', mock.ANY)
+
+    def test_sources_are_exclusive(self):
+        with mock.patch('sys.stderr'):
+            self.assertRaises(SystemExit, self.parser.parse_args,
+                              ['j1', '--all-matching', 'drill'])
+            self.assertRaises(SystemExit, self.parser.parse_args, [])
+
+
+class TestJobCreateOne(unittest.TestCase):
+    def setUp(self):
+        self.app = mock.Mock()
+        self.app.client = mock.Mock()
+        self.job_create = jobs_cmd.JobCreate(self.app, mock.Mock())
+        self.parser = self.job_create.get_parser('test')
+
+    @mock.patch('freezerclient.utils.doc_from_json_file')
+    def test_take_action_reads_created_job(self, mock_doc):
+        mock_doc.return_value = {'description': 'test'}
+        self.app.client.jobs.create.return_value = 'j1'
+        self.app.client.jobs.get.return_value = None
+        parsed_args = self.parser.parse_args(['--file', 'job.json',
+                                              '-C', 'c1'])
+        self.assertRaises(exceptions.ApiClientException,
+                          self.job_create.take_action, parsed_args)
+        self.app.client.jobs.create.assert_called_once_with(
+            {'description': 'test', 'client_id': 'c1'})
+        self.app.client.jobs.get.assert_called_once_with('j1')
+
+    @mock.patch('freezerclient.utils.doc_from_json_file')
+    def test_take_action_no_refetch(self, mock_doc):
+        mock_doc.return_value = {'description': 'test'}
+        self.app.client.jobs.create.return_value = {'job_id': 'j1'}
+        columns, data = self.job_create.take_action(
+            self.parser.parse_args(['--file', 'job.json', '-C', 'c1',
+                                    '--no-refetch']))
+        self.app.client.jobs.create.assert_called_once_with(
+            {'description': 'test', 'client_id': 'c1'},
+            return_document=True)
+        self.assertFalse(self.app.client.jobs.get.called)
+        self.assertEqual('j1', data[0])
+
+
+class TestJobUpdate(unittest.TestCase):
+    def setUp(self):
+        self.app = mock.Mock()
+        self.app.client = mock.Mock()
+        self.job_update = jobs_cmd.JobUpdate(self.app, mock.Mock())
+        self.parser = self.job_update.get_parser('test')
+
+    @mock.patch('freezerclient.utils.doc_from_json_file')
+    def test_take_action_reads_updated_job(self, mock_doc):
+        mock_doc.return_value = {'description': 'new'}
+        self.app.client.jobs.get.return_value = {'job_id': 'j1'}
+        self.job_update.take_action(self.parser.parse_args(['j1', 'f']))
+        self.app.client.jobs.update.assert_called_once_with(
+            'j1', {'description': 'new'})
+        self.app.client.jobs.get.assert_called_once_with('j1')
@@ -0,0 +1,98 @@
+# (c) Copyright 2026 Cleura AB
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import unittest
+from unittest import mock
+
+from freezerclient.v2 import client
+from freezerclient.v2 import projects
+
+
+class TestProjectClient(unittest.TestCase):
+
+    @mock.patch('freezerclient.v2.client.ksa_session.Session')
+    @mock.patch('freezerclient.v2.client.identity.Token')
+    def test_for_project(self, mock_token, mock_session):
+        session = mock.Mock()
+        session.auth.auth_url = 'http://keystone/v3'
+        session.get_token.return_value = 'token'
+        c = client.Client(session=session, endpoint='http://f:9090',
+                          project_id='home')
+        pc = c.for_project('p1')
+        mock_token.assert_called_once_with('http://keystone/v3',
+                                           token='token', project_id='p1')
+        mock_session.assert_called_once_with(
+            auth=mock_token.return_value, session=session.session,
+            verify=session.verify, cert=session.cert,
+            timeout=session.timeout)
+        self.assertEqual('http://f:9090/v2/p1/backups/',
+                         pc.backups.endpoint)
+        self.assertEqual('http://f:9090/v2/home/backups/',
+                         c.backups.endpoint)
+        self.assertIs(c.transport, pc.backups.transport)
+        self.assertEqual(mock_session.return_value.get_token.return_value,
+                         pc.auth_token)
+
+    @mock.patch('freezerclient.v2.client.identity.Token')
+    def test_for_project_through_adapter(self, mock_token):
+        session = mock.Mock(verify=True, cert=None, timeout=None)
+        session.auth.auth_url = 'http://keystone/v3'
+        session.get_token.return_value = 'token'
+        c = client.Client(session=session, endpoint='http://f:9090',
+                          project_id='home', use_adapter=True)
+        pc = c.for_project('p1')
+        self.assertIsNot(c.transport, pc.backups.transport)
+        self.assertIs(pc.session, pc.transport.adapter.session)
+        with mock.patch.object(pc.session, 'request') as request:
+            request.return_value = mock.Mock(
+                status_code=200, json=mock.Mock(return_value={'backups': []}))
+            self.assertEqual([], pc.backups.list())
+        self.assertEqual('http://f:9090/v2/p1/backups/',
+                         request.call_args[0][0])
+        self.assertFalse(session.request.called)
+
+
+class TestIterRecords(unittest.TestCase):
+
+    def setUp(self):
+        self.client = mock.Mock()
+        self.client.for_project.side_effect = lambda project_id: project_id
+
+    def test_records_annotated_in_project_order(self):
+        records = list(projects.iter_records(
+            self.client, ['p1', 'p2', 'p3'],
+            lambda project: [{'id': project + 'a'}, {'id': project + 'b'}],
+            concurrency=2))
+        self.assertEqual(['p1a', 'p1b', 'p2a', 'p2b', 'p3a', 'p3b'],
+                         [r['id'] for r in records])
+        self.assertEqual(['p1', 'p1', 'p2', 'p2', 'p3', 'p3'],
+                         [r['project_id'] for r in records])
+
+    def _list(self, project):
+        if project == 'p2':
+            raise Exception('forbidden')
+        return [{'id': project}]
+
+    def test_errors_collected(self):
+        errors = {}
+        records = list(projects.iter_records(self.client, ['p1', 'p2', 'p3'],
+                                             self._list, errors=errors))
+        self.assertEqual(['p1', 'p3'], [r['id'] for r in records])
+        self.assertEqual(['p2'], list(errors))
+
+    def test_error_raised(self):
+        records = projects.iter_records(self.client, ['p1', 'p2'],
+                                        self._list)
+        self.assertEqual({'id': 'p1', 'project_id': 'p1'}, next(records))
+        self.assertRaises(Exception, next, records)
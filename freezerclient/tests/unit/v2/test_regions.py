@@ -0,0 +1,89 @@
+# (c) Copyright 2026 Cleura AB
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import unittest
+from unittest import mock
+
+from freezerclient import timeouts
+from freezerclient.v2 import client
+from freezerclient.v2.managers import backups
+from freezerclient.v2 import regions
+
+
+class TestRegionClient(unittest.TestCase):
+
+    def setUp(self):
+        self.session = mock.Mock()
+        self.catalog = self.session.auth.get_access.return_value\
+            .service_catalog
+        self.catalog.url_for.side_effect = (
+            lambda region_name, **kw: 'http://%s:9090' % region_name)
+        self.client = client.Client(session=self.session, project_id='tecs',
+                                    endpoint='http://home:9090')
+
+    def test_endpoint_of_region(self):
+        rc = self.client.for_region('two')
+        self.assertEqual('http://two:9090', rc.endpoint)
+        self.assertEqual('http://two:9090/v2/tecs/backups/',
+                         rc.backups.endpoint)
+        self.assertEqual('http://home:9090/v2/tecs/backups/',
+                         self.client.backups.endpoint)
+        self.catalog.url_for.assert_called_once_with(
+            service_type='backup', interface=None, region_name='two')
+
+    def test_shares_session_and_transport(self):
+        rc = self.client.for_region('two')
+        self.assertIs(self.client.session, rc.session)
+        self.assertIs(self.client.transport, rc.backups.transport)
+        self.assertIsInstance(rc.backups, backups.BackupsManager)
+
+
+class TestFanOut(unittest.TestCase):
+
+    def setUp(self):
+        self.client = mock.Mock()
+        self.client.for_region.side_effect = lambda region: region
+
+    def test_results_in_region_order(self):
+        results = regions.fan_out(self.client, ['a', 'b', 'c'],
+                                  lambda region: region.upper())
+        self.assertEqual([('a', 'A', None), ('b', 'B', None),
+                          ('c', 'C', None)], results)
+
+    def test_partial_failure(self):
+        error = Exception('region b is down')
+
+        def func(region):
+            if region == 'b':
+                raise error
+            return region
+
+        results = regions.fan_out(self.client, ['a', 'b'], func)
+        self.assertEqual(('a', 'a', None), results[0])
+        self.assertEqual(('b', None, error), results[1])
+
+    def test_deadline_propagated(self):
+        with timeouts.within(30) as deadline:
+            results = regions.fan_out(self.client, ['a'],
+                                      lambda region: timeouts.current())
+        self.assertIs(deadline, results[0].result)
+
+    def test_merge(self):
+        results = [
+            regions.RegionResult('a', [{'t': 1}, {'t': 4}], None),
+            regions.RegionResult('b', None, Exception()),
+            regions.RegionResult('c', [{'t': 2}, {'t': 3}], None)]
+        merged = list(regions.merge(results, key=lambda r: r['t']))
+        self.assertEqual([1, 2, 3, 4], [r['t'] for r in merged])
+        self.assertEqual(['a', 'c', 'c', 'a'], [r['region'] for r in merged])
@@ -0,0 +1,145 @@
+# (c) Copyright 2026 Cleura AB
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import contextlib
+import contextvars
+import functools
+import time
+
+from freezerclient import exceptions
+
+_current = contextvars.ContextVar('freezerclient_deadline', default=None)
+
+
+class Deadline(object):
+    """Time budget shared by every request of an operation.
+
+    While a deadline is active (see :func:`activate` and :func:`within`),
+    the transports cap the timeout of each request to the remaining
+    budget, stop retrying once it is spent and raise
+    :class:`freezerclient.exceptions.DeadlineExceeded` instead of sending
+    a new request. The listings (``iter_list``, ``iter_list_all``,
+    ``scan``) and the bulk operations (``delete_many``, ``create_many``,
+    ``start_jobs``, ``stop_jobs``, ``abort_jobs``) of the managers also
+    accept a deadline, and stop paginating and fanning out when it runs
+    out.
+    """
+
+    def __init__(self, timeout):
+        """
+        :param timeout: budget in seconds, starting now
+        """
+        self.timeout = timeout
+        self.expires_at = time.monotonic() + timeout
+
+    def remaining(self):
+        """Number of seconds left, never negative"""
+        return max(self.expires_at - time.monotonic(), 0)
+
+    @property
+    def expired(self):
+        return self.remaining() <= 0
+
+    def check(self):
+        """Return the number of seconds left, raise if there are none
+
+        :raises freezerclient.exceptions.DeadlineExceeded
+        """
+        remaining = self.remaining()
+        if remaining <= 0:
+            raise exceptions.DeadlineExceeded(
+                'Operation did not complete within {0} seconds'.format(
+                    self.timeout))
+        return remaining
+
+
+def current():
+    """Deadline active in the current context, or None"""
+    return _current.get()
+
+
+@contextlib.contextmanager
+def activate(deadline):
+    """Apply deadline to the requests sent within the block
+
+    Nested deadlines never extend the budget of an enclosing one. Worker
+    threads do not inherit the context of their parent, so functions
+    running on a thread pool must activate the deadline themselves.
+
+    :param deadline: Deadline, or None for no-op
+    """
+    outer = _current.get()
+    if outer is not None and deadline is not None:
+        if outer.expires_at <= deadline.expires_at:
+            deadline = None
+    if deadline is None:
+        yield outer
+        return
+    token = _current.set(deadline)
+    try:
+        yield deadline
+    finally:
+        _current.reset(token)
+
+
+def within(timeout):
+    """Activate a new deadline of timeout seconds
+
+    Example::
+
+        with timeouts.within(30):
+            client.backups.list()
+
+    :param timeout: budget in seconds
+    """
+    return activate(Deadline(timeout))
+
+
+def bounded(func, deadline):
+    """Wrap func so that it runs under deadline, from any thread
+
+    The wrapper raises DeadlineExceeded without calling func once the
+    budget is spent, which stops paginations and fan-outs.
+
+    :param func: callable to wrap
+    :param deadline: Deadline, or None to return func unchanged
+    """
+    if deadline is None:
+        return func
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        deadline.check()
+        with activate(deadline):
+            return func(*args, **kwargs)
+    return wrapper
+
+
+def bounded_async(func, deadline):
+    """Wrap the coroutine function func so that it runs under deadline
+
+    Asynchronous flavour of bounded, for the asyncio managers.
+
+    :param func: coroutine function to wrap
+    :param deadline: Deadline, or None to return func unchanged
+    """
+    if deadline is None:
+        return func
+
+    @functools.wraps(func)
+    async def wrapper(*args, **kwargs):
+        deadline.check()
+        with activate(deadline):
+            return await func(*args, **kwargs)
+    return wrapper
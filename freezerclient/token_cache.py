@@ -0,0 +1,100 @@
+# (c) Copyright 2026 Cleura AB
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import hashlib
+import logging
+import os
+import stat
+import tempfile
+
+LOG = logging.getLogger(__name__)
+
+
+class TokenCache(object):
+    """On-disk cache of the keystone token and service catalog.
+
+    The authentication state of a keystoneauth identity plugin (the token
+    and the service catalog) is stored in a file named after the cache id
+    of the plugin, which changes with the auth url, the user, the project
+    and the domains. Files are readable by their owner only, and files
+    with wider permissions are ignored. Expired tokens are never used:
+    keystoneauth re-authenticates and the new state replaces the old one.
+    """
+
+    def __init__(self, cache_dir):
+        self.cache_dir = os.path.expanduser(cache_dir)
+        self._saved_refs = {}
+
+    def _path(self, plugin):
+        try:
+            cache_id = plugin.get_cache_id()
+        except AttributeError:
+            cache_id = None
+        if not cache_id:
+            return None
+        name = hashlib.sha256(cache_id.encode('utf-8')).hexdigest()
+        return os.path.join(self.cache_dir, name + '.json')
+
+    def load(self, plugin):
+        """Install the cached authentication state into plugin, if any
+
+        :param plugin: keystoneauth1 identity plugin
+        :return: True if a cached state was loaded
+        """
+        path = self._path(plugin)
+        if not path:
+            return False
+        try:
+            with open(path, 'r') as fd:
+                if stat.S_IMODE(os.fstat(fd.fileno()).st_mode) & 0o077:
+                    LOG.warning('Ignoring token cache %s, it is readable by '
+                                'other users', path)
+                    return False
+                state = fd.read()
+            plugin.set_auth_state(state)
+        except FileNotFoundError:
+            return False
+        except Exception as err:
+            LOG.debug('Unable to load token cache %s: %s', path, err)
+            return False
+        self._saved_refs[path] = plugin.auth_ref
+        return True
+
+    def save(self, plugin):
+        """Store the authentication state of plugin if it changed
+
+        :param plugin: keystoneauth1 identity plugin
+        """
+        path = self._path(plugin)
+        if not path or self._saved_refs.get(path) is plugin.auth_ref:
+            return
+        state = plugin.get_auth_state()
+        if not state:
+            return
+        try:
+            os.makedirs(self.cache_dir, mode=0o700, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir,
+                                            suffix='.tmp')
+            try:
+                # mkstemp creates the file with 0600 permissions
+                with os.fdopen(fd, 'w') as f:
+                    f.write(state)
+                os.replace(tmp_path, path)
+            except Exception:
+                os.unlink(tmp_path)
+                raise
+        except OSError as err:
+            LOG.debug('Unable to save token cache %s: %s', path, err)
+            return
+        self._saved_refs[path] = plugin.auth_ref
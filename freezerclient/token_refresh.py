@@ -0,0 +1,124 @@
+# (c) Copyright 2026 Cleura AB
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import datetime
+import logging
+import threading
+
+from keystoneauth1 import identity
+
+LOG = logging.getLogger(__name__)
+
+DEFAULT_REFRESH_MARGIN = 300
+DEFAULT_RETRY_INTERVAL = 30
+
+# Plugins authenticating with a token only get the same token back from
+# keystone, with the same expiry
+TOKEN_PLUGINS = (identity.Token, identity.V2Token, identity.V3Token)
+
+
+class TokenRefresher(object):
+    """Renew the token of a keystone session before it expires.
+
+    A daemon thread sleeps until ``margin`` seconds before the expiry of
+    the current token, authenticates again and swaps the new token in.
+    The current token stays valid and usable while keystone is being
+    contacted, so request threads never wait on re-authentication. The
+    margin should be larger than the two minutes before expiry at which
+    keystoneauth re-authenticates by itself in the request thread.
+    """
+
+    def __init__(self, margin=DEFAULT_REFRESH_MARGIN, on_error=None,
+                 on_refresh=None, retry_interval=DEFAULT_RETRY_INTERVAL):
+        """
+        :param margin: seconds before expiry at which the token is renewed
+        :param on_error: callable receiving the exception raised by a failed
+                         refresh. The refresh is attempted again after
+                         retry_interval seconds.
+        :param on_refresh: callable invoked after each successful refresh
+        :param retry_interval: minimum number of seconds between two
+                               refresh attempts
+        """
+        self.margin = margin
+        self.on_error = on_error
+        self.on_refresh = on_refresh
+        self.retry_interval = retry_interval
+        self.session = None
+        self._stopped = threading.Event()
+        self._thread = None
+
+    def start(self, session):
+        """Start renewing the token of session in the background
+
+        Plugins that are not keystone identity plugins (e.g. admin tokens)
+        and token plugins have nothing to renew and are left alone.
+
+        :param session: keystoneauth1.session.Session
+        """
+        if self._thread or not hasattr(session.auth, 'get_auth_ref'):
+            return
+        if isinstance(session.auth, TOKEN_PLUGINS):
+            return
+        self.session = session
+        self._thread = threading.Thread(target=self._run,
+                                        name='freezer-token-refresh',
+                                        daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stopped.set()
+        if self._thread:
+            self._thread.join()
+
+    def refresh(self):
+        """Authenticate again and swap the new token in"""
+        plugin = self.session.auth
+        # Unlike plugin.invalidate(), this keeps the current token in place
+        # until the new one is available.
+        plugin.auth_ref = plugin.get_auth_ref(self.session)
+        if self.on_refresh:
+            self.on_refresh()
+
+    def _next_delay(self):
+        auth_ref = self.session.auth.auth_ref
+        if auth_ref is None or auth_ref.expires is None:
+            return None
+        now = datetime.datetime.now(datetime.timezone.utc)
+        return (auth_ref.expires - now).total_seconds() - self.margin
+
+    def _run(self):
+        delay = 0
+        while not self._stopped.wait(delay):
+            delay = self._next_delay()
+            if delay is None:
+                # The first token is fetched on demand by the request path
+                delay = self.retry_interval
+            elif delay <= 0:
+                expires = self.session.auth.auth_ref.expires
+                try:
+                    self.refresh()
+                except Exception as err:
+                    LOG.warning('Unable to refresh the keystone token: %s',
+                                err)
+                    if self.on_error:
+                        self.on_error(err)
+                else:
+                    renewed = self.session.auth.auth_ref.expires
+                    if renewed is not None and renewed <= expires:
+                        # e.g. a cached token without credentials behind
+                        # it: authenticating again gives it back as is
+                        LOG.warning('The keystone token cannot be renewed, '
+                                    'it expires at %s', expires)
+                        return
+                delay = self.retry_interval
@@ -0,0 +1,393 @@
+# (c) Copyright 2026 Cleura AB
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import logging
+import time
+
+from keystoneauth1 import adapter as ksa_adapter
+from keystoneauth1 import exceptions as ksa_exceptions
+import requests
+from requests import adapters
+
+from freezerclient import exceptions
+from freezerclient import timeouts
+
+LOG = logging.getLogger(__name__)
+
+DEFAULT_POOL_CONNECTIONS = 10
+DEFAULT_POOL_MAXSIZE = 10
+
+
+def request_timeout(timeout, active=None):
+    """Timeout of the next request, capped by the active deadline
+
+    :param timeout: (connect, read) timeouts of the transport, or None
+    :param active: freezerclient.timeouts.Deadline, or None
+    :raises freezerclient.exceptions.DeadlineExceeded
+    :return: (connect, read) timeouts, a single timeout, or None
+    """
+    if active is None:
+        return timeout
+    remaining = active.check()
+    if timeout is None:
+        return remaining
+    return tuple(remaining if t is None else min(t, remaining)
+                 for t in timeout)
+
+
+def retry_delay(policy, method, attempt, active=None, response=None):
+    """Delay before the next attempt of a request, or None to give up
+
+    Retrying stops when there is no retry policy or when the delay would
+    overrun the active deadline.
+    """
+    if policy is None:
+        return None
+    delay = policy.next_delay(method, attempt, response)
+    if delay is not None and active is not None:
+        if delay >= active.remaining():
+            return None
+    return delay
+
+
+def rate_limit_delay(limiter, method, active=None):
+    """Delay before sending a request within the budget of the rate limiter
+
+    :param limiter: freezerclient.ratelimit.RateLimiter
+    :param method: HTTP method of the request
+    :param active: freezerclient.timeouts.Deadline, or None
+    :raises freezerclient.exceptions.DeadlineExceeded: when the delay would
+                                                       overrun the deadline
+    """
+    delay = limiter.reserve(method)
+    if delay and active is not None and delay >= active.remaining():
+        # The request is not sent, so its token goes to the next one
+        limiter.release(method)
+        raise exceptions.DeadlineExceeded(
+            'Rate limit delay of {0:.2f}s exceeds the deadline'.format(delay))
+    return delay
+
+
+class Route(object):
+    """Path of one attempt through the balancer and breaker of a transport
+
+    It holds the decisions shared by the synchronous and the asyncio
+    transports, which only send the request themselves.
+    """
+
+    def __init__(self, transport, url):
+        """
+        :param transport: transport sending the request
+        :param url: URL of the request, before balancing
+        """
+        self.balancer = transport.balancer
+        self.breaker = transport.circuit_breaker
+        self.requested_url = url
+        self.url = url
+        self.member = None
+        self.started = None
+
+    def open(self):
+        """Pick the endpoint of the attempt, False when its circuit is open
+
+        The members of the balancer whose circuit is open are skipped, and
+        another one is picked, until every member has been refused.
+        """
+        refused = []
+        while True:
+            if self.balancer is not None:
+                member, url = self.balancer.acquire(self.requested_url,
+                                                    refused)
+                if member is None and refused:
+                    return False
+                self.member, self.url = member, url
+            if self.breaker is None or self.breaker.allow(self.url):
+                self.started = time.monotonic()
+                return True
+            if self.member is None:
+                return False
+            # the member did not fail, it must not count against it
+            self.balancer.cancel(self.member)
+            refused.append(self.member)
+            self.member = None
+
+    def reject(self, method, **kwargs):
+        """Result of an attempt refused by the circuit breaker"""
+        return self.breaker.reject(method, self.url, **kwargs)
+
+    def failed(self):
+        """Record an attempt that raised before getting a response"""
+        if self.breaker is not None:
+            self.breaker.record(self.url)
+        self._release()
+
+    def succeeded(self, response):
+        """Record the response of the attempt"""
+        if self.breaker is not None:
+            self.breaker.record(self.url, response)
+        self._release(time.monotonic() - self.started, response)
+
+    def _release(self, *args):
+        if self.member is not None:
+            self.balancer.release(self.member, *args)
+
+
+class Attempts(object):
+    """Retry and rate limiting decisions of one request of a transport
+
+    It holds the decisions shared by the synchronous and the asyncio
+    transports, which only wait and send the request themselves.
+    """
+
+    def __init__(self, transport, method, url):
+        """
+        :param transport: transport sending the request
+        :param method: HTTP method of the request
+        :param url: URL of the request
+        """
+        self.transport = transport
+        self.method = method
+        self.url = url
+        self.active = timeouts.current()
+        self.count = 0
+
+    def next(self):
+        """Start a new attempt, return the delay to wait before sending it
+
+        :raises freezerclient.exceptions.DeadlineExceeded
+        """
+        self.count += 1
+        if self.transport.rate_limiter is None:
+            return 0
+        return rate_limit_delay(self.transport.rate_limiter, self.method,
+                                self.active)
+
+    def timeout(self):
+        """Timeout of the attempt, see request_timeout"""
+        return request_timeout(self.transport.timeout, self.active)
+
+    def failed(self, err):
+        """Delay before retrying after err, or None to raise it"""
+        delay = retry_delay(self.transport.retry_policy, self.method,
+                            self.count, self.active)
+        if delay is not None:
+            LOG.debug('%s %s failed (%s), retrying in %.2fs',
+                      self.method, self.url, err, delay)
+        return delay
+
+    def succeeded(self, response):
+        """Delay before retrying after response, or None to return it"""
+        delay = retry_delay(self.transport.retry_policy, self.method,
+                            self.count, self.active, response)
+        if delay is not None:
+            LOG.debug('%s %s returned %s, retrying in %.2fs',
+                      self.method, self.url, response.status_code, delay)
+        return delay
+
+
+class BaseTransport(object):
+    """Common interface of the transports used by the v2 managers.
+
+    Subclasses implement :meth:`_send`, which must return a
+    ``requests.Response`` and must never raise on HTTP error codes:
+    the managers inspect ``status_code`` themselves. :meth:`request`
+    sends the request again according to the retry policy when it fails
+    with one of the ``RETRYABLE_ERRORS`` or a retryable status code,
+    bounds every attempt by the timeouts of the transport and by the
+    active :class:`freezerclient.timeouts.Deadline`, waits for the
+    :class:`freezerclient.ratelimit.RateLimiter` of the transport, if any,
+    and goes through its :class:`freezerclient.balancer.LoadBalancer` and
+    :class:`freezerclient.circuit.CircuitBreaker`, if any. Those decisions
+    are taken by :class:`Route` and :class:`Attempts`, which the asyncio
+    transport shares.
+    """
+
+    RETRYABLE_ERRORS = (requests.exceptions.ConnectionError,
+                        requests.exceptions.Timeout)
+
+    retry_policy = None
+    timeout = None
+    circuit_breaker = None
+    balancer = None
+    rate_limiter = None
+
+    def _send(self, method, url, **kwargs):
+        raise NotImplementedError
+
+    def _attempt(self, method, url, **kwargs):
+        route = Route(self, url)
+        if not route.open():
+            return route.reject(method, **kwargs)
+        try:
+            response = self._send(method, route.url, **kwargs)
+        except Exception:
+            route.failed()
+            raise
+        route.succeeded(response)
+        return response
+
+    def request(self, method, url, **kwargs):
+        attempts = Attempts(self, method, url)
+        while True:
+            delay = attempts.next()
+            if delay:
+                time.sleep(delay)
+            timeout = attempts.timeout()
+            if timeout is not None:
+                kwargs['timeout'] = timeout
+            try:
+                response = self._attempt(method, url, **kwargs)
+            except self.RETRYABLE_ERRORS as err:
+                delay = attempts.failed(err)
+                if delay is None:
+                    raise
+            else:
+                delay = attempts.succeeded(response)
+                if delay is None:
+                    return response
+            time.sleep(delay)
+
+    def get(self, url, **kwargs):
+        return self.request('GET', url, **kwargs)
+
+    def post(self, url, **kwargs):
+        return self.request('POST', url, **kwargs)
+
+    def put(self, url, **kwargs):
+        return self.request('PUT', url, **kwargs)
+
+    def patch(self, url, **kwargs):
+        return self.request('PATCH', url, **kwargs)
+
+    def delete(self, url, **kwargs):
+        return self.request('DELETE', url, **kwargs)
+
+    def close(self):
+        pass
+
+
+class HTTPTransport(BaseTransport):
+    """Pooled, keep-alive HTTP transport shared by the managers of a client.
+
+    Every manager of a :class:`freezerclient.v2.client.Client` sends its
+    requests through the same transport, so TCP and TLS connections to
+    freezer-api are reused across calls instead of being opened for
+    every single request.
+    """
+
+    def __init__(self, pool_connections=DEFAULT_POOL_CONNECTIONS,
+                 pool_maxsize=DEFAULT_POOL_MAXSIZE, pool_block=False,
+                 keep_alive=True, retry_policy=None, timeout=None,
+                 circuit_breaker=None, balancer=None, rate_limiter=None):
+        """
+        :param pool_connections: number of per-host connection pools to keep
+        :param pool_maxsize: maximum number of connections kept per host
+        :param pool_block: whether to wait for a free connection when the
+                           pool of a host is exhausted instead of opening
+                           a throwaway one
+        :param keep_alive: whether connections are kept open between
+                           requests
+        :param retry_policy: freezerclient.retry.RetryPolicy (optional,
+                             requests are sent once by default)
+        :param timeout: (connect, read) timeouts in seconds, either may be
+                        None (optional, no timeout by default)
+        :param circuit_breaker: freezerclient.circuit.CircuitBreaker
+                                (optional)
+        :param balancer: freezerclient.balancer.LoadBalancer spreading the
+                         requests across several endpoints (optional)
+        :param rate_limiter: freezerclient.ratelimit.RateLimiter (optional)
+        """
+        self.retry_policy = retry_policy
+        self.timeout = timeout
+        self.circuit_breaker = circuit_breaker
+        self.balancer = balancer
+        self.rate_limiter = rate_limiter
+        self.pool_connections = pool_connections
+        self.pool_maxsize = pool_maxsize
+        self.pool_block = pool_block
+        self.keep_alive = keep_alive
+
+        self.session = requests.Session()
+        adapter = adapters.HTTPAdapter(pool_connections=pool_connections,
+                                       pool_maxsize=pool_maxsize,
+                                       pool_block=pool_block)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+        if not keep_alive:
+            self.session.headers['Connection'] = 'close'
+
+    def _send(self, method, url, **kwargs):
+        return self.session.request(method, url, **kwargs)
+
+    def close(self):
+        """Close every pooled connection."""
+        self.session.close()
+
+
+class AdapterTransport(BaseTransport):
+    """Transport sending requests through a keystoneauth Adapter.
+
+    The adapter is bound to the given keystoneauth session, so the
+    connection pool, the TLS settings, endpoint discovery, re-authentication
+    on 401 and request-id logging are all handled by keystoneauth.
+    """
+
+    RETRYABLE_ERRORS = (ksa_exceptions.RetriableConnectionFailure,)
+
+    def __init__(self, session, service_type, interface=None,
+                 region_name=None, endpoint_override=None,
+                 retry_policy=None, timeout=None, circuit_breaker=None,
+                 balancer=None, rate_limiter=None):
+        """
+        :param session: keystoneauth1.session.Session
+        :param service_type: catalog type of the freezer service
+        :param interface: endpoint interface (public, internal, admin)
+        :param region_name: region of the endpoint
+        :param endpoint_override: freezer-api endpoint to use instead of
+                                  the one found in the service catalog
+        :param retry_policy: freezerclient.retry.RetryPolicy (optional,
+                             requests are sent once by default)
+        :param timeout: (connect, read) timeouts in seconds, either may be
+                        None (optional, no timeout by default)
+        :param circuit_breaker: freezerclient.circuit.CircuitBreaker
+                                (optional)
+        :param balancer: freezerclient.balancer.LoadBalancer spreading the
+                         requests across several endpoints (optional)
+        :param rate_limiter: freezerclient.ratelimit.RateLimiter (optional)
+        """
+        self.retry_policy = retry_policy
+        self.timeout = timeout
+        self.circuit_breaker = circuit_breaker
+        self.balancer = balancer
+        self.rate_limiter = rate_limiter
+        self.adapter = ksa_adapter.Adapter(
+            session,
+            service_type=service_type,
+            interface=interface,
+            region_name=region_name,
+            endpoint_override=endpoint_override,
+            logger=LOG,
+            raise_exc=False)
+
+    def get_endpoint(self):
+        return self.adapter.get_endpoint()
+
+    def _send(self, method, url, **kwargs):
+        # Let keystoneauth inject the token, so that it can re-authenticate
+        # and retry when the token is rejected, and use the TLS settings of
+        # the session rather than the ones of the managers.
+        headers = dict(kwargs.pop('headers', None) or {})
+        headers.pop('X-Auth-Token', None)
+        kwargs.pop('verify', None)
+        return self.adapter.request(url, method, headers=headers, **kwargs)
@@ -13,8 +13,13 @@
 # limitations under the License.
 
 
+import collections
+from concurrent import futures
+import itertools
 import logging
 import os
+import sys
+import threading
 
 from oslo_serialization import jsonutils as json
 from oslo_utils import importutils
@@ -96,6 +101,14 @@ class Namespace(dict):
 
 
 class CachedProperty(object):
+    """Property computed on first access, then stored on the instance.
+
+    The computation runs once even when several threads read the property
+    of a fresh instance at the same time: the others wait for it. Every
+    instance has its own lock per property, so that instances never wait
+    for each other.
+    """
+
     def __init__(self, func):
         self.__doc__ = getattr(func, '__doc__')
         self.func = func
@@ -103,10 +116,80 @@ class CachedProperty(object):
     def __get__(self, obj, cls):
         if obj is None:
             return self
-        value = obj.__dict__[self.func.__name__] = self.func(obj)
+        name = self.func.__name__
+        # setdefault is atomic, so racing threads end up with the same lock
+        lock = obj.__dict__.setdefault('_lock_' + name, threading.RLock())
+        with lock:
+            if name in obj.__dict__:
+                return obj.__dict__[name]
+            value = obj.__dict__[name] = self.func(obj)
         return value
 
 
+def run_ahead(func, args, concurrency):
+    """Lazily yield func(*a) for each tuple a of args, in order.
+
+    Up to concurrency calls are kept running ahead of the consumer on a
+    thread pool. Closing the returned generator cancels the calls that
+    have not started yet.
+
+    :param func: callable to run
+    :param args: iterable of argument tuples
+    :param concurrency: maximum number of calls in flight
+    :return: generator of results
+    """
+    args = iter(args)
+    executor = futures.ThreadPoolExecutor(max_workers=int(concurrency))
+    in_flight = collections.deque()
+
+    def submit(count):
+        for a in itertools.islice(args, count):
+            in_flight.append(executor.submit(func, *a))
+
+    try:
+        submit(int(concurrency))
+        while in_flight:
+            result = in_flight.popleft().result()
+            submit(1)
+            yield result
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+def run_as_completed(func, args, concurrency):
+    """Lazily yield (index, func(*a)) for each tuple a of args, as they end.
+
+    Unlike run_ahead, a new call starts as soon as any call in flight
+    finishes, so a slow call does not hold back the others. The index is
+    the position of the arguments in args, for the caller to restore their
+    order. Closing the returned generator cancels the calls that have not
+    started yet.
+
+    :param func: callable to run
+    :param args: iterable of argument tuples
+    :param concurrency: maximum number of calls in flight
+    :return: generator of (index, result) tuples, in completion order
+    """
+    args = enumerate(args)
+    executor = futures.ThreadPoolExecutor(max_workers=int(concurrency))
+    in_flight = {}
+
+    def submit(count):
+        for index, a in itertools.islice(args, count):
+            in_flight[executor.submit(func, *a)] = index
+
+    try:
+        submit(int(concurrency))
+        while in_flight:
+            done, _ = futures.wait(in_flight,
+                                   return_when=futures.FIRST_COMPLETED)
+            submit(len(done))
+            for future in done:
+                yield in_flight.pop(future), future.result()
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
 def doc_from_json_file(path_to_file):
     """Build a json from a file in the file system
     :param path_to_file: path to file
@@ -120,6 +203,51 @@ def doc_from_json_file(path_to_file):
             raise Exception('Unable to load conf file. {0}'.format(err))
 
 
+def lines_from_file(path_to_file):
+    """Lazily yield the numbered lines of a file.
+
+    Blank lines and lines starting with # are skipped.
+
+    :param path_to_file: path to file, - for the standard input
+    :return: generator of (line number, stripped line)
+    """
+    if path_to_file == '-':
+        lines = sys.stdin
+    else:
+        lines = open(path_to_file)
+    try:
+        for number, line in enumerate(lines, 1):
+            line = line.strip()
+            if line and not line.startswith('#'):
+                yield number, line
+    finally:
+        if lines is not sys.stdin:
+            lines.close()
+
+
+def ids_from_file(path_to_file):
+    """Lazily yield the ids listed in a file, one per line.
+
+    :param path_to_file: path to file, - for the standard input
+    :return: generator of ids
+    """
+    return (line for _, line in lines_from_file(path_to_file))
+
+
+def files_from_dir(path_to_dir, suffix='.json'):
+    """Lazily yield the content of the files of a directory, in name order
+
+    :param path_to_dir: path to directory
+    :param suffix: suffix of the files to read (optional, default .json)
+    :return: generator of (file name, content)
+    """
+    for name in sorted(os.listdir(path_to_dir)):
+        path = os.path.join(path_to_dir, name)
+        if name.endswith(suffix) and os.path.isfile(path):
+            with open(path) as fd:
+                yield name, fd.read()
+
+
 def create_headers_for_request(token):
     """Create a header dict to be passed to the api.
 
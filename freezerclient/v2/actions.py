@@ -101,16 +101,38 @@ class ActionList(base.FreezerLister):
             default='',
             help='Define a filter for the query',
         )
+
+        parser.add_argument(
+            '--all',
+            dest='all',
+            action='store_true',
+            help='Fetch every page of the listing instead of a single one '
+                 'of at most --limit records',
+        )
+
+        parser.add_argument(
+            '--page-size',
+            dest='page_size',
+            default=100,
+            help='Number of records requested per page when using --all',
+        )
         return parser
 
     def take_action(self, parsed_args):
         search = utils.prepare_search(parsed_args.search)
 
-        actions = self.client.actions.list(
-            limit=parsed_args.limit,
-            offset=parsed_args.offset,
-            search=search
-        )
+        if parsed_args.all:
+            actions = self.client.actions.iter_list(
+                page_size=parsed_args.page_size,
+                offset=parsed_args.offset,
+                search=search
+            )
+        else:
+            actions = self.client.actions.list(
+                limit=parsed_args.limit,
+                offset=parsed_args.offset,
+                search=search
+            )
 
         columns = ('Action ID', 'Name', 'Action',
                    'Path to Backup or Restore', 'Mode', 'Storage', 'snapshot')
@@ -153,23 +175,16 @@ class ActionDelete(base.FreezerCommand):
         self.client.actions.delete(parsed_args.action_id)
 
 
-class ActionCreate(base.FreezerShowOne):
-    """Create an action from a file"""
-    def get_parser(self, prog_name):
-        parser = super(ActionCreate, self).get_parser(prog_name)
-        parser.add_argument('--file',
-                            dest='file',
-                            required=True,
-                            help='Path to json file with the action')
-        return parser
+class ActionCreate(base.FreezerCreateOne):
+    """Create actions from a file, a directory or a JSON-lines file"""
+    noun = 'action'
 
     def take_action(self, parsed_args):
+        if not parsed_args.file:
+            return self.create_many(self.client.actions, parsed_args)
         action_data = utils.doc_from_json_file(parsed_args.file)
-        action_id = self.client.actions.create(action_data)
-        action = self.client.actions.get(action_id)
-        if not action:
-            raise exceptions.ApiClientException('Action created but not found')
-        return format_action(action)
+        return format_action(self.create_one(self.client.actions,
+                                             action_data, parsed_args))
 
 
 class ActionUpdate(base.FreezerShowOne):
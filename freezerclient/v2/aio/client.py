@@ -0,0 +1,151 @@
+# (c) Copyright 2026 Cleura AB
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+
+from freezerclient import singleflight
+from freezerclient import utils
+from freezerclient.v2.aio import managers
+from freezerclient.v2.aio import transport
+from freezerclient.v2 import client
+
+
+class Client(client.Client):
+    """Asyncio client for the OpenStack Disaster Recovery v2 API.
+
+    It accepts the same arguments as :class:`freezerclient.v2.client.Client`.
+    The methods of its managers are coroutines returning the same values
+    and raising the same exceptions as the synchronous ones, and the
+    listings are walked with asynchronous generators::
+
+        async with Client(session=sess) as freezer:
+            job = await freezer.jobs.get(job_id)
+            async for backup in freezer.backups.iter_list():
+                ...
+
+    The HTTP requests are sent with aiohttp. The keystone calls, which
+    are blocking, are run in the default executor of the event loop.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super(Client, self).__init__(*args, **kwargs)
+        if self.use_adapter:
+            raise ValueError('use_adapter is not supported by the asyncio '
+                             'client')
+
+        if self.singleflight is not None:
+            self.singleflight = singleflight.AsyncGroup()
+        self.jobs = managers.JobManager(self, verify=self.verify,
+                                        cache=self.cache,
+                                        singleflight=self.singleflight)
+        self.clients = managers.ClientManager(self, verify=self.verify,
+                                              cache=self.cache,
+                                              singleflight=self.singleflight)
+        self.backups = managers.BackupsManager(
+            self, verify=self.verify, cache=self.cache,
+            singleflight=self.singleflight)
+        self.sessions = managers.SessionManager(
+            self, verify=self.verify, cache=self.cache,
+            singleflight=self.singleflight)
+        self.actions = managers.ActionManager(self, verify=self.verify,
+                                              cache=self.cache,
+                                              singleflight=self.singleflight)
+
+    @utils.CachedProperty
+    def transport(self):
+        return transport.AsyncHTTPTransport(
+            pool_maxsize=self.pool_maxsize,
+            keep_alive=self.keep_alive,
+            retry_policy=self.retry_policy,
+            timeout=self.timeout,
+            circuit_breaker=self.circuit_breaker,
+            balancer=self.load_balancer,
+            rate_limiter=self.rate_limiter)
+
+    async def authenticate(self):
+        """Resolve the endpoint and project outside of the event loop"""
+        await _cached(self, 'endpoint')
+        if not self._project_id:
+            await _cached(self, '_resolved_project_id')
+
+    async def get_auth_token(self):
+        return await asyncio.to_thread(getattr, self, 'auth_token')
+
+    async def get_client_id(self):
+        return await _cached(self, 'client_id')
+
+    def for_region(self, region_name):
+        """Client bound to the backup endpoint of another region
+
+        See :meth:`freezerclient.v2.client.Client.for_region`. The endpoint
+        of the region is looked up outside of the event loop, by the first
+        request of the returned client.
+
+        :param region_name: name of the region
+        :return: RegionClient
+        """
+        return RegionClient(self, region_name)
+
+    async def for_project(self, project_id):
+        """Coroutine returning a client scoped to another project
+
+        See :meth:`freezerclient.v2.client.Client.for_project`. The token
+        is rescoped outside of the event loop.
+
+        :param project_id: id of the project
+        :return: ProjectClient
+        """
+        scoped_session = await asyncio.to_thread(self.scoped_session,
+                                                 project_id)
+        return ProjectClient(self, project_id, scoped_session)
+
+    async def close(self):
+        """Stop the background threads and close the pooled connections"""
+        if self.token_refresher:
+            await asyncio.to_thread(self.token_refresher.stop)
+        if self.load_balancer:
+            self.load_balancer.close()
+        if 'transport' in self.__dict__:
+            await self.transport.close()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.close()
+
+
+async def _cached(obj, name):
+    """Read the CachedProperty name of obj, computing it in a thread"""
+    if name not in obj.__dict__:
+        await asyncio.to_thread(getattr, obj, name)
+    return obj.__dict__[name]
+
+
+class RegionClient(client.RegionClient):
+    """Asyncio view of a client bound to the backup endpoint of a region"""
+
+    async def authenticate(self):
+        await self.client.authenticate()
+        await _cached(self, 'endpoint')
+
+
+class ProjectClient(client.ProjectClient):
+    """Asyncio view of a client scoped to another project"""
+
+    async def get_auth_token(self):
+        return await asyncio.to_thread(getattr, self, 'auth_token')
+
+    async def get_client_id(self):
+        return await _cached(self, 'client_id')
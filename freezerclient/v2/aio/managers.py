@@ -0,0 +1,574 @@
+# (c) Copyright 2026 Cleura AB
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+import collections
+import functools
+import itertools
+
+from oslo_serialization import jsonutils as json
+
+from freezerclient import cache as doc_cache
+from freezerclient import exceptions
+from freezerclient import ratelimit
+from freezerclient import singleflight
+from freezerclient import timeouts
+from freezerclient import utils
+from freezerclient.v2.managers import backups
+from freezerclient.v2.managers import base
+
+
+async def _run_ahead(func, args, concurrency):
+    """Asynchronous flavour of freezerclient.utils.run_ahead"""
+    args = iter(args)
+    in_flight = collections.deque()
+
+    def submit(count):
+        for a in itertools.islice(args, count):
+            in_flight.append(asyncio.ensure_future(func(*a)))
+
+    try:
+        submit(max(int(concurrency), 1))
+        while in_flight:
+            result = await in_flight.popleft()
+            submit(1)
+            yield result
+    finally:
+        for task in in_flight:
+            task.cancel()
+
+
+class BaseManager(base.BaseManager):
+    """Base class of the asyncio managers.
+
+    The methods mirror the ones of the synchronous managers, take the same
+    arguments and return the same values, but are coroutines. Listings are
+    walked with asynchronous generators.
+    """
+
+    async def _endpoint(self):
+        await self.client.authenticate()
+        return self.endpoint
+
+    async def _headers(self):
+        token = await self.client.get_auth_token()
+        return utils.create_headers_for_request(token)
+
+    async def _coalesce(self, read, url, headers, params=None, data=None):
+        if self.singleflight is None:
+            return await read()
+        key = singleflight.request_key('GET', url,
+                                       headers.get('X-Auth-Token'),
+                                       params, data)
+        return await self.singleflight.do(key, read)
+
+    async def _get_document(self, doc_id):
+        endpoint = await self._endpoint() + doc_id
+        if self.cache is not None:
+            doc = self.cache.lookup(endpoint)
+            if doc is not doc_cache.MISS:
+                return doc
+        headers = await self._headers()
+        return await self._coalesce(
+            functools.partial(self._fetch_document, endpoint, headers),
+            endpoint, headers)
+
+    async def _fetch_document(self, endpoint, headers):
+        if self.cache is None:
+            return self._read_document(await self.transport.get(
+                endpoint, headers=headers, verify=self.verify))
+        try:
+            r = await self.transport.get(
+                endpoint, verify=self.verify,
+                headers=dict(headers,
+                             **self.cache.conditional_headers(endpoint)))
+        except exceptions.CircuitOpenError:
+            doc = self.cache.stale(endpoint)
+            if doc is doc_cache.MISS:
+                raise
+            return doc
+        if r.status_code == 304:
+            doc = self.cache.refresh(endpoint, self.resource_name)
+            if doc is not doc_cache.MISS:
+                return doc
+            # The cached copy was evicted while revalidating it
+            r = await self.transport.get(endpoint, headers=headers,
+                                         verify=self.verify)
+        doc = self._read_document(r)
+        validators = None
+        if doc is not None:
+            validators = doc_cache.response_validators(r, doc)
+        self.cache.store(endpoint, doc, self.resource_name, validators)
+        return doc
+
+    async def _list_page(self, query, data=None):
+        endpoint = await self._endpoint()
+        headers = await self._headers()
+
+        async def read():
+            r = await self.transport.get(endpoint, headers=headers,
+                                         params=query, data=data,
+                                         verify=self.verify)
+            if r.status_code != 200:
+                raise exceptions.ApiClientException(r)
+            return r.json()[self.resource_name]
+
+        return await self._coalesce(read, endpoint, headers, query, data)
+
+    @staticmethod
+    async def _iter_pages(list_page, page_size=base.DEFAULT_PAGE_SIZE,
+                          max_items=None, offset=0, concurrency=1,
+                          deadline=None, **kwargs):
+        list_page = timeouts.bounded_async(list_page,
+                                           deadline or timeouts.current())
+        slices = base._page_slices(int(page_size), max_items, int(offset))
+        in_flight = collections.deque()
+
+        def submit(count):
+            for page_offset, limit in itertools.islice(slices, count):
+                in_flight.append((limit, asyncio.ensure_future(
+                    list_page(limit=limit, offset=page_offset, **kwargs))))
+
+        try:
+            submit(max(int(concurrency), 1))
+            while in_flight:
+                limit, task = in_flight.popleft()
+                page = await task
+                if len(page) >= limit:
+                    submit(1)
+                for record in page[:limit]:
+                    yield record
+                if len(page) < limit:
+                    return
+        finally:
+            for _, task in in_flight:
+                task.cancel()
+
+    @staticmethod
+    async def _bulk(func, items, concurrency=base.DEFAULT_BULK_CONCURRENCY,
+                    rate=None, on_progress=None, deadline=None):
+        bucket = ratelimit.TokenBucket(rate) if rate else None
+        func = timeouts.bounded_async(func, deadline or timeouts.current())
+        # the workers share one iterator, so that the items are consumed
+        # lazily
+        items = enumerate(items)
+        results = {}
+
+        async def worker():
+            for index, item in items:
+                try:
+                    if bucket is not None:
+                        await asyncio.sleep(bucket.reserve())
+                    result = base.BulkResult(item, await func(item), None)
+                except Exception as err:
+                    result = base.BulkResult(item, None, err)
+                results[index] = result
+                if on_progress is not None:
+                    on_progress(len(results), result)
+
+        await asyncio.gather(*(worker() for _ in range(
+            max(int(concurrency), 1))))
+        return [results[index] for index in range(len(results))]
+
+    async def delete_many(self, ids, concurrency=base.DEFAULT_BULK_CONCURRENCY,
+                          rate=None, on_progress=None, deadline=None):
+        return await self._bulk(self.delete, ids, concurrency, rate,
+                                on_progress, deadline)
+
+    async def create_many(self, docs,
+                          concurrency=base.DEFAULT_BULK_CONCURRENCY,
+                          rate=None, on_progress=None, fetch=False,
+                          deadline=None):
+        async def create(doc):
+            doc_id = await self.create(doc)
+            if not fetch:
+                return doc_id
+            created = await self.get(doc_id)
+            if not created:
+                raise exceptions.ApiClientException(
+                    'Document {0} created but not found'.format(doc_id))
+            return created
+
+        return await self._bulk(create, docs, concurrency, rate, on_progress,
+                                deadline)
+
+
+class JobManager(BaseManager):
+    resource_name = 'jobs'
+    id_key = 'job_id'
+
+    async def create(self, doc, job_id='', return_document=False):
+        job_id = job_id or doc.get('job_id', '')
+        endpoint = await self._endpoint() + job_id
+        if not doc.get('client_id'):
+            doc['client_id'] = await self.client.get_client_id()
+        r = await self.transport.post(endpoint,
+                                      data=json.dumps(doc),
+                                      headers=await self._headers(),
+                                      verify=self.verify)
+        if r.status_code != 201:
+            raise exceptions.ApiClientException(r)
+        job_id = r.json()['job_id']
+        self._invalidate(job_id)
+        if return_document:
+            return self._created_document(job_id, doc)
+        return job_id
+
+    async def delete(self, job_id):
+        endpoint = await self._endpoint() + job_id
+        r = await self.transport.delete(endpoint,
+                                        headers=await self._headers(),
+                                        verify=self.verify)
+        self._invalidate(job_id)
+        if r.status_code != 204:
+            raise exceptions.ApiClientException(r)
+
+    async def list_all(self, limit=10, offset=0, search=None,
+                       all_projects=False):
+        data = json.dumps(search) if search else None
+        query = {
+            'limit': int(limit),
+            'offset': int(offset),
+            'all_projects': all_projects,
+        }
+        return await self._list_page(query, data)
+
+    async def list(self, limit=10, offset=0, search={}, client_id=None,
+                   all_projects=False):
+        client_id = client_id or await self.client.get_client_id()
+        new_search = search.copy()
+        new_search['match'] = list(search.get('match', []))
+        new_search['match'].append({'client_id': client_id})
+        return await self.list_all(limit, offset, new_search, all_projects)
+
+    def iter_list_all(self, page_size=base.DEFAULT_PAGE_SIZE, max_items=None,
+                      offset=0, search=None, all_projects=False,
+                      concurrency=1, deadline=None):
+        return self._iter_pages(self.list_all, page_size, max_items, offset,
+                                concurrency, deadline=deadline, search=search,
+                                all_projects=all_projects)
+
+    async def iter_list(self, page_size=base.DEFAULT_PAGE_SIZE,
+                        max_items=None, offset=0, search={}, client_id=None,
+                        all_projects=False, concurrency=1, deadline=None):
+        client_id = client_id or await self.client.get_client_id()
+        new_search = search.copy()
+        new_search['match'] = list(search.get('match', []))
+        new_search['match'].append({'client_id': client_id})
+        async for job in self.iter_list_all(page_size, max_items, offset,
+                                            new_search, all_projects,
+                                            concurrency, deadline):
+            yield job
+
+    async def get(self, job_id):
+        return await self._get_document(job_id)
+
+    async def update(self, job_id, update_doc, return_document=False):
+        endpoint = await self._endpoint() + job_id
+        previous = self._cached(job_id) if return_document else None
+        r = await self.transport.patch(endpoint,
+                                       headers=await self._headers(),
+                                       data=json.dumps(update_doc),
+                                       verify=self.verify)
+        self._invalidate(job_id)
+        if r.status_code != 200:
+            raise exceptions.ApiClientException(r)
+        version = r.json()['version']
+        if not return_document:
+            return version
+        if previous is None:
+            # Only freezer-api knows the fields that were not updated
+            return await self.get(job_id)
+        return self._updated_document(job_id, previous, update_doc,
+                                      version)
+
+    async def _send_event(self, job_id, event):
+        # endpoint /v2/jobs/{job_id}/event
+        endpoint = '{0}{1}/event'.format(await self._endpoint(), job_id)
+        r = await self.transport.post(endpoint,
+                                      headers=await self._headers(),
+                                      data=json.dumps({event: None}),
+                                      verify=self.verify)
+        self._invalidate(job_id)
+        if r.status_code != 202:
+            raise exceptions.ApiClientException(r)
+        return r.json()
+
+    async def start_job(self, job_id):
+        return await self._send_event(job_id, 'start')
+
+    async def stop_job(self, job_id):
+        return await self._send_event(job_id, 'stop')
+
+    async def abort_job(self, job_id):
+        return await self._send_event(job_id, 'abort')
+
+    async def _signal_many(self, signal, job_ids, search, concurrency, rate,
+                           on_progress, deadline):
+        if job_ids is None:
+            if search is None:
+                raise ValueError('Either job ids or a search is required')
+            job_ids = [job['job_id'] async for job in
+                       self.iter_list_all(search=search,
+                                          deadline=deadline)]
+        return await self._bulk(signal, job_ids, concurrency, rate,
+                                on_progress, deadline)
+
+    async def start_jobs(self, job_ids=None, search=None,
+                         concurrency=base.DEFAULT_BULK_CONCURRENCY,
+                         rate=None, on_progress=None, deadline=None):
+        return await self._signal_many(self.start_job, job_ids, search,
+                                       concurrency, rate, on_progress,
+                                       deadline)
+
+    async def stop_jobs(self, job_ids=None, search=None,
+                        concurrency=base.DEFAULT_BULK_CONCURRENCY,
+                        rate=None, on_progress=None, deadline=None):
+        return await self._signal_many(self.stop_job, job_ids, search,
+                                       concurrency, rate, on_progress,
+                                       deadline)
+
+    async def abort_jobs(self, job_ids=None, search=None,
+                         concurrency=base.DEFAULT_BULK_CONCURRENCY,
+                         rate=None, on_progress=None, deadline=None):
+        return await self._signal_many(self.abort_job, job_ids, search,
+                                       concurrency, rate, on_progress,
+                                       deadline)
+
+
+class SessionManager(BaseManager):
+    resource_name = 'sessions'
+    id_key = 'session_id'
+
+    async def create(self, doc, session_id='',
+                     return_document=False):
+        session_id = session_id or doc.get('session_id', '')
+        endpoint = await self._endpoint() + session_id
+        r = await self.transport.post(endpoint,
+                                      data=json.dumps(doc),
+                                      headers=await self._headers(),
+                                      verify=self.verify)
+        if r.status_code != 201:
+            raise exceptions.ApiClientException(r)
+        session_id = r.json()['session_id']
+        self._invalidate(session_id)
+        if return_document:
+            return self._created_document(session_id, doc)
+        return session_id
+
+    async def delete(self, session_id):
+        endpoint = await self._endpoint() + session_id
+        r = await self.transport.delete(endpoint,
+                                        headers=await self._headers(),
+                                        verify=self.verify)
+        self._invalidate(session_id)
+        if r.status_code != 204:
+            raise exceptions.ApiClientException(r)
+
+    async def list_all(self, limit=10, offset=0, search=None):
+        data = json.dumps(search) if search else None
+        query = {'limit': int(limit), 'offset': int(offset)}
+        return await self._list_page(query, data)
+
+    async def list(self, limit=10, offset=0, search={}):
+        new_search = search.copy()
+        new_search['match'] = search.get('match', [])
+        return await self.list_all(limit, offset, new_search)
+
+    def iter_list_all(self, page_size=base.DEFAULT_PAGE_SIZE, max_items=None,
+                      offset=0, search=None, concurrency=1, deadline=None):
+        return self._iter_pages(self.list_all, page_size, max_items, offset,
+                                concurrency, deadline=deadline, search=search)
+
+    def iter_list(self, page_size=base.DEFAULT_PAGE_SIZE, max_items=None,
+                  offset=0, search={}, concurrency=1, deadline=None):
+        new_search = search.copy()
+        new_search['match'] = list(search.get('match', []))
+        return self.iter_list_all(page_size, max_items, offset, new_search,
+                                  concurrency, deadline)
+
+    async def get(self, session_id):
+        return await self._get_document(session_id)
+
+    async def update(self, session_id, update_doc, return_document=False):
+        endpoint = await self._endpoint() + session_id
+        previous = self._cached(session_id) if return_document else None
+        r = await self.transport.patch(endpoint,
+                                       headers=await self._headers(),
+                                       data=json.dumps(update_doc),
+                                       verify=self.verify)
+        self._invalidate(session_id)
+        if r.status_code != 200:
+            raise exceptions.ApiClientException(r)
+        version = r.json()['version']
+        if not return_document:
+            return version
+        if previous is None:
+            # Only freezer-api knows the fields that were not updated
+            return await self.get(session_id)
+        return self._updated_document(session_id, previous, update_doc,
+                                      version)
+
+    async def add_job(self, session_id, job_id):
+        # endpoint /v2/sessions/{sessions_id}/jobs/{job_id}
+        endpoint = '{0}{1}/jobs/{2}'.format(await self._endpoint(),
+                                            session_id, job_id)
+        r = await self.transport.put(endpoint,
+                                     headers=await self._headers(),
+                                     verify=self.verify)
+        self._invalidate(session_id)
+        self._invalidate(job_id, 'jobs')
+        if r.status_code != 204:
+            raise exceptions.ApiClientException(r)
+
+    async def remove_job(self, session_id, job_id):
+        # endpoint /v2/sessions/{sessions_id}/jobs/{job_id}
+        endpoint = '{0}{1}/jobs/{2}'.format(await self._endpoint(),
+                                            session_id, job_id)
+        r = await self.transport.delete(endpoint,
+                                        headers=await self._headers(),
+                                        verify=self.verify)
+        self._invalidate(session_id)
+        self._invalidate(job_id, 'jobs')
+        if r.status_code != 204:
+            raise exceptions.ApiClientException(r)
+
+    async def _action(self, session_id, doc):
+        # endpoint /v2/sessions/{sessions_id}/action
+        endpoint = '{0}{1}/action'.format(await self._endpoint(), session_id)
+        r = await self.transport.post(endpoint,
+                                      headers=await self._headers(),
+                                      data=json.dumps(doc),
+                                      verify=self.verify)
+        self._invalidate(session_id)
+        if r.status_code != 202:
+            raise exceptions.ApiClientException(r)
+        return r.json()
+
+    async def start_session(self, session_id, job_id, session_tag):
+        return await self._action(session_id, {"start": {
+            "job_id": job_id,
+            "current_tag": session_tag
+        }})
+
+    async def end_session(self, session_id, job_id, session_tag, result):
+        return await self._action(session_id, {"end": {
+            "job_id": job_id,
+            "current_tag": session_tag,
+            "result": result
+        }})
+
+
+class _SimpleManager(BaseManager):
+    """Resources exposing create, delete, list and get only"""
+
+    async def create(self, doc, return_document=False):
+        r = await self.transport.post(await self._endpoint(),
+                                      data=json.dumps(doc),
+                                      headers=await self._headers(),
+                                      verify=self.verify)
+        if r.status_code != 201:
+            raise exceptions.ApiClientException(r)
+        resource_id = r.json()[self.id_key]
+        self._invalidate(resource_id)
+        if return_document:
+            return self._created_document(resource_id, doc)
+        return resource_id
+
+    async def delete(self, resource_id):
+        endpoint = await self._endpoint() + resource_id
+        r = await self.transport.delete(endpoint,
+                                        headers=await self._headers(),
+                                        verify=self.verify)
+        self._invalidate(resource_id)
+        if r.status_code != 204:
+            raise exceptions.ApiClientException(r)
+
+    async def list(self, limit=10, offset=0, search=None):
+        data = json.dumps(search) if search else None
+        query = {'limit': int(limit), 'offset': int(offset)}
+        return await self._list_page(query, data)
+
+    def iter_list(self, page_size=base.DEFAULT_PAGE_SIZE, max_items=None,
+                  offset=0, search=None, concurrency=1, deadline=None):
+        return self._iter_pages(self.list, page_size, max_items, offset,
+                                concurrency, deadline=deadline, search=search)
+
+    async def get(self, resource_id):
+        return await self._get_document(resource_id)
+
+
+class BackupsManager(_SimpleManager):
+    resource_name = 'backups'
+    id_key = 'backup_id'
+
+    def _created_document(self, backup_id, backup_metadata):
+        return {'backup_id': backup_id,
+                'backup_uuid': backup_id,
+                'backup_metadata': backup_metadata}
+
+    def scan(self, time_after, time_before=None,
+             window=backups.DEFAULT_SCAN_WINDOW,
+             page_size=base.DEFAULT_PAGE_SIZE, search=None,
+             concurrency=backups.DEFAULT_SCAN_CONCURRENCY, deadline=None):
+        windows = backups._scan_windows(time_after, time_before, window)
+
+        async def scan_window(after, before):
+            window_search = dict(search or {})
+            window_search.update(time_after=after, time_before=before)
+            return sorted([backup async for backup in self.iter_list(
+                page_size=page_size, search=window_search)],
+                key=backups._time_stamp)
+
+        scan_window = timeouts.bounded_async(scan_window,
+                                             deadline or timeouts.current())
+
+        async def scan():
+            async for window_backups in _run_ahead(scan_window, windows,
+                                                   concurrency):
+                for backup in window_backups:
+                    yield backup
+        return scan()
+
+
+class ClientManager(_SimpleManager):
+    resource_name = 'clients'
+    id_key = 'client_id'
+
+    def _created_document(self, client_id, client_info):
+        return {'client_id': client_id, 'client': client_info}
+
+
+class ActionManager(_SimpleManager):
+    resource_name = 'actions'
+    id_key = 'action_id'
+
+    async def update(self, action_id, update_doc, return_document=False):
+        endpoint = await self._endpoint() + action_id
+        previous = self._cached(action_id) if return_document else None
+        r = await self.transport.patch(endpoint,
+                                       headers=await self._headers(),
+                                       data=json.dumps(update_doc),
+                                       verify=self.verify)
+        self._invalidate(action_id)
+        if r.status_code != 200:
+            raise exceptions.ApiClientException(r)
+        version = r.json()['version']
+        if not return_document:
+            return version
+        if previous is None:
+            # Only freezer-api knows the fields that were not updated
+            return await self.get(action_id)
+        return self._updated_document(action_id, previous, update_doc,
+                                      version)
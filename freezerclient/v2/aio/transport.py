@@ -0,0 +1,172 @@
+# (c) Copyright 2026 Cleura AB
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+import logging
+import ssl
+
+from oslo_serialization import jsonutils as json
+from oslo_utils import importutils
+from requests import structures
+
+from freezerclient import transport
+
+aiohttp = importutils.try_import('aiohttp')
+
+LOG = logging.getLogger(__name__)
+
+
+class Response(object):
+    """Fully read HTTP response returned by the asyncio transport.
+
+    It exposes the subset of ``requests.Response`` used by the managers
+    and by :class:`freezerclient.exceptions.ApiClientException`.
+    """
+
+    def __init__(self, status_code, headers, content):
+        self.status_code = status_code
+        self.headers = headers
+        self.content = content
+
+    @property
+    def text(self):
+        return self.content.decode('utf-8', 'replace')
+
+    def json(self):
+        return json.loads(self.text)
+
+
+class AsyncHTTPTransport(object):
+    """Pooled, keep-alive asyncio HTTP transport based on aiohttp.
+
+    It must be created and used from within a running event loop.
+    """
+
+    def __init__(self, pool_maxsize=transport.DEFAULT_POOL_MAXSIZE,
+                 pool_limit=None, keep_alive=True, retry_policy=None,
+                 timeout=None, circuit_breaker=None, balancer=None,
+                 rate_limiter=None):
+        """
+        :param pool_maxsize: maximum number of connections kept per host
+        :param pool_limit: maximum number of connections overall
+                           (optional, unlimited by default)
+        :param keep_alive: whether connections are kept open between
+                           requests
+        :param retry_policy: freezerclient.retry.RetryPolicy (optional,
+                             requests are sent once by default)
+        :param timeout: (connect, read) timeouts in seconds, either may be
+                        None (optional, no timeout by default)
+        :param circuit_breaker: freezerclient.circuit.CircuitBreaker
+                                (optional)
+        :param balancer: freezerclient.balancer.LoadBalancer spreading the
+                         requests across several endpoints (optional)
+        :param rate_limiter: freezerclient.ratelimit.RateLimiter (optional)
+        """
+        if aiohttp is None:
+            raise ImportError('aiohttp is required by the asyncio client, '
+                              'install python-freezerclient[aio]')
+        connector = aiohttp.TCPConnector(limit=pool_limit or 0,
+                                         limit_per_host=pool_maxsize,
+                                         force_close=not keep_alive)
+        self.session = aiohttp.ClientSession(connector=connector)
+        self.retry_policy = retry_policy
+        self.timeout = timeout
+        self.circuit_breaker = circuit_breaker
+        self.balancer = balancer
+        self.rate_limiter = rate_limiter
+        self._ssl_contexts = {}
+
+    def _ssl(self, verify):
+        if verify is False:
+            return False
+        if not isinstance(verify, str):
+            return True
+        if verify not in self._ssl_contexts:
+            self._ssl_contexts[verify] = ssl.create_default_context(
+                cafile=verify)
+        return self._ssl_contexts[verify]
+
+    async def _attempt(self, method, url, **kwargs):
+        route = transport.Route(self, url)
+        if not route.open():
+            return route.reject(method, **kwargs)
+        try:
+            response = await self._send(method, route.url, **kwargs)
+        except Exception:
+            route.failed()
+            raise
+        route.succeeded(response)
+        return response
+
+    async def request(self, method, url, **kwargs):
+        attempts = transport.Attempts(self, method, url)
+        while True:
+            delay = attempts.next()
+            if delay:
+                await asyncio.sleep(delay)
+            try:
+                response = await self._attempt(method, url,
+                                               timeout=attempts.timeout(),
+                                               **kwargs)
+            except (aiohttp.ClientConnectionError,
+                    asyncio.TimeoutError) as err:
+                delay = attempts.failed(err)
+                if delay is None:
+                    raise
+            else:
+                delay = attempts.succeeded(response)
+                if delay is None:
+                    return response
+            await asyncio.sleep(delay)
+
+    async def _send(self, method, url, headers=None, params=None,
+                    data=None, verify=None, timeout=None):
+        if params:
+            # stringify the values the same way requests does
+            params = {k: str(v) for k, v in params.items()}
+        if isinstance(timeout, tuple):
+            connect, read = timeout
+            timeout = aiohttp.ClientTimeout(
+                total=None, sock_connect=connect, sock_read=read)
+        else:
+            # Without a timeout, wait as long as requests does rather than
+            # the 5 minutes aiohttp waits by default
+            timeout = aiohttp.ClientTimeout(total=timeout)
+        async with self.session.request(method, url, headers=headers,
+                                        params=params, data=data,
+                                        ssl=self._ssl(verify),
+                                        timeout=timeout) as r:
+            content = await r.read()
+            return Response(r.status,
+                            structures.CaseInsensitiveDict(r.headers),
+                            content)
+
+    async def get(self, url, **kwargs):
+        return await self.request('GET', url, **kwargs)
+
+    async def post(self, url, **kwargs):
+        return await self.request('POST', url, **kwargs)
+
+    async def put(self, url, **kwargs):
+        return await self.request('PUT', url, **kwargs)
+
+    async def patch(self, url, **kwargs):
+        return await self.request('PATCH', url, **kwargs)
+
+    async def delete(self, url, **kwargs):
+        return await self.request('DELETE', url, **kwargs)
+
+    async def close(self):
+        """Close every pooled connection."""
+        await self.session.close()
@@ -13,17 +13,48 @@
 # limitations under the License.
 
 import datetime
+import itertools
 import logging
+import os
 import pprint
 
 from freezerclient import base
 from freezerclient import exceptions
+from freezerclient import replica
 from freezerclient import utils
+from freezerclient.v2 import regions
 
 
 logging = logging.getLogger(__name__)
 
 
+def _time_stamp(backup):
+    return int(backup.get('backup_metadata', {}).get('time_stamp') or 0)
+
+
+def add_replica_argument(parser):
+    parser.add_argument(
+        '--replica',
+        dest='replica',
+        default=os.environ.get('OS_BACKUP_REPLICA', replica.DEFAULT_PATH),
+        help='Path of the local SQLite replica of the backups, '
+             'default {0}'.format(replica.DEFAULT_PATH),
+    )
+
+
+def open_replica(app, parsed_args):
+    """Open the replica of the backups of the cloud and project in use
+
+    The scope of the replica only depends on the options of the command
+    line, so that reading it does not require to authenticate.
+    """
+    options = app.options
+    scope = '|'.join(str(getattr(options, name, None) or '') for name in (
+        'os_auth_url', 'os_backup_url', 'os_region_name', 'os_project_id',
+        'os_project_name'))
+    return replica.BackupReplica(parsed_args.replica, scope)
+
+
 def format_backup(backup):
     column = (
         'Backup ID',
@@ -83,66 +114,298 @@ class BackupList(base.FreezerLister):
             default='',
             help='Define a filter for the query',
         )
+
+        parser.add_argument(
+            '--all',
+            dest='all',
+            action='store_true',
+            help='Fetch every page of the listing instead of a single one '
+                 'of at most --limit records',
+        )
+
+        parser.add_argument(
+            '--page-size',
+            dest='page_size',
+            default=100,
+            help='Number of records requested per page when using --all',
+        )
+
+        parser.add_argument(
+            '--concurrency',
+            dest='concurrency',
+            default=4,
+            type=int,
+            help='Number of pages, or of time windows with --scan-window, '
+                 'fetched in parallel when using --all',
+        )
+
+        parser.add_argument(
+            '--time-after',
+            dest='time_after',
+            default=None,
+            type=int,
+            help='Only list the backups taken at or after this timestamp',
+        )
+
+        parser.add_argument(
+            '--time-before',
+            dest='time_before',
+            default=None,
+            type=int,
+            help='Only list the backups taken at or before this timestamp',
+        )
+
+        parser.add_argument(
+            '--regions',
+            dest='regions',
+            default=None,
+            help='Comma separated list of regions to query concurrently. '
+                 'The backups of every region are merged by creation time '
+                 'and tagged with their region',
+        )
+
+        parser.add_argument(
+            '--scan-window',
+            dest='scan_window',
+            default=None,
+            type=int,
+            help='With --all and --time-after, split the time range in '
+                 'windows of this many seconds that are listed in parallel '
+                 'and merged by creation time',
+        )
+
+        parser.add_argument(
+            '--local',
+            dest='local',
+            action='store_true',
+            help='List the backups of the local replica kept up to date by '
+                 'backup-sync instead of querying the api',
+        )
+        add_replica_argument(parser)
+
+        parser.add_argument(
+            '--hostname',
+            dest='hostname',
+            default=None,
+            help='With --local, only list the backups of this host',
+        )
+
+        parser.add_argument(
+            '--path',
+            dest='path_to_backup',
+            default=None,
+            help='With --local, only list the backups of this path',
+        )
+
+        parser.add_argument(
+            '--level',
+            dest='curr_backup_level',
+            default=None,
+            type=int,
+            help='With --local, only list the backups of this level',
+        )
+
+        parser.add_argument(
+            '--container',
+            dest='container',
+            default=None,
+            help='With --local, only list the backups of this container',
+        )
         return parser
 
     def take_action(self, parsed_args):
-        search = utils.prepare_search(parsed_args.search)
+        filters = {name: getattr(parsed_args, name)
+                   for name in replica.FILTERS}
+        if parsed_args.local:
+            if parsed_args.search or parsed_args.regions:
+                raise exceptions.ApiClientException(
+                    '--search and --regions are not supported with --local')
+        elif any(value is not None for value in filters.values()):
+            raise exceptions.ApiClientException(
+                '--hostname, --path, --level and --container require '
+                '--local')
 
-        backups = self.client.backups.list(limit=parsed_args.limit,
-                                           offset=parsed_args.offset,
-                                           search=search)
+        search = utils.prepare_search(parsed_args.search)
+        if parsed_args.time_after is not None:
+            search['time_after'] = parsed_args.time_after
+        if parsed_args.time_before is not None:
+            search['time_before'] = parsed_args.time_before
 
         columns = ('Backup ID', 'Backup UUID', 'Hostname', 'Path',
                    'Created at', 'Level')
 
-        # Print empty table if no backups found
-        if not backups:
-            backups = [{}]
+        if parsed_args.regions:
+            columns = ('Region',) + columns
+            backups_l = self._list_regions(parsed_args, search)
+        else:
+            if parsed_args.local:
+                backups_l = self._list_local(parsed_args, filters)
+                if not parsed_args.all:
+                    backups_l = list(backups_l)
+            else:
+                backups_l = self._list(self.client.backups, parsed_args,
+                                       search)
+            # Print empty table if no backups found
+            if not parsed_args.all and not backups_l:
+                backups_l = [{}]
 
+        data = (self._row(b, parsed_args.regions) for b in backups_l)
+        return columns, data
+
+    def _list(self, manager, parsed_args, search):
+        scan = parsed_args.scan_window and parsed_args.time_after is not None
+        if parsed_args.all and scan:
+            return manager.scan(parsed_args.time_after,
+                                time_before=parsed_args.time_before,
+                                window=parsed_args.scan_window,
+                                page_size=parsed_args.page_size,
+                                search=search,
+                                concurrency=parsed_args.concurrency)
+        elif parsed_args.all:
+            # Stream the rows in the order returned by the api, sorting
+            # them would require loading the whole listing in memory
+            return manager.iter_list(page_size=parsed_args.page_size,
+                                     offset=parsed_args.offset,
+                                     search=search,
+                                     concurrency=parsed_args.concurrency)
+        backups = manager.list(limit=parsed_args.limit,
+                               offset=parsed_args.offset,
+                               search=search)
         # sort by the time of backup task is created
-        backups_l = sorted(backups,
-                           key=lambda x: x.get('backup_metadata',
-                                               {}).get('time_stamp', ''))
-
-        data = ((b.get('backup_id', ''),
-                 b.get('backup_uuid', ''),
-                 b.get('backup_metadata', {}).get('hostname', ''),
-                 b.get('backup_metadata', {}).get('path_to_backup', ''),
-                 datetime.datetime.fromtimestamp(
-                 int(b.get('backup_metadata', {}).get('time_stamp', '')))
-                 if b.get('backup_metadata') else '',
-                 b.get('backup_metadata', {}).get('curr_backup_level', '')
-                 ) for b in backups_l)
+        return sorted(backups, key=_time_stamp)
+
+    def _list_local(self, parsed_args, filters):
+        limit = None if parsed_args.all else parsed_args.limit
+        with open_replica(self.app, parsed_args) as backups:
+            for backup in backups.iter_list(
+                    limit=limit, offset=parsed_args.offset,
+                    time_after=parsed_args.time_after,
+                    time_before=parsed_args.time_before, **filters):
+                yield backup
+
+    def _list_regions(self, parsed_args, search):
+        def list_region(region_client):
+            return sorted(self._list(region_client.backups, parsed_args,
+                                     search),
+                          key=_time_stamp)
+
+        names = [r.strip() for r in parsed_args.regions.split(',')
+                 if r.strip()]
+        results = regions.fan_out(self.client, names, list_region)
+        failed = [r for r in results if r.error is not None]
+        for result in failed:
+            logging.error('Unable to list the backups of region %s: %s',
+                          result.region, result.error)
+        if len(failed) == len(results):
+            raise failed[0].error
+        return regions.merge(results, key=_time_stamp)
+
+    @staticmethod
+    def _row(b, with_region):
+        metadata = b.get('backup_metadata', {})
+        row = (b.get('backup_id', ''),
+               b.get('backup_uuid', ''),
+               metadata.get('hostname', ''),
+               metadata.get('path_to_backup', ''),
+               datetime.datetime.fromtimestamp(
+                   int(metadata.get('time_stamp', ''))) if metadata else '',
+               metadata.get('curr_backup_level', ''))
+        if with_region:
+            return (b.get('region', ''),) + row
+        return row
 
-        return columns, data
+
+class BackupSync(base.FreezerShowOne):
+    """Update the local replica of the backups used by backup-list --local
+
+    Only the backups taken since the last sync are fetched, unless --full
+    is given.
+    """
+    def get_parser(self, prog_name):
+        parser = super(BackupSync, self).get_parser(prog_name)
+        add_replica_argument(parser)
+        parser.add_argument(
+            '--full',
+            dest='full',
+            action='store_true',
+            help='Drop the replica and fetch every backup again, to catch '
+                 'up with the backups deleted from the api',
+        )
+        parser.add_argument(
+            '--page-size',
+            dest='page_size',
+            default=100,
+            type=int,
+            help='Number of records requested per page',
+        )
+        parser.add_argument(
+            '--concurrency',
+            dest='concurrency',
+            default=4,
+            type=int,
+            help='Number of pages fetched in parallel',
+        )
+        return parser
+
+    def take_action(self, parsed_args):
+        with open_replica(self.app, parsed_args) as backups:
+            fetched = backups.sync(self.client.backups,
+                                   full=parsed_args.full,
+                                   page_size=parsed_args.page_size,
+                                   concurrency=parsed_args.concurrency)
+            watermark = backups.watermark
+            return (('Fetched', 'Replicated', 'Latest backup'),
+                    (fetched, len(backups),
+                     datetime.datetime.fromtimestamp(watermark)
+                     if watermark is not None else ''))
 
 
 class BackupDelete(base.FreezerCommand):
-    """Delete a backup from the api"""
+    """Delete one or several backups from the api"""
     def get_parser(self, prog_name):
         parser = super(BackupDelete, self).get_parser(prog_name)
         parser.add_argument(dest='backup_uuid',
+                            nargs='*',
                             help='UUID of the backup')
+        parser.add_argument('--from-file',
+                            dest='from_file',
+                            default=None,
+                            help='File listing the UUIDs of the backups to '
+                                 'delete, one per line, - for the standard '
+                                 'input')
+        base.add_bulk_arguments(parser)
         return parser
 
     def take_action(self, parsed_args):
-        self.client.backups.delete(parsed_args.backup_uuid)
+        ids = parsed_args.backup_uuid
+        if not ids and not parsed_args.from_file:
+            raise exceptions.ApiClientException(
+                'At least one backup UUID or --from-file is required')
+        if len(ids) == 1 and not parsed_args.from_file:
+            self.client.backups.delete(ids[0])
+            return
+        if parsed_args.from_file:
+            ids = itertools.chain(ids,
+                                  utils.ids_from_file(parsed_args.from_file))
+        results = self.client.backups.delete_many(
+            ids, **base.bulk_options(self.app, parsed_args))
+        failed = [r for r in results if r.error is not None]
+        for result in failed:
+            logging.error('Unable to delete backup %s: %s',
+                          result.item, result.error)
+        if failed:
+            raise exceptions.ApiClientException(
+                '{0} of {1} backups could not be deleted'.format(
+                    len(failed), len(results)))
 
 
-class BackupCreate(base.FreezerShowOne):
-    """Create an backup from a file"""
-    def get_parser(self, prog_name):
-        parser = super(BackupCreate, self).get_parser(prog_name)
-        parser.add_argument('--file',
-                            dest='file',
-                            required=True,
-                            help='Path to json file with the backup')
-        return parser
+class BackupCreate(base.FreezerCreateOne):
+    """Create backups from a file, a directory or a JSON-lines file"""
+    noun = 'backup'
 
     def take_action(self, parsed_args):
+        if not parsed_args.file:
+            return self.create_many(self.client.backups, parsed_args)
         backup_metadata = utils.doc_from_json_file(parsed_args.file)
-        backup_id = self.client.backups.create(backup_metadata)
-        backup = self.client.backups.get(backup_id)
-        if not backup:
-            raise exceptions.ApiClientException('Backup created but not found')
-        return format_backup(backup)
+        return format_backup(self.create_one(self.client.backups,
+                                             backup_metadata, parsed_args))
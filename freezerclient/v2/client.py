@@ -12,10 +12,19 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import collections
 import socket
 
+from keystoneauth1 import identity
 from keystoneauth1 import loading as kaloading
+from keystoneauth1 import session as ksa_session
 
+from freezerclient import balancer
+from freezerclient import retry
+from freezerclient import singleflight
+from freezerclient import token_cache
+from freezerclient import token_refresh
+from freezerclient import transport
 from freezerclient import utils
 from freezerclient.v2.managers import actions
 from freezerclient.v2.managers import backups
@@ -25,6 +34,10 @@ from freezerclient.v2.managers import sessions
 
 FREEZER_SERVICE_TYPE = 'backup'
 
+# Number of clients and of keystone sessions built in this process, mostly
+# useful to tests and to debug redundant authentications
+STATS = collections.Counter()
+
 
 class Client(object):
     """Client for the OpenStack Disaster Recovery v2 API.
@@ -36,7 +49,16 @@ class Client(object):
                  user_domain_name=None, user_domain_id=None,
                  project_domain_name=None, project_domain_id=None,
                  cert=None, cacert=None, insecure=False, project_id=None,
-                 trust_id=None):
+                 trust_id=None,
+                 pool_connections=transport.DEFAULT_POOL_CONNECTIONS,
+                 pool_maxsize=transport.DEFAULT_POOL_MAXSIZE,
+                 pool_block=False, keep_alive=True, use_adapter=False,
+                 region_name=None, token_cache_dir=None,
+                 token_refresh_margin=None, on_token_refresh_error=None,
+                 retry_policy=None, connect_timeout=None, read_timeout=None,
+                 circuit_breaker=None, endpoints=None, use_all_endpoints=False,
+                 lb_strategy=balancer.LEAST_OUTSTANDING, rate_limiter=None,
+                 cache=None, coalesce_reads=False):
         """
         Initialize a new client for the Disaster Recovery v2 API.
         :param token: keystone token
@@ -60,10 +82,64 @@ class Client(object):
                        attempt to locate and use certificates. (optional,
                        defaults to True)
         :param cert: Path to cert
+        :param pool_connections: number of per-host connection pools kept by
+                                 the HTTP transport
+        :param pool_maxsize: maximum number of connections kept open towards
+                             a single freezer-api host
+        :param pool_block: block when the connection pool of a host is
+                           exhausted instead of opening extra connections
+        :param keep_alive: keep connections to freezer-api open between
+                           requests
+        :param use_adapter: send the requests of the managers through a
+                            keystoneauth Adapter bound to the keystone session
+                            instead of a dedicated HTTP transport
+        :param region_name: region of the backup endpoint to use
+        :param token_cache_dir: directory where the keystone token and
+                                service catalog are cached between processes
+                                (optional, disabled by default). Only used
+                                when the client builds its own session.
+        :param token_refresh_margin: when set, a background thread renews
+                                     the token this many seconds before it
+                                     expires (optional, disabled by default)
+        :param on_token_refresh_error: callable receiving the exception of
+                                       a failed background token refresh
+        :param retry_policy: freezerclient.retry.RetryPolicy applied to
+                             every request of the managers. Defaults to
+                             RetryPolicy(); RetryPolicy(max_attempts=1)
+                             disables retries.
+        :param connect_timeout: seconds to wait for a connection to
+                                freezer-api (optional, no timeout by default)
+        :param read_timeout: seconds to wait for freezer-api to send data
+                             (optional, no timeout by default). Also used as
+                             timeout of the keystone session built by the
+                             client.
+        :param circuit_breaker: freezerclient.circuit.CircuitBreaker guarding
+                                the freezer-api endpoints (optional,
+                                disabled by default)
+        :param endpoints: list of freezer-api endpoints to spread the
+                          requests across (optional)
+        :param use_all_endpoints: spread the requests across every backup
+                                  endpoint of the service catalog matching
+                                  the endpoint type (public by default)
+                                  and the region (the one of the endpoint
+                                  found in the catalog by default)
+                                  (optional, default False)
+        :param lb_strategy: how the endpoint of each request is picked,
+                            least-outstanding or latency
+        :param rate_limiter: freezerclient.ratelimit.RateLimiter bounding
+                             the rate of the reads and writes sent by every
+                             manager (optional, unlimited by default)
+        :param cache: freezerclient.cache.DocumentCache answering the get()
+                      calls of the managers, which invalidate it on every
+                      change they make (optional, disabled by default)
+        :param coalesce_reads: whether identical get() and list calls made
+                               concurrently share a single request, counted
+                               by the singleflight attribute of the client
+                               (optional, default False)
         :return: freezerclient.Client
         """
-
-        self.project_id = project_id
+        STATS['clients'] += 1
+        self._project_id = project_id
 
         if opts is None:
             self.opts = utils.Namespace({})
@@ -73,6 +149,7 @@ class Client(object):
             self.opts.os_auth_url = auth_url or None
             self.opts.os_backup_url = endpoint or None
             self.opts.os_endpoint_type = endpoint_type or None
+            self.opts.os_region_name = region_name or None
             self.opts.os_project_name = project_name or None
             self.opts.os_project_id = project_id or None
             self.opts.os_user_domain_name = user_domain_name or None
@@ -89,24 +166,70 @@ class Client(object):
         self.cert = cert
         self.cacert = cacert or self.opts.os_cacert
         self._session = session
-        verify = self.opts.os_cacert
+        self.pool_connections = pool_connections
+        self.pool_maxsize = pool_maxsize
+        self.pool_block = pool_block
+        self.keep_alive = keep_alive
+        self.use_adapter = use_adapter
+        self.retry_policy = retry_policy or retry.RetryPolicy()
+        self.timeout = None
+        if connect_timeout is not None or read_timeout is not None:
+            self.timeout = (connect_timeout, read_timeout)
+        self.read_timeout = read_timeout
+        self.circuit_breaker = circuit_breaker
+        self.rate_limiter = rate_limiter
+        self.cache = cache
+        self.singleflight = None
+        if coalesce_reads:
+            self.singleflight = singleflight.Group()
+        self.token_cache = None
+        if token_cache_dir and not session:
+            self.token_cache = token_cache.TokenCache(token_cache_dir)
+        self.token_refresher = None
+        if token_refresh_margin is not None:
+            self.token_refresher = token_refresh.TokenRefresher(
+                margin=token_refresh_margin,
+                on_error=on_token_refresh_error,
+                on_refresh=self._save_token_cache)
+        self.verify = self.opts.os_cacert
         if self.opts.insecure:
-            verify = False
+            self.verify = False
+        self.load_balancer = None
+        if endpoints:
+            if not self.opts.os_backup_url:
+                self.opts.os_backup_url = endpoints[0]
+            self.load_balancer = balancer.LoadBalancer(
+                list(endpoints), strategy=lb_strategy, verify=self.verify)
+        elif use_all_endpoints:
+            self.load_balancer = balancer.LoadBalancer(
+                self._catalog_endpoints, strategy=lb_strategy,
+                verify=self.verify)
 
         self.validate()
-        self.project_id = project_id or self.get_project_id
 
-        self.jobs = jobs.JobManager(self, verify=verify)
-        self.clients = clients.ClientManager(self, verify=verify)
-        self.backups = backups.BackupsManager(self, verify=verify)
-        self.sessions = sessions.SessionManager(self, verify=verify)
-        self.actions = actions.ActionManager(self, verify=verify)
+        self.jobs = jobs.JobManager(self, verify=self.verify, cache=cache,
+                                    singleflight=self.singleflight)
+        self.clients = clients.ClientManager(self, verify=self.verify,
+                                             cache=cache,
+                                             singleflight=self.singleflight)
+        self.backups = backups.BackupsManager(self, verify=self.verify,
+                                              cache=cache,
+                                              singleflight=self.singleflight)
+        self.sessions = sessions.SessionManager(
+            self, verify=self.verify, cache=cache,
+            singleflight=self.singleflight)
+        self.actions = actions.ActionManager(self, verify=self.verify,
+                                             cache=cache,
+                                             singleflight=self.singleflight)
 
     @utils.CachedProperty
     def session(self):
-        if self._session:
-            return self._session
+        session = self._session or self._load_session()
+        if self.token_refresher:
+            self.token_refresher.start(session)
+        return session
 
+    def _load_session(self):
         auth_kwargs = {'auth_url': self.opts.os_auth_url}
 
         if self.opts.os_username and self.opts.os_password:
@@ -134,29 +257,151 @@ class Client(object):
         else:
             auth_type = 'password'
 
+        STATS['sessions'] += 1
         loader = kaloading.get_plugin_loader(auth_type)
         auth_plugin = loader.load_from_options(**auth_kwargs)
+        if self.token_cache:
+            self.token_cache.load(auth_plugin)
         # Let keystoneauth do the necessary parameter conversions
         session = kaloading.session.Session().load_from_options(
             auth=auth_plugin, insecure=self.opts.insecure, cacert=self.cacert,
-            cert=self.cert)
+            cert=self.cert, timeout=self.read_timeout)
         return session
 
+    def adapter_transport(self, session):
+        """Transport sending the requests through session with keystoneauth
+
+        :param session: keystoneauth1.session.Session
+        :return: freezerclient.transport.AdapterTransport
+        """
+        return transport.AdapterTransport(
+            session,
+            FREEZER_SERVICE_TYPE,
+            interface=self.opts.os_endpoint_type,
+            region_name=self.opts.os_region_name,
+            endpoint_override=self.opts.os_backup_url,
+            retry_policy=self.retry_policy,
+            timeout=self.timeout,
+            circuit_breaker=self.circuit_breaker,
+            balancer=self.load_balancer,
+            rate_limiter=self.rate_limiter)
+
+    @utils.CachedProperty
+    def transport(self):
+        if self.use_adapter:
+            return self.adapter_transport(self.session)
+        return transport.HTTPTransport(
+            pool_connections=self.pool_connections,
+            pool_maxsize=self.pool_maxsize,
+            pool_block=self.pool_block,
+            keep_alive=self.keep_alive,
+            retry_policy=self.retry_policy,
+            timeout=self.timeout,
+            circuit_breaker=self.circuit_breaker,
+            balancer=self.load_balancer,
+            rate_limiter=self.rate_limiter)
+
     @utils.CachedProperty
     def endpoint(self):
         if self.opts.os_backup_url:
             return self.opts.os_backup_url
+        elif self.use_adapter:
+            endpoint = self.transport.get_endpoint()
         else:
-            auth_ref = self.session.auth.get_auth_ref(self.session)
+            # get_access reuses a valid token, from the token cache for
+            # instance, while get_auth_ref always authenticates again
+            auth_ref = self.session.auth.get_access(self.session)
             endpoint = auth_ref.service_catalog.url_for(
                 service_type=FREEZER_SERVICE_TYPE,
                 interface=self.opts.os_endpoint_type,
+                region_name=self.opts.os_region_name,
             )
+        self._save_token_cache()
         return endpoint
 
+    def region_endpoint(self, region_name):
+        """Backup endpoint of the service catalog in region_name"""
+        auth_ref = self.session.auth.get_access(self.session)
+        return auth_ref.service_catalog.url_for(
+            service_type=FREEZER_SERVICE_TYPE,
+            interface=self.opts.os_endpoint_type,
+            region_name=region_name)
+
+    def for_region(self, region_name):
+        """Client bound to the backup endpoint of another region
+
+        The returned client shares the session, the transport and every
+        setting of this one, so it does not authenticate again.
+
+        :param region_name: name of the region
+        :return: RegionClient
+        """
+        return RegionClient(self, region_name)
+
+    def for_project(self, project_id):
+        """Client scoped to another project
+
+        The current token is rescoped to project_id, the new session
+        shares the connection pool of the current one and the returned
+        client shares the endpoint and every setting of this one. It also
+        shares the transport, unless the requests go through a keystoneauth
+        Adapter, which must then be bound to the new session.
+
+        :param project_id: id of the project
+        :return: ProjectClient
+        """
+        return ProjectClient(self, project_id,
+                             self.scoped_session(project_id))
+
+    def scoped_session(self, project_id):
+        """Session authenticated with the current token rescoped to a project
+
+        :param project_id: id of the project
+        :return: keystoneauth1.session.Session
+        """
+        auth = self.session.auth
+        auth_url = getattr(auth, 'auth_url', None) or self.opts.os_auth_url
+        scoped_auth = identity.Token(auth_url, token=self.auth_token,
+                                     project_id=project_id)
+        return ksa_session.Session(
+            auth=scoped_auth, session=self.session.session,
+            verify=self.session.verify, cert=self.session.cert,
+            timeout=self.session.timeout)
+
+    def _catalog_endpoints(self):
+        catalog = self.session.auth.get_access(self.session).service_catalog
+        interface = self.opts.os_endpoint_type or 'public'
+        region_name = self.opts.os_region_name
+        if region_name is None:
+            # Stay in the region of the endpoint the client would pick on
+            # its own: the other regions do not hold the same data
+            region_name = catalog.endpoint_data_for(
+                service_type=FREEZER_SERVICE_TYPE,
+                interface=interface).region_name
+        return catalog.get_urls(service_type=FREEZER_SERVICE_TYPE,
+                                interface=interface,
+                                region_name=region_name)
+
     @property
     def auth_token(self):
-        return self.session.get_token()
+        token = self.session.get_token()
+        self._save_token_cache()
+        return token
+
+    def _save_token_cache(self):
+        if self.token_cache:
+            self.token_cache.save(self.session.auth)
+
+    @property
+    def project_id(self):
+        """Id of the project, resolved through keystone on first access"""
+        if self._project_id:
+            return self._project_id
+        return self._resolved_project_id
+
+    @utils.CachedProperty
+    def _resolved_project_id(self):
+        return self.get_project_id
 
     @property
     def get_project_id(self):
@@ -167,9 +412,77 @@ class Client(object):
         return '{0}_{1}'.format(self.session.get_project_id(),
                                 socket.gethostname())
 
+    def close(self):
+        """Stop the background threads and close the pooled connections"""
+        if self.token_refresher:
+            self.token_refresher.stop()
+        if self.load_balancer:
+            self.load_balancer.close()
+        if 'transport' in self.__dict__:
+            self.transport.close()
+
     def validate(self):
         """Validate that the client objects gets created correctly.
         :return: bool
         """
         if not self._session and self.opts.os_auth_url is None:
             raise Exception('OS_AUTH_URL should be provided.')
+
+
+class ClientView(object):
+    """View of a client overriding some of its attributes.
+
+    The managers of the view are bound to it, every other attribute is
+    the one of the wrapped client, so views share the settings and the
+    transport of their client.
+    """
+
+    MANAGERS = ('jobs', 'clients', 'backups', 'sessions', 'actions')
+
+    def __init__(self, client):
+        self.client = client
+        for name in self.MANAGERS:
+            manager = getattr(client, name)
+            setattr(self, name, type(manager)(
+                self, verify=manager.verify, cache=manager.cache,
+                singleflight=manager.singleflight))
+
+    def __getattr__(self, name):
+        return getattr(self.client, name)
+
+
+class RegionClient(ClientView):
+    """View of a client bound to the backup endpoint of a region"""
+
+    def __init__(self, client, region_name):
+        self.region_name = region_name
+        super(RegionClient, self).__init__(client)
+
+    @utils.CachedProperty
+    def endpoint(self):
+        return self.client.region_endpoint(self.region_name)
+
+
+class ProjectClient(ClientView):
+    """View of a client scoped to another project"""
+
+    def __init__(self, client, project_id, session):
+        self.project_id = project_id
+        self.session = session
+        super(ProjectClient, self).__init__(client)
+
+    @property
+    def auth_token(self):
+        return self.session.get_token()
+
+    @utils.CachedProperty
+    def transport(self):
+        # The adapter replaces the token of the requests by the one of its
+        # session, the other transports send the one of the headers
+        if self.client.use_adapter:
+            return self.client.adapter_transport(self.session)
+        return self.client.transport
+
+    @utils.CachedProperty
+    def client_id(self):
+        return '{0}_{1}'.format(self.project_id, socket.gethostname())
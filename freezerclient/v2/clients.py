@@ -81,14 +81,35 @@ class ClientList(base.FreezerLister):
             default='',
             help='Define a filter for the query',
         )
+
+        parser.add_argument(
+            '--all',
+            dest='all',
+            action='store_true',
+            help='Fetch every page of the listing instead of a single one '
+                 'of at most --limit records',
+        )
+
+        parser.add_argument(
+            '--page-size',
+            dest='page_size',
+            default=100,
+            help='Number of records requested per page when using --all',
+        )
         return parser
 
     def take_action(self, parsed_args):
         search = utils.prepare_search(parsed_args.search)
 
-        clients = self.client.clients.list(limit=parsed_args.limit,
-                                           offset=parsed_args.offset,
-                                           search=search)
+        if parsed_args.all:
+            clients = self.client.clients.iter_list(
+                page_size=parsed_args.page_size,
+                offset=parsed_args.offset,
+                search=search)
+        else:
+            clients = self.client.clients.list(limit=parsed_args.limit,
+                                               offset=parsed_args.offset,
+                                               search=search)
 
         # Print empty table if no clients found
         if not clients:
@@ -117,19 +138,18 @@ class ClientDelete(base.FreezerCommand):
         self.client.clients.delete(parsed_args.client_id)
 
 
-class ClientRegister(base.FreezerShowOne):
-    """Register a new client"""
-    def get_parser(self, prog_name):
-        parser = super(ClientRegister, self).get_parser(prog_name)
-        parser.add_argument('--file',
-                            dest='file',
-                            required=True,
-                            help='Path to json file with the client')
-        return parser
+class ClientRegister(base.FreezerCreateOne):
+    """Register new clients from a file, a directory or a JSON-lines file"""
+    noun = 'client'
 
     def take_action(self, parsed_args):
+        if not parsed_args.file:
+            return self.create_many(self.client.clients, parsed_args)
         client_data = utils.doc_from_json_file(parsed_args.file)
         try:
+            if not parsed_args.refetch:
+                return format_client(self.client.clients.create(
+                    client_data, return_document=True))
             client_id = self.client.clients.create(client_data)
         except Exception as err:
             raise exceptions.ApiClientException(err.message)
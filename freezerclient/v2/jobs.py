@@ -113,13 +113,53 @@ class JobList(base.FreezerLister):
             action='store_true',
             help='Get jobs for all projects',
         )
+
+        parser.add_argument(
+            '--all',
+            dest='all',
+            action='store_true',
+            help='Fetch every page of the listing instead of a single one '
+                 'of at most --limit records',
+        )
+
+        parser.add_argument(
+            '--page-size',
+            dest='page_size',
+            default=100,
+            help='Number of records requested per page when using --all',
+        )
+
+        parser.add_argument(
+            '--concurrency',
+            dest='concurrency',
+            default=4,
+            type=int,
+            help='Number of pages fetched in parallel when using --all',
+        )
         return parser
 
     def take_action(self, parsed_args):
 
         search = utils.prepare_search(parsed_args.search)
 
-        if parsed_args.client_id:
+        if parsed_args.all and parsed_args.client_id:
+            jobs = self.client.jobs.iter_list(
+                page_size=parsed_args.page_size,
+                offset=parsed_args.offset,
+                search=search,
+                client_id=parsed_args.client_id,
+                all_projects=parsed_args.all_projects,
+                concurrency=parsed_args.concurrency,
+            )
+        elif parsed_args.all:
+            jobs = self.client.jobs.iter_list_all(
+                page_size=parsed_args.page_size,
+                offset=parsed_args.offset,
+                search=search,
+                all_projects=parsed_args.all_projects,
+                concurrency=parsed_args.concurrency,
+            )
+        elif parsed_args.client_id:
             jobs = self.client.jobs.list(
                 limit=parsed_args.limit,
                 offset=parsed_args.offset,
@@ -200,16 +240,12 @@ class JobDelete(base.FreezerCommand):
         self.client.jobs.delete(parsed_args.job_id)
 
 
-class JobCreate(base.FreezerShowOne):
-    """Create a new job from a file"""
+class JobCreate(base.FreezerCreateOne):
+    """Create new jobs from a file, a directory or a JSON-lines file"""
+    noun = 'job'
+
     def get_parser(self, prog_name):
         parser = super(JobCreate, self).get_parser(prog_name)
-        parser.add_argument(
-            '--file',
-            dest='file',
-            required=True,
-            help='Path to json file with the job')
-
         parser.add_argument(
             '--client', '-C',
             dest='client_id',
@@ -220,49 +256,88 @@ class JobCreate(base.FreezerShowOne):
         return parser
 
     def take_action(self, parsed_args):
+        if not parsed_args.file:
+            def prepare(job_data):
+                job_data['client_id'] = parsed_args.client_id
+            return self.create_many(self.client.jobs, parsed_args, prepare)
         job_data = utils.doc_from_json_file(parsed_args.file)
         job_data['client_id'] = parsed_args.client_id
-        job_id = self.client.jobs.create(job_data)
-        job = self.client.jobs.get(job_id)
-        if not job:
-            raise exceptions.ApiClientException('Job created but not found')
-        return format_job(job)
+        return format_job(self.create_one(self.client.jobs, job_data,
+                                          parsed_args))
 
 
-class JobStart(base.FreezerCommand):
-    """Send a start signal for a job"""
-    def get_parser(self, prog_name):
-        parser = super(JobStart, self).get_parser(prog_name)
-        parser.add_argument(dest='job_id',
-                            help='ID of the job')
-        return parser
+class _JobSignal(base.FreezerCommand):
+    """Send a signal to one job, to the jobs of a file or to matching jobs
 
-    def take_action(self, parsed_args):
-        self.client.jobs.start_job(parsed_args.job_id)
+    Subclasses set ``signal``, the name of the event sent to the jobs.
+    """
+    signal = None
 
-
-class JobStop(base.FreezerCommand):
-    """Send a stop signal for a job"""
     def get_parser(self, prog_name):
-        parser = super(JobStop, self).get_parser(prog_name)
-        parser.add_argument(dest='job_id',
-                            help='ID of the job')
-        return parser
-
-    def take_action(self, parsed_args):
-        self.client.jobs.stop_job(parsed_args.job_id)
-
-
-class JobAbort(base.FreezerCommand):
-    """Abort a running job"""
-    def get_parser(self, prog_name):
-        parser = super(JobAbort, self).get_parser(prog_name)
-        parser.add_argument(dest='job_id',
-                            help='ID of the job')
+        parser = super(_JobSignal, self).get_parser(prog_name)
+        jobs = parser.add_mutually_exclusive_group(required=True)
+        jobs.add_argument(dest='job_id',
+                          nargs='?',
+                          help='ID of the job')
+        jobs.add_argument('--from-file',
+                          dest='from_file',
+                          help='File listing the IDs of the jobs, one per '
+                               'line, - for the standard input')
+        jobs.add_argument('--all-matching',
+                          dest='all_matching',
+                          metavar='SEARCH',
+                          help='Send the signal to every job matching the '
+                               'search term, of any client')
+        base.add_bulk_arguments(parser)
         return parser
 
     def take_action(self, parsed_args):
-        self.client.jobs.abort_job(parsed_args.job_id)
+        jobs = self.client.jobs
+        if parsed_args.job_id:
+            getattr(jobs, '{0}_job'.format(self.signal))(parsed_args.job_id)
+            return
+        if parsed_args.job_id is not None:
+            raise exceptions.ApiClientException('The job ID must not be empty')
+        signal_many = getattr(jobs, '{0}_jobs'.format(self.signal))
+        if parsed_args.from_file:
+            results = signal_many(
+                job_ids=utils.ids_from_file(parsed_args.from_file),
+                **base.bulk_options(self.app, parsed_args))
+        else:
+            # an empty search would match every job of the project
+            if not (parsed_args.all_matching or '').strip():
+                raise exceptions.ApiClientException(
+                    'The search term of --all-matching must not be empty')
+            results = signal_many(
+                search=utils.prepare_search(parsed_args.all_matching),
+                **base.bulk_options(self.app, parsed_args))
+        failed = 0
+        for result in results:
+            # jobs already signalled are answered with an 'already
+            # requested' result rather than an error, and count as done
+            if result.error is not None:
+                logging.error('Unable to %s job %s: %s',
+                              self.signal, result.item, result.error)
+                failed += 1
+        if failed:
+            raise exceptions.ApiClientException(
+                '{0} of {1} jobs could not be signalled'.format(
+                    failed, len(results)))
+
+
+class JobStart(_JobSignal):
+    """Send a start signal for one or several jobs"""
+    signal = 'start'
+
+
+class JobStop(_JobSignal):
+    """Send a stop signal for one or several jobs"""
+    signal = 'stop'
+
+
+class JobAbort(_JobSignal):
+    """Abort one or several running jobs"""
+    signal = 'abort'
 
 
 class JobUpdate(base.FreezerShowOne):
@@ -12,8 +12,6 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-import requests
-
 from oslo_serialization import jsonutils as json
 
 from freezerclient import exceptions
@@ -22,48 +20,72 @@ from freezerclient.v2.managers import base
 
 class ActionManager(base.BaseManager):
     resource_name = 'actions'
+    id_key = 'action_id'
 
-    def create(self, doc, action_id=''):
+    def create(self, doc, action_id='', return_document=False):
         action_id = action_id or doc.get('action_id', '')
         endpoint = self.endpoint + action_id
-        r = requests.post(endpoint,
-                          data=json.dumps(doc),
-                          headers=self.headers,
-                          verify=self.verify)
+        r = self.transport.post(endpoint,
+                                data=json.dumps(doc),
+                                headers=self.headers,
+                                verify=self.verify)
         if r.status_code != 201:
             raise exceptions.ApiClientException(r)
         action_id = r.json()['action_id']
+        self._invalidate(action_id)
+        if return_document:
+            return self._created_document(action_id, doc)
         return action_id
 
     def delete(self, action_id):
         endpoint = self.endpoint + action_id
-        r = requests.delete(endpoint, headers=self.headers, verify=self.verify)
+        r = self.transport.delete(endpoint, headers=self.headers,
+                                  verify=self.verify)
+        self._invalidate(action_id)
         if r.status_code != 204:
             raise exceptions.ApiClientException(r)
 
     def list(self, limit=10, offset=0, search=None):
         data = json.dumps(search) if search else None
         query = {'limit': int(limit), 'offset': int(offset)}
-        r = requests.get(self.endpoint, headers=self.headers,
-                         params=query, data=data, verify=self.verify)
-        if r.status_code != 200:
-            raise exceptions.ApiClientException(r)
-        return r.json()['actions']
+        return self._list_page(query, data)
+
+    def iter_list(self, page_size=base.DEFAULT_PAGE_SIZE, max_items=None,
+                  offset=0, search=None, concurrency=1, deadline=None):
+        """
+        Lazily iterates over the actions, fetching them page by page
+
+        :param page_size: number of actions requested per page
+                          (optional, default 100)
+        :param max_items: maximum number of actions to return (optional)
+        :param offset: order of first document (optional, default 0)
+        :param search: structured query (optional)
+        :param concurrency: number of pages fetched in parallel
+                            (optional, default 1)
+        :param deadline: freezerclient.timeouts.Deadline bounding the
+                         whole listing (optional)
+        """
+        return self._iter_pages(self.list, page_size, max_items, offset,
+                                concurrency, deadline=deadline, search=search)
 
     def get(self, action_id):
-        endpoint = self.endpoint + action_id
-        r = requests.get(endpoint, headers=self.headers, verify=self.verify)
-        if r.status_code == 200:
-            return r.json()
-        if r.status_code == 404:
-            return None
-        raise exceptions.ApiClientException(r)
+        return self._get_document(action_id)
 
-    def update(self, action_id, update_doc):
+    def update(self, action_id, update_doc, return_document=False):
         endpoint = self.endpoint + action_id
-        r = requests.patch(endpoint,
-                           headers=self.headers,
-                           data=json.dumps(update_doc), verify=self.verify)
+        previous = self._cached(action_id) if return_document else None
+        r = self.transport.patch(endpoint,
+                                 headers=self.headers,
+                                 data=json.dumps(update_doc),
+                                 verify=self.verify)
+        self._invalidate(action_id)
         if r.status_code != 200:
             raise exceptions.ApiClientException(r)
-        return r.json()['version']
+        version = r.json()['version']
+        if not return_document:
+            return version
+        if previous is None:
+            # Only freezer-api knows the fields that were not updated
+            return self.get(action_id)
+        return self._updated_document(action_id, previous, update_doc,
+                                      version)
@@ -12,30 +12,65 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-import requests
+import itertools
+import time
 
 from oslo_serialization import jsonutils as json
 
 from freezerclient import exceptions
+from freezerclient import timeouts
+from freezerclient import utils
 from freezerclient.v2.managers import base
 
+DEFAULT_SCAN_WINDOW = 86400
+DEFAULT_SCAN_CONCURRENCY = 4
+
+
+def _time_stamp(backup):
+    return int(backup.get('backup_metadata', {}).get('time_stamp', 0))
+
+
+def _scan_windows(time_after, time_before, window):
+    """Return the (time_after, time_before) of the windows of a scan"""
+    time_after = int(time_after)
+    if time_before is None:
+        time_before = int(time.time())
+    time_before = int(time_before)
+    window = int(window)
+    if window < 1:
+        raise ValueError('The scan window must be at least one second')
+    return ((start, min(start + window - 1, time_before))
+            for start in range(time_after, time_before + 1, window))
+
 
 class BackupsManager(base.BaseManager):
     resource_name = 'backups'
+    id_key = 'backup_id'
 
-    def create(self, backup_metadata):
-        r = requests.post(self.endpoint,
-                          data=json.dumps(backup_metadata),
-                          headers=self.headers,
-                          verify=self.verify)
+    def _created_document(self, backup_id, backup_metadata):
+        # freezer-api wraps the metadata, and exposes the id as backup_uuid
+        return {'backup_id': backup_id,
+                'backup_uuid': backup_id,
+                'backup_metadata': backup_metadata}
+
+    def create(self, backup_metadata, return_document=False):
+        r = self.transport.post(self.endpoint,
+                                data=json.dumps(backup_metadata),
+                                headers=self.headers,
+                                verify=self.verify)
         if r.status_code != 201:
             raise exceptions.ApiClientException(r)
         backup_id = r.json()['backup_id']
+        self._invalidate(backup_id)
+        if return_document:
+            return self._created_document(backup_id, backup_metadata)
         return backup_id
 
     def delete(self, backup_id):
         endpoint = self.endpoint + backup_id
-        r = requests.delete(endpoint, headers=self.headers, verify=self.verify)
+        r = self.transport.delete(endpoint, headers=self.headers,
+                                  verify=self.verify)
+        self._invalidate(backup_id)
         if r.status_code != 204:
             raise exceptions.ApiClientException(r)
 
@@ -54,18 +89,64 @@ class BackupsManager(base.BaseManager):
         """
         data = json.dumps(search) if search else None
         query = {'limit': int(limit), 'offset': int(offset)}
-        r = requests.get(self.endpoint, headers=self.headers,
-                         params=query, data=data, verify=self.verify)
-        if r.status_code != 200:
-            raise exceptions.ApiClientException(r)
+        return self._list_page(query, data)
+
+    def iter_list(self, page_size=base.DEFAULT_PAGE_SIZE, max_items=None,
+                  offset=0, search=None, concurrency=1, deadline=None):
+        """
+        Lazily iterates over the backup infos, fetching them page by page
+
+        :param page_size: number of backups requested per page
+                          (optional, default 100)
+        :param max_items: maximum number of backups to return (optional)
+        :param offset: order of first document (optional, default 0)
+        :param search: structured query (optional)
+        :param concurrency: number of pages fetched in parallel
+                            (optional, default 1)
+        :param deadline: freezerclient.timeouts.Deadline bounding the
+                         whole listing (optional)
+        """
+        return self._iter_pages(self.list, page_size, max_items, offset,
+                                concurrency, deadline=deadline, search=search)
+
+    def scan(self, time_after, time_before=None, window=DEFAULT_SCAN_WINDOW,
+             page_size=base.DEFAULT_PAGE_SIZE, search=None,
+             concurrency=DEFAULT_SCAN_CONCURRENCY, deadline=None):
+        """
+        Iterates over the backups taken in a time range, ordered by
+        time_stamp
 
-        return r.json()['backups']
+        The range is split in windows that are listed separately with
+        shallow offsets, several of them in parallel, instead of walking
+        the whole range with an ever growing offset.
+
+        :param time_after: timestamp of the start of the range, inclusive
+        :param time_before: timestamp of the end of the range, inclusive
+                            (optional, default now)
+        :param window: length of the windows in seconds
+                       (optional, default one day)
+        :param page_size: number of backups requested per page
+                          (optional, default 100)
+        :param search: structured query (optional), its time_after and
+                       time_before are replaced by the ones of each window
+        :param concurrency: number of windows fetched in parallel
+                            (optional, default 4)
+        :param deadline: freezerclient.timeouts.Deadline bounding the whole
+                         scan (optional, defaults to the active deadline)
+        """
+        windows = _scan_windows(time_after, time_before, window)
+
+        def scan_window(after, before):
+            window_search = dict(search or {})
+            window_search.update(time_after=after, time_before=before)
+            return sorted(self.iter_list(page_size=page_size,
+                                         search=window_search),
+                          key=_time_stamp)
+
+        scan_window = timeouts.bounded(scan_window,
+                                       deadline or timeouts.current())
+        return itertools.chain.from_iterable(
+            utils.run_ahead(scan_window, windows, concurrency))
 
     def get(self, backup_id):
-        endpoint = self.endpoint + backup_id
-        r = requests.get(endpoint, headers=self.headers, verify=self.verify)
-        if r.status_code == 200:
-            return r.json()
-        if r.status_code == 404:
-            return None
-        raise exceptions.ApiClientException(r)
+        return self._get_document(backup_id)
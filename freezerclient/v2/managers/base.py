@@ -12,28 +12,380 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import collections
+import functools
+import itertools
+
+from freezerclient import cache as doc_cache
+from freezerclient import exceptions
+from freezerclient import ratelimit
+from freezerclient import singleflight
+from freezerclient import timeouts
 from freezerclient import utils
 
+DEFAULT_PAGE_SIZE = 100
+DEFAULT_BULK_CONCURRENCY = 8
+
+# Outcome of one item of a bulk operation: the item, the value returned
+# for it, and the exception raised for it, if any
+BulkResult = collections.namedtuple('BulkResult', ['item', 'result', 'error'])
+
+
+def _page_slices(page_size, max_items, offset):
+    """Yield the (offset, limit) of the successive pages of a listing"""
+    remaining = None if max_items is None else int(max_items)
+    while remaining is None or remaining > 0:
+        limit = page_size if remaining is None else min(page_size, remaining)
+        yield offset, limit
+        offset += limit
+        if remaining is not None:
+            remaining -= limit
+
+
+def _fetch_pages(list_page, slices, kwargs):
+    for offset, limit in slices:
+        page = list_page(limit=limit, offset=offset, **kwargs)
+        yield page[:limit]
+        if len(page) < limit:
+            return
+
+
+def _prefetch_pages(list_page, slices, concurrency, kwargs):
+    def fetch(offset, limit):
+        return limit, list_page(limit=limit, offset=offset, **kwargs)
+
+    pages = utils.run_ahead(fetch, slices, concurrency)
+    try:
+        for limit, page in pages:
+            yield page[:limit]
+            if len(page) < limit:
+                return
+    finally:
+        pages.close()
+
+
+def merge_documents(doc, patch):
+    """Return doc updated with patch, merging the nested dicts
+
+    :param doc: document
+    :param patch: partial document
+    """
+    merged = dict(doc)
+    for key, value in patch.items():
+        if isinstance(value, dict) and isinstance(merged.get(key), dict):
+            value = merge_documents(merged[key], value)
+        merged[key] = value
+    return merged
+
 
 class BaseManager(object):
     resource_name = None
+    id_key = None
 
-    def __init__(self, client, verify=True):
+    def __init__(self, client, verify=True, cache=None, singleflight=None):
+        """
+        :param client: freezerclient.v2.client.Client
+        :param verify: TLS verification argument of the requests
+        :param cache: freezerclient.cache.DocumentCache answering get()
+                      (optional, disabled by default)
+        :param singleflight: freezerclient.singleflight.Group coalescing
+                             the identical concurrent reads (optional,
+                             disabled by default)
+        """
         self.client = client
         self.verify = verify
+        self.cache = cache
+        self.singleflight = singleflight
 
-    @property
-    def endpoint(self):
+    def _resource_endpoint(self, resource_name):
         endpoint = self.client.endpoint.rstrip('/')
         if '/v2' in endpoint:
-            return '{0}/{1}/'.format(endpoint, self.resource_name)
+            return '{0}/{1}/'.format(endpoint, resource_name)
         return '{0}/v2/{1}/{2}/'.format(
-            endpoint, self.client.project_id, self.resource_name)
+            endpoint, self.client.project_id, resource_name)
+
+    @property
+    def endpoint(self):
+        return self._resource_endpoint(self.resource_name)
+
+    def _cached(self, doc_id):
+        """Return the cached document, or None when it is not cached"""
+        if self.cache is None:
+            return None
+        doc = self.cache.lookup(self.endpoint + doc_id)
+        if doc is doc_cache.MISS:
+            return None
+        return doc
+
+    @staticmethod
+    def _read_document(r):
+        """Return the document of a GET response, or None on 404"""
+        if r.status_code == 200:
+            return r.json()
+        if r.status_code == 404:
+            return None
+        raise exceptions.ApiClientException(r)
+
+    def _coalesce(self, read, url, headers, params=None, data=None):
+        """Run a read, sharing its result with the identical ones in flight
+
+        :param read: callable sending the GET request and decoding its
+                     response
+        :param url: URL of the request
+        :param headers: headers of the request
+        :param params: query parameters of the request (optional)
+        :param data: body of the request (optional)
+        """
+        if self.singleflight is None:
+            return read()
+        key = singleflight.request_key('GET', url,
+                                       headers.get('X-Auth-Token'),
+                                       params, data)
+        return self.singleflight.do(key, read)
+
+    def _get_document(self, doc_id):
+        """GET a document, through the cache of the manager if any
+
+        A stale cached copy of the document that has validators is
+        revalidated with a conditional request, and reused when freezer-api
+        answers 304 Not Modified, or when the circuit breaker of the client
+        refuses the request.
+
+        :param doc_id: id of the document
+        :return: the document, or None when it does not exist
+        """
+        endpoint = self.endpoint + doc_id
+        if self.cache is not None:
+            doc = self.cache.lookup(endpoint)
+            if doc is not doc_cache.MISS:
+                return doc
+        headers = self.headers
+        return self._coalesce(
+            functools.partial(self._fetch_document, endpoint, headers),
+            endpoint, headers)
+
+    def _fetch_document(self, endpoint, headers):
+        if self.cache is None:
+            return self._read_document(self.transport.get(
+                endpoint, headers=headers, verify=self.verify))
+        try:
+            r = self.transport.get(
+                endpoint, verify=self.verify,
+                headers=dict(headers,
+                             **self.cache.conditional_headers(endpoint)))
+        except exceptions.CircuitOpenError:
+            # freezer-api is known to be down, the copy kept for
+            # revalidation is better than nothing
+            doc = self.cache.stale(endpoint)
+            if doc is doc_cache.MISS:
+                raise
+            return doc
+        if r.status_code == 304:
+            doc = self.cache.refresh(endpoint, self.resource_name)
+            if doc is not doc_cache.MISS:
+                return doc
+            # The cached copy was evicted while revalidating it
+            r = self.transport.get(endpoint, headers=headers,
+                                   verify=self.verify)
+        doc = self._read_document(r)
+        validators = None
+        if doc is not None:
+            validators = doc_cache.response_validators(r, doc)
+        self.cache.store(endpoint, doc, self.resource_name, validators)
+        return doc
+
+    def _list_page(self, query, data=None):
+        """GET a page of the documents of the resource
+
+        :param query: query parameters of the request
+        :param data: JSON encoded search (optional)
+        :return: list of documents
+        """
+        endpoint = self.endpoint
+        headers = self.headers
+
+        def read():
+            r = self.transport.get(endpoint, headers=headers, params=query,
+                                   data=data, verify=self.verify)
+            if r.status_code != 200:
+                raise exceptions.ApiClientException(r)
+            return r.json()[self.resource_name]
+
+        return self._coalesce(read, endpoint, headers, query, data)
+
+    def _created_document(self, doc_id, doc):
+        """Build the document stored by freezer-api for a created doc
+
+        The fields set by freezer-api itself are missing, so the result is
+        not cached.
+
+        :param doc_id: id returned for the created document
+        :param doc: submitted document
+        """
+        return dict(doc, **{self.id_key: doc_id})
+
+    def _updated_document(self, doc_id, previous, update_doc, version):
+        """Build the document stored by freezer-api after an update
+
+        The result is not cached, freezer-api may change other fields of
+        the document on update.
+
+        :param doc_id: id of the updated document
+        :param previous: full document before the update
+        :param update_doc: submitted partial document
+        :param version: version returned for the update
+        """
+        doc = merge_documents(previous, update_doc)
+        doc[self.id_key] = doc_id
+        doc['version'] = version
+        return doc
+
+    def _invalidate(self, doc_id, resource_name=None):
+        """Drop a document changed by a request from the cache, if any
+
+        :param doc_id: id of the document
+        :param resource_name: resource of the document (optional, defaults
+                              to the one of the manager)
+        """
+        if self.cache is not None:
+            endpoint = self._resource_endpoint(
+                resource_name or self.resource_name)
+            self.cache.invalidate(endpoint + doc_id)
+
+    @property
+    def transport(self):
+        return self.client.transport
 
     @property
     def headers(self):
         return utils.create_headers_for_request(self.client.auth_token)
 
+    @staticmethod
+    def _iter_pages(list_page, page_size=DEFAULT_PAGE_SIZE, max_items=None,
+                    offset=0, concurrency=1, deadline=None, **kwargs):
+        """Lazily yield the records of a paginated listing.
+
+        With a concurrency greater than one, up to that many pages are
+        requested in parallel ahead of the consumer. The records are still
+        yielded in order and the walk stops at the first short page.
+
+        :param list_page: callable returning a single page, accepting the
+                          limit and offset keyword arguments
+        :param page_size: number of records requested per page
+        :param max_items: maximum number of records to yield (optional)
+        :param offset: order of the first record (optional, default 0)
+        :param concurrency: number of pages kept in flight (optional,
+                            default 1)
+        :param deadline: freezerclient.timeouts.Deadline bounding the whole
+                         walk (optional, defaults to the active deadline)
+        :param kwargs: extra arguments passed to list_page on every call
+        """
+        list_page = timeouts.bounded(list_page,
+                                     deadline or timeouts.current())
+        slices = _page_slices(int(page_size), max_items, int(offset))
+        if int(concurrency) > 1:
+            pages = _prefetch_pages(list_page, slices, int(concurrency),
+                                    kwargs)
+        else:
+            pages = _fetch_pages(list_page, slices, kwargs)
+        return itertools.chain.from_iterable(pages)
+
+    @staticmethod
+    def _bulk(func, items, concurrency=DEFAULT_BULK_CONCURRENCY, rate=None,
+              on_progress=None, deadline=None):
+        """Call func on every item, concurrently.
+
+        Failures are collected rather than aborting the whole operation.
+        The items are consumed lazily, so they can come from a large
+        stream.
+
+        :param func: callable receiving one item
+        :param items: iterable of items
+        :param concurrency: number of calls in flight (optional, default 8)
+        :param rate: maximum number of calls started per second
+                     (optional, unlimited by default)
+        :param on_progress: callable receiving the number of items done so
+                            far and the BulkResult of the last one
+        :param deadline: freezerclient.timeouts.Deadline bounding the whole
+                         operation, the items left once it is spent fail
+                         with DeadlineExceeded (optional, defaults to the
+                         active deadline)
+        :return: list of BulkResult, in the order of items
+        """
+        bucket = ratelimit.TokenBucket(rate) if rate else None
+        # worker threads do not inherit the active deadline
+        func = timeouts.bounded(func, deadline or timeouts.current())
+
+        def call(item):
+            try:
+                if bucket is not None:
+                    bucket.acquire()
+                return BulkResult(item, func(item), None)
+            except Exception as err:
+                return BulkResult(item, None, err)
+
+        # the calls are reported as they end, then put back in the order of
+        # the items
+        results = {}
+        for index, result in utils.run_as_completed(
+                call, ((i,) for i in items), concurrency):
+            results[index] = result
+            if on_progress is not None:
+                on_progress(len(results), result)
+        return [results[index] for index in range(len(results))]
+
+    def delete_many(self, ids, concurrency=DEFAULT_BULK_CONCURRENCY,
+                    rate=None, on_progress=None, deadline=None):
+        """Delete several documents concurrently
+
+        :param ids: iterable of document ids
+        :param concurrency: number of deletions in flight
+                            (optional, default 8)
+        :param rate: maximum number of deletions started per second
+                     (optional, unlimited by default)
+        :param on_progress: callable receiving the number of ids done so
+                            far and the BulkResult of the last one
+        :param deadline: freezerclient.timeouts.Deadline bounding the whole
+                         operation, the ids left once it is spent fail
+                         with DeadlineExceeded (optional, defaults to the
+                         active deadline)
+        :return: list of BulkResult, in the order of ids
+        """
+        return self._bulk(self.delete, ids, concurrency, rate, on_progress,
+                          deadline)
+
+    def create_many(self, docs, concurrency=DEFAULT_BULK_CONCURRENCY,
+                    rate=None, on_progress=None, fetch=False, deadline=None):
+        """Create several documents concurrently
+
+        :param docs: iterable of documents, consumed lazily
+        :param concurrency: number of creations in flight
+                            (optional, default 8)
+        :param rate: maximum number of creations started per second
+                     (optional, unlimited by default)
+        :param on_progress: callable receiving the number of documents done
+                            so far and the BulkResult of the last one
+        :param fetch: whether to read every created document back, and
+                      return it rather than its id (optional, default False)
+        :param deadline: freezerclient.timeouts.Deadline bounding the whole
+                         operation, the documents left once it is spent fail
+                         with DeadlineExceeded (optional, defaults to the
+                         active deadline)
+        :return: list of BulkResult, in the order of docs
+        """
+        def create(doc):
+            doc_id = self.create(doc)
+            if not fetch:
+                return doc_id
+            created = self.get(doc_id)
+            if not created:
+                raise exceptions.ApiClientException(
+                    'Document {0} created but not found'.format(doc_id))
+            return created
+
+        return self._bulk(create, docs, concurrency, rate, on_progress,
+                          deadline)
+
     def create(self, *args, **kwargs):
         raise NotImplementedError
 
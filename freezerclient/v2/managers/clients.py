@@ -12,8 +12,6 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-import requests
-
 from oslo_serialization import jsonutils as json
 
 from freezerclient import exceptions
@@ -22,21 +20,30 @@ from freezerclient.v2.managers import base
 
 class ClientManager(base.BaseManager):
     resource_name = 'clients'
+    id_key = 'client_id'
+
+    def _created_document(self, client_id, client_info):
+        # freezer-api wraps the information sent by the client
+        return {'client_id': client_id, 'client': client_info}
 
-    def create(self, client_info):
-        r = requests.post(self.endpoint,
-                          data=json.dumps(client_info),
-                          headers=self.headers,
-                          verify=self.verify)
+    def create(self, client_info, return_document=False):
+        r = self.transport.post(self.endpoint,
+                                data=json.dumps(client_info),
+                                headers=self.headers,
+                                verify=self.verify)
         if r.status_code != 201:
             raise exceptions.ApiClientException(r)
         client_id = r.json()['client_id']
+        self._invalidate(client_id)
+        if return_document:
+            return self._created_document(client_id, client_info)
         return client_id
 
     def delete(self, client_id):
         endpoint = self.endpoint + client_id
-        r = requests.delete(endpoint, headers=self.headers,
-                            verify=self.verify)
+        r = self.transport.delete(endpoint, headers=self.headers,
+                                  verify=self.verify)
+        self._invalidate(client_id)
         if r.status_code != 204:
             raise exceptions.ApiClientException(r)
 
@@ -59,17 +66,25 @@ class ClientManager(base.BaseManager):
         """
         data = json.dumps(search) if search else None
         query = {'limit': int(limit), 'offset': int(offset)}
-        r = requests.get(self.endpoint, headers=self.headers,
-                         params=query, data=data, verify=self.verify)
-        if r.status_code != 200:
-            raise exceptions.ApiClientException(r)
-        return r.json()['clients']
+        return self._list_page(query, data)
+
+    def iter_list(self, page_size=base.DEFAULT_PAGE_SIZE, max_items=None,
+                  offset=0, search=None, concurrency=1, deadline=None):
+        """
+        Lazily iterates over the client infos, fetching them page by page
+
+        :param page_size: number of clients requested per page
+                          (optional, default 100)
+        :param max_items: maximum number of clients to return (optional)
+        :param offset: order of first document (optional, default 0)
+        :param search: structured query (optional)
+        :param concurrency: number of pages fetched in parallel
+                            (optional, default 1)
+        :param deadline: freezerclient.timeouts.Deadline bounding the
+                         whole listing (optional)
+        """
+        return self._iter_pages(self.list, page_size, max_items, offset,
+                                concurrency, deadline=deadline, search=search)
 
     def get(self, client_id):
-        endpoint = self.endpoint + client_id
-        r = requests.get(endpoint, headers=self.headers, verify=self.verify)
-        if r.status_code == 200:
-            return r.json()
-        if r.status_code == 404:
-            return None
-        raise exceptions.ApiClientException(r)
+        return self._get_document(client_id)
@@ -12,8 +12,6 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-import requests
-
 from oslo_serialization import jsonutils as json
 
 from freezerclient import exceptions
@@ -22,23 +20,29 @@ from freezerclient.v2.managers import base
 
 class JobManager(base.BaseManager):
     resource_name = 'jobs'
+    id_key = 'job_id'
 
-    def create(self, doc, job_id=''):
+    def create(self, doc, job_id='', return_document=False):
         job_id = job_id or doc.get('job_id', '')
         endpoint = self.endpoint + job_id
         doc['client_id'] = doc.get('client_id', '') or self.client.client_id
-        r = requests.post(endpoint,
-                          data=json.dumps(doc),
-                          headers=self.headers,
-                          verify=self.verify)
+        r = self.transport.post(endpoint,
+                                data=json.dumps(doc),
+                                headers=self.headers,
+                                verify=self.verify)
         if r.status_code != 201:
             raise exceptions.ApiClientException(r)
         job_id = r.json()['job_id']
+        self._invalidate(job_id)
+        if return_document:
+            return self._created_document(job_id, doc)
         return job_id
 
     def delete(self, job_id):
         endpoint = self.endpoint + job_id
-        r = requests.delete(endpoint, headers=self.headers, verify=self.verify)
+        r = self.transport.delete(endpoint, headers=self.headers,
+                                  verify=self.verify)
+        self._invalidate(job_id)
         if r.status_code != 204:
             raise exceptions.ApiClientException(r)
 
@@ -49,38 +53,80 @@ class JobManager(base.BaseManager):
             'offset': int(offset),
             'all_projects': all_projects,
         }
-        r = requests.get(self.endpoint, headers=self.headers,
-                         params=query, data=data, verify=self.verify)
-        if r.status_code != 200:
-            raise exceptions.ApiClientException(r)
-        return r.json()['jobs']
+        return self._list_page(query, data)
 
     def list(self, limit=10, offset=0, search={}, client_id=None,
              all_projects=False):
         client_id = client_id or self.client.client_id
         new_search = search.copy()
-        new_search['match'] = search.get('match', [])
+        new_search['match'] = list(search.get('match', []))
         new_search['match'].append({'client_id': client_id})
         return self.list_all(limit, offset, new_search, all_projects)
 
+    def iter_list_all(self, page_size=base.DEFAULT_PAGE_SIZE, max_items=None,
+                      offset=0, search=None, all_projects=False,
+                      concurrency=1, deadline=None):
+        """
+        Lazily iterates over all the jobs, fetching them page by page
+
+        :param page_size: number of jobs requested per page
+                          (optional, default 100)
+        :param max_items: maximum number of jobs to return (optional)
+        :param offset: order of first document (optional, default 0)
+        :param search: structured query (optional)
+        :param concurrency: number of pages fetched in parallel
+                            (optional, default 1)
+        :param deadline: freezerclient.timeouts.Deadline bounding the
+                         whole listing (optional)
+        """
+        return self._iter_pages(self.list_all, page_size, max_items, offset,
+                                concurrency, deadline=deadline, search=search,
+                                all_projects=all_projects)
+
+    def iter_list(self, page_size=base.DEFAULT_PAGE_SIZE, max_items=None,
+                  offset=0, search={}, client_id=None, all_projects=False,
+                  concurrency=1, deadline=None):
+        """
+        Lazily iterates over the jobs of a client, fetching them page by page
+
+        :param page_size: number of jobs requested per page
+                          (optional, default 100)
+        :param max_items: maximum number of jobs to return (optional)
+        :param offset: order of first document (optional, default 0)
+        :param search: structured query (optional)
+        :param concurrency: number of pages fetched in parallel
+                            (optional, default 1)
+        :param deadline: freezerclient.timeouts.Deadline bounding the
+                         whole listing (optional)
+        """
+        client_id = client_id or self.client.client_id
+        new_search = search.copy()
+        new_search['match'] = list(search.get('match', []))
+        new_search['match'].append({'client_id': client_id})
+        return self.iter_list_all(page_size, max_items, offset, new_search,
+                                  all_projects, concurrency, deadline)
+
     def get(self, job_id):
+        return self._get_document(job_id)
+
+    def update(self, job_id, update_doc, return_document=False):
         endpoint = self.endpoint + job_id
-        r = requests.get(endpoint, headers=self.headers, verify=self.verify)
-        if r.status_code == 200:
-            return r.json()
-        if r.status_code == 404:
-            return None
-        raise exceptions.ApiClientException(r)
-
-    def update(self, job_id, update_doc):
-        endpoint = self.endpoint + job_id
-        r = requests.patch(endpoint,
-                           headers=self.headers,
-                           data=json.dumps(update_doc),
-                           verify=self.verify)
+        previous = self._cached(job_id) if return_document else None
+        r = self.transport.patch(endpoint,
+                                 headers=self.headers,
+                                 data=json.dumps(update_doc),
+                                 verify=self.verify)
+        self._invalidate(job_id)
         if r.status_code != 200:
             raise exceptions.ApiClientException(r)
-        return r.json()['version']
+        version = r.json()['version']
+        if not return_document:
+            return version
+        if previous is None:
+            # Only freezer-api knows the fields that were not updated
+            return self.get(job_id)
+        return self._updated_document(job_id, previous, update_doc,
+                                      version)
 
     def start_job(self, job_id):
         """
@@ -95,10 +141,11 @@ class JobManager(base.BaseManager):
         # endpoint /v2/jobs/{job_id}/event
         endpoint = '{0}{1}/event'.format(self.endpoint, job_id)
         doc = {"start": None}
-        r = requests.post(endpoint,
-                          headers=self.headers,
-                          data=json.dumps(doc),
-                          verify=self.verify)
+        r = self.transport.post(endpoint,
+                                headers=self.headers,
+                                data=json.dumps(doc),
+                                verify=self.verify)
+        self._invalidate(job_id)
         if r.status_code != 202:
             raise exceptions.ApiClientException(r)
         return r.json()
@@ -116,10 +163,11 @@ class JobManager(base.BaseManager):
         # endpoint /v2/jobs/{job_id}/event
         endpoint = '{0}{1}/event'.format(self.endpoint, job_id)
         doc = {"stop": None}
-        r = requests.post(endpoint,
-                          headers=self.headers,
-                          data=json.dumps(doc),
-                          verify=self.verify)
+        r = self.transport.post(endpoint,
+                                headers=self.headers,
+                                data=json.dumps(doc),
+                                verify=self.verify)
+        self._invalidate(job_id)
         if r.status_code != 202:
             raise exceptions.ApiClientException(r)
         return r.json()
@@ -137,10 +185,66 @@ class JobManager(base.BaseManager):
         # endpoint /v2/jobs/{job_id}/event
         endpoint = '{0}{1}/event'.format(self.endpoint, job_id)
         doc = {"abort": None}
-        r = requests.post(endpoint,
-                          headers=self.headers,
-                          data=json.dumps(doc),
-                          verify=self.verify)
+        r = self.transport.post(endpoint,
+                                headers=self.headers,
+                                data=json.dumps(doc),
+                                verify=self.verify)
+        self._invalidate(job_id)
         if r.status_code != 202:
             raise exceptions.ApiClientException(r)
         return r.json()
+
+    def _signal_many(self, signal, job_ids, search, concurrency, rate,
+                     on_progress, deadline):
+        if job_ids is None:
+            if search is None:
+                raise ValueError('Either job ids or a search is required')
+            # signalling the jobs changes their status, which could move
+            # them across the pages of a listing filtered on it
+            job_ids = [job['job_id'] for job in
+                       self.iter_list_all(search=search, deadline=deadline)]
+        return self._bulk(signal, job_ids, concurrency, rate, on_progress,
+                          deadline)
+
+    def start_jobs(self, job_ids=None, search=None,
+                   concurrency=base.DEFAULT_BULK_CONCURRENCY, rate=None,
+                   on_progress=None, deadline=None):
+        """
+        Request to start several jobs concurrently
+
+        :param job_ids: iterable of the ids of the jobs to start
+        :param search: structured query selecting the jobs to start, when
+                       job_ids is not given
+        :param concurrency: number of requests in flight
+                            (optional, default 8)
+        :param rate: maximum number of requests sent per second
+                     (optional, unlimited by default)
+        :param on_progress: callable receiving the number of jobs done so
+                            far and the BulkResult of the last one
+        :param deadline: freezerclient.timeouts.Deadline bounding the whole
+                         operation, the jobs left once it is spent fail
+                         with DeadlineExceeded (optional, defaults to the
+                         active deadline)
+        :return: list of BulkResult, in the order of the jobs, holding the
+                 response obj of start_job
+        """
+        return self._signal_many(self.start_job, job_ids, search,
+                                 concurrency, rate, on_progress, deadline)
+
+    def stop_jobs(self, job_ids=None, search=None,
+                  concurrency=base.DEFAULT_BULK_CONCURRENCY, rate=None,
+                  on_progress=None, deadline=None):
+        """
+        Request to stop several jobs concurrently, see start_jobs
+        """
+        return self._signal_many(self.stop_job, job_ids, search,
+                                 concurrency, rate, on_progress, deadline)
+
+    def abort_jobs(self, job_ids=None, search=None,
+                   concurrency=base.DEFAULT_BULK_CONCURRENCY, rate=None,
+                   on_progress=None, deadline=None):
+        """
+        Request to abort several jobs concurrently, see start_jobs
+        """
+        return self._signal_many(self.abort_job, job_ids, search,
+                                 concurrency, rate, on_progress, deadline)
@@ -12,8 +12,6 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-import requests
-
 from oslo_serialization import jsonutils as json
 
 from freezerclient import exceptions
@@ -22,63 +20,108 @@ from freezerclient.v2.managers import base
 
 class SessionManager(base.BaseManager):
     resource_name = 'sessions'
+    id_key = 'session_id'
 
-    def create(self, doc, session_id=''):
+    def create(self, doc, session_id='', return_document=False):
         session_id = session_id or doc.get('session_id', '')
         endpoint = self.endpoint + session_id
-        r = requests.post(endpoint,
-                          data=json.dumps(doc),
-                          headers=self.headers,
-                          verify=self.verify)
+        r = self.transport.post(endpoint,
+                                data=json.dumps(doc),
+                                headers=self.headers,
+                                verify=self.verify)
         if r.status_code != 201:
             raise exceptions.ApiClientException(r)
         session_id = r.json()['session_id']
+        self._invalidate(session_id)
+        if return_document:
+            return self._created_document(session_id, doc)
         return session_id
 
     def delete(self, session_id):
         endpoint = self.endpoint + session_id
-        r = requests.delete(endpoint, headers=self.headers, verify=self.verify)
+        r = self.transport.delete(endpoint, headers=self.headers,
+                                  verify=self.verify)
+        self._invalidate(session_id)
         if r.status_code != 204:
             raise exceptions.ApiClientException(r)
 
     def list_all(self, limit=10, offset=0, search=None):
         data = json.dumps(search) if search else None
         query = {'limit': int(limit), 'offset': int(offset)}
-        r = requests.get(self.endpoint, headers=self.headers,
-                         params=query, data=data, verify=self.verify)
-        if r.status_code != 200:
-            raise exceptions.ApiClientException(r)
-        return r.json()['sessions']
+        return self._list_page(query, data)
 
     def list(self, limit=10, offset=0, search={}):
         new_search = search.copy()
         new_search['match'] = search.get('match', [])
         return self.list_all(limit, offset, new_search)
 
+    def iter_list_all(self, page_size=base.DEFAULT_PAGE_SIZE, max_items=None,
+                      offset=0, search=None, concurrency=1, deadline=None):
+        """
+        Lazily iterates over the sessions, fetching them page by page
+
+        :param page_size: number of sessions requested per page
+                          (optional, default 100)
+        :param max_items: maximum number of sessions to return (optional)
+        :param offset: order of first document (optional, default 0)
+        :param search: structured query (optional)
+        :param concurrency: number of pages fetched in parallel
+                            (optional, default 1)
+        :param deadline: freezerclient.timeouts.Deadline bounding the
+                         whole listing (optional)
+        """
+        return self._iter_pages(self.list_all, page_size, max_items, offset,
+                                concurrency, deadline=deadline, search=search)
+
+    def iter_list(self, page_size=base.DEFAULT_PAGE_SIZE, max_items=None,
+                  offset=0, search={}, concurrency=1, deadline=None):
+        """
+        Lazily iterates over the sessions, fetching them page by page
+
+        :param page_size: number of sessions requested per page
+                          (optional, default 100)
+        :param max_items: maximum number of sessions to return (optional)
+        :param offset: order of first document (optional, default 0)
+        :param search: structured query (optional)
+        :param concurrency: number of pages fetched in parallel
+                            (optional, default 1)
+        :param deadline: freezerclient.timeouts.Deadline bounding the
+                         whole listing (optional)
+        """
+        new_search = search.copy()
+        new_search['match'] = list(search.get('match', []))
+        return self.iter_list_all(page_size, max_items, offset, new_search,
+                                  concurrency, deadline)
+
     def get(self, session_id):
+        return self._get_document(session_id)
+
+    def update(self, session_id, update_doc, return_document=False):
         endpoint = self.endpoint + session_id
-        r = requests.get(endpoint, headers=self.headers, verify=self.verify)
-        if r.status_code == 200:
-            return r.json()
-        if r.status_code == 404:
-            return None
-        raise exceptions.ApiClientException(r)
-
-    def update(self, session_id, update_doc):
-        endpoint = self.endpoint + session_id
-        r = requests.patch(endpoint,
-                           headers=self.headers,
-                           data=json.dumps(update_doc),
-                           verify=self.verify)
+        previous = self._cached(session_id) if return_document else None
+        r = self.transport.patch(endpoint,
+                                 headers=self.headers,
+                                 data=json.dumps(update_doc),
+                                 verify=self.verify)
+        self._invalidate(session_id)
         if r.status_code != 200:
             raise exceptions.ApiClientException(r)
-        return r.json()['version']
+        version = r.json()['version']
+        if not return_document:
+            return version
+        if previous is None:
+            # Only freezer-api knows the fields that were not updated
+            return self.get(session_id)
+        return self._updated_document(session_id, previous, update_doc,
+                                      version)
 
     def add_job(self, session_id, job_id):
         # endpoint /v2/sessions/{sessions_id}/jobs/{job_id}
         endpoint = '{0}{1}/jobs/{2}'.format(self.endpoint, session_id, job_id)
-        r = requests.put(endpoint,
-                         headers=self.headers, verify=self.verify)
+        r = self.transport.put(endpoint,
+                               headers=self.headers, verify=self.verify)
+        self._invalidate(session_id)
+        self._invalidate(job_id, 'jobs')
         if r.status_code != 204:
             raise exceptions.ApiClientException(r)
         return
@@ -86,15 +129,12 @@ class SessionManager(base.BaseManager):
     def remove_job(self, session_id, job_id):
         # endpoint /v2/sessions/{sessions_id}/jobs/{job_id}
         endpoint = '{0}{1}/jobs/{2}'.format(self.endpoint, session_id, job_id)
-        retry = 5
-        r = ''
-        while retry:
-            r = requests.delete(endpoint,
-                                headers=self.headers, verify=self.verify)
-            if r.status_code == 204:
-                return
-            retry -= 1
-        raise exceptions.ApiClientException(r)
+        r = self.transport.delete(endpoint,
+                                  headers=self.headers, verify=self.verify)
+        self._invalidate(session_id)
+        self._invalidate(job_id, 'jobs')
+        if r.status_code != 204:
+            raise exceptions.ApiClientException(r)
 
     def start_session(self, session_id, job_id, session_tag):
         """
@@ -119,10 +159,11 @@ class SessionManager(base.BaseManager):
             "job_id": job_id,
             "current_tag": session_tag
         }}
-        r = requests.post(endpoint,
-                          headers=self.headers,
-                          data=json.dumps(doc),
-                          verify=self.verify)
+        r = self.transport.post(endpoint,
+                                headers=self.headers,
+                                data=json.dumps(doc),
+                                verify=self.verify)
+        self._invalidate(session_id)
         if r.status_code != 202:
             raise exceptions.ApiClientException(r)
         return r.json()
@@ -145,10 +186,11 @@ class SessionManager(base.BaseManager):
             "current_tag": session_tag,
             "result": result
         }}
-        r = requests.post(endpoint,
-                          headers=self.headers,
-                          data=json.dumps(doc),
-                          verify=self.verify)
+        r = self.transport.post(endpoint,
+                                headers=self.headers,
+                                data=json.dumps(doc),
+                                verify=self.verify)
+        self._invalidate(session_id)
         if r.status_code != 202:
             raise exceptions.ApiClientException(r)
         return r.json()
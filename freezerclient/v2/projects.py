@@ -0,0 +1,63 @@
+# (c) Copyright 2026 Cleura AB
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from freezerclient import timeouts
+from freezerclient import utils
+
+DEFAULT_CONCURRENCY = 4
+
+
+def iter_records(client, project_ids, list_records,
+                 concurrency=DEFAULT_CONCURRENCY, errors=None):
+    """Lazily yield the records listed in several projects
+
+    Each project is listed with a client scoped to it, up to concurrency
+    projects at a time. The records are yielded project by project, in
+    the order of project_ids, each one copied and annotated with the id
+    of its project under the 'project_id' key. Example::
+
+        for backup in projects.iter_records(
+                client, ['p1', 'p2'],
+                lambda c: c.backups.iter_list(search=search)):
+            ...
+
+    :param client: freezerclient.v2.client.Client
+    :param project_ids: ids of the projects to list
+    :param list_records: callable receiving the client of a project and
+                         returning its records
+    :param concurrency: number of projects listed in parallel
+                        (optional, default 4)
+    :param errors: dict receiving the exception of each failed project,
+                   keyed by project id (optional). When it is not given,
+                   the first failure is raised.
+    """
+    active = timeouts.current()
+
+    def list_project(project_id):
+        try:
+            with timeouts.activate(active):
+                project_client = client.for_project(project_id)
+                records = [dict(record, project_id=project_id)
+                           for record in list_records(project_client)]
+        except Exception as err:
+            if errors is None:
+                raise
+            errors[project_id] = err
+            return []
+        return records
+
+    for records in utils.run_ahead(list_project,
+                                   ((p,) for p in project_ids),
+                                   concurrency):
+        yield from records
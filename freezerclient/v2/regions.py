@@ -0,0 +1,74 @@
+# (c) Copyright 2026 Cleura AB
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import collections
+import heapq
+
+from freezerclient import timeouts
+from freezerclient import utils
+
+RegionResult = collections.namedtuple('RegionResult',
+                                      ['region', 'result', 'error'])
+
+
+def fan_out(client, regions, func, concurrency=None):
+    """Call func with a client bound to each region, concurrently
+
+    A failure in a region does not prevent the others from completing: it
+    is returned as the error of that region.
+
+    :param client: freezerclient.v2.client.Client
+    :param regions: names of the regions to query
+    :param func: callable receiving the client of a region
+    :param concurrency: number of regions queried in parallel
+                        (optional, defaults to all of them)
+    :return: list of RegionResult, in the order of regions
+    """
+    regions = list(regions)
+    if not regions:
+        return []
+    active = timeouts.current()
+
+    def call(region):
+        try:
+            with timeouts.activate(active):
+                return RegionResult(region, func(client.for_region(region)),
+                                    None)
+        except Exception as err:
+            return RegionResult(region, None, err)
+
+    return list(utils.run_ahead(call, ((r,) for r in regions),
+                                concurrency or len(regions)))
+
+
+def merge(results, key, reverse=False):
+    """Merge the records of several regions in a single sorted stream
+
+    The records of each region must already be sorted by key. Each record
+    is copied and tagged with the name of its region under the 'region'
+    key. Failed regions are skipped.
+
+    :param results: list of RegionResult
+    :param key: callable returning the sort key of a record
+    :param reverse: whether the records are sorted in descending order
+    :return: iterator of records
+    """
+    streams = [_tagged(r.region, r.result) for r in results
+               if r.error is None]
+    return heapq.merge(*streams, key=key, reverse=reverse)
+
+
+def _tagged(region, records):
+    for record in records:
+        yield dict(record, region=region)
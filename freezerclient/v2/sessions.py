@@ -100,15 +100,37 @@ class SessionList(base.FreezerLister):
             default='',
             help='Define a filter for the query',
         )
+
+        parser.add_argument(
+            '--all',
+            dest='all',
+            action='store_true',
+            help='Fetch every page of the listing instead of a single one '
+                 'of at most --limit records',
+        )
+
+        parser.add_argument(
+            '--page-size',
+            dest='page_size',
+            default=100,
+            help='Number of records requested per page when using --all',
+        )
         return parser
 
     def take_action(self, parsed_args):
         search = utils.prepare_search(parsed_args.search)
-        sessions = self.client.sessions.list_all(
-            limit=parsed_args.limit,
-            offset=parsed_args.offset,
-            search=search
-        )
+        if parsed_args.all:
+            sessions = self.client.sessions.iter_list_all(
+                page_size=parsed_args.page_size,
+                offset=parsed_args.offset,
+                search=search
+            )
+        else:
+            sessions = self.client.sessions.list_all(
+                limit=parsed_args.limit,
+                offset=parsed_args.offset,
+                search=search
+            )
 
         # Print empty table if no sessions found
         if not sessions:
@@ -127,24 +149,16 @@ class SessionList(base.FreezerLister):
         return columns, data
 
 
-class SessionCreate(base.FreezerShowOne):
-    """Create a session from a file"""
-    def get_parser(self, prog_name):
-        parser = super(SessionCreate, self).get_parser(prog_name)
-        parser.add_argument('--file',
-                            dest='file',
-                            required=True,
-                            help='Path to json file with the job')
-        return parser
+class SessionCreate(base.FreezerCreateOne):
+    """Create sessions from a file, a directory or a JSON-lines file"""
+    noun = 'session'
 
     def take_action(self, parsed_args):
+        if not parsed_args.file:
+            return self.create_many(self.client.sessions, parsed_args)
         session_data = utils.doc_from_json_file(parsed_args.file)
-        session_id = self.client.sessions.create(session_data)
-        session = self.client.sessions.get(session_id)
-        if not session:
-            raise exceptions.ApiClientException(
-                'Session created but not found')
-        return format_session(session)
+        return format_session(self.create_one(self.client.sessions,
+                                              session_data, parsed_args))
 
 
 class SessionDelete(base.FreezerCommand):